@@ -1,15 +1,9 @@
 #!/bin/bash
 
-pyfiles=$(find $1 -name "*.py")
-
 if [ ! -d "typeinfer_results" ];
 then
     mkdir ./typeinfer_results
 fi
 
-for file in $pyfiles
-do
-java -jar $2 $file ./typeinfer_results
-echo "---------------------------------Scan File: $file--------------------------------------"
-python3.8 featureScanner.py -s $file -t ./typeinfer_results/${file##*/}.html -c csv_res.csv 
-done
\ No newline at end of file
+#Pysonar2 is run once on the whole project by the scanner, which scans the files as their results are ready
+python3.8 featureScanner.py -p $1 -t ./typeinfer_results --pysonar $2 -f config.ini -l standard_res -c csv_res.csv
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import featureSchema
+import featureScanner
+import resultSink
+
+#Appends the results of N scanned files to a CSV file, once with the previous
+#read-append-rewrite of the whole file per result (needs pandas) and once with
+#the append-only sink.
+#Usage: python3 benchmarks/benchCsvSink.py [Number of Appends]
+
+
+def legacy_append(csvfile, sourcefile, counts):
+    import pandas as pd
+    keys = featureSchema.csv_keys()
+    values = [sourcefile] + list(counts)
+    if os.path.exists(csvfile):
+        newdict = {}
+        for i in range(0, len(keys)):
+            newdict[keys[i]] = [values[i]]
+        df = pd.read_csv(csvfile, header=None, names = keys, sep = ",")
+        #DataFrame.append is gone from recent pandas, concat does the same here
+        df = pd.concat([df, pd.DataFrame(newdict)], ignore_index = True)
+        df.to_csv(csvfile, index = False, header = False)
+    else:
+        newdict = {}
+        for i in range(0, len(keys)):
+            newdict[keys[i]] = [values[i]]
+        df = pd.DataFrame(newdict)
+        df.to_csv(csvfile, index = False, header = True)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    setup = {"introspection_funcs": "", "introspection_attrs": "", "reflection_funcs": "", "recursion_limit": "3"}
+    counts = featureScanner.analyzer(setup, None).counts
+    tmpdir = tempfile.mkdtemp()
+    old_csv = os.path.join(tmpdir, "old.csv")
+    new_csv = os.path.join(tmpdir, "new.csv")
+
+    start = time.perf_counter()
+    for i in range(0, count):
+        legacy_append(old_csv, "file" + str(i) + ".py", counts)
+    old = time.perf_counter() - start
+    print("Read-append-rewrite: %d appends in %.2fs" % (count, old))
+
+    start = time.perf_counter()
+    with resultSink.csv_sink(new_csv) as sink:
+        for i in range(0, count):
+            sink.write("file" + str(i) + ".py", counts)
+    new = time.perf_counter() - start
+    print("Append-only sink:    %d appends in %.2fs" % (count, new))
+    print("Speedup: %.0fx" % (old / new))
+    if open(old_csv, "rb").read() != open(new_csv, "rb").read():
+        print("Warning: the CSV files differ!")
+    os.remove(old_csv)
+    os.remove(new_csv)
+    os.rmdir(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
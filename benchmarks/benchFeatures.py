@@ -0,0 +1,58 @@
+import ast
+import os
+import sys
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+
+#Compares scanning the files of a project for all features with the local
+#type inference, as --no-typeres does, with scanning them for a few features
+#which need no types (--features), against parsing them alone. The standard
+#lib info is loaded once, and only when the features need it.
+#Usage: python3 benchmarks/benchFeatures.py [Python Project Directory] [Features]
+
+
+def scan(sources, setup, lib):
+    start = time.perf_counter()
+    stdlib = None
+    if featureScanner.needs_stdlib(featureScanner.selected_features(setup)):
+        stdlib = featureScanner.load_standard_libs(lib)
+    loaded = time.perf_counter() - start
+    for text in sources:
+        visitor = featureScanner.analyzer(setup, lib, stdlib)
+        visitor.run(ast.parse(text), None)
+    return loaded, time.perf_counter() - start
+
+
+def main():
+    project = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.__file__), "email")
+    features = sys.argv[2] if len(sys.argv) > 2 else "TS.gradual_typing,FCAP.decorator,DS.list_comprehension"
+    setup = featureScanner.read_config(os.path.join(BASE, "config.ini"))
+    lib = os.path.join(BASE, "standard_res")
+    sources = []
+    for sourcefile in featureScanner.find_sources(project):
+        text = open(sourcefile, "r").read()
+        try:
+            ast.parse(text)
+        except (SyntaxError, ValueError):
+            continue
+        sources.append(text)
+
+    start = time.perf_counter()
+    for text in sources:
+        ast.parse(text)
+    parsed = time.perf_counter() - start
+    full_loaded, full = scan(sources, dict(setup, features = ""), lib)
+    selected_loaded, selected = scan(sources, dict(setup, features = features), lib)
+
+    print("Project: %s, %d files" % (project, len(sources)))
+    print("ast.parse only:       %.2fs" % parsed)
+    print("All features:         %.2fs (%.2fs loading the standard lib info)" % (full, full_loaded))
+    print("%s: %.2fs (%.2fs loading the standard lib info)" % (features, selected, selected_loaded))
+    print("Selected scan / parse: %.1fx" % (selected / parsed))
+
+if __name__ == "__main__":
+    main()
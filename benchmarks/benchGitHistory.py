@@ -0,0 +1,93 @@
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+import featureSchema
+
+#Builds a git repository out of standard lib modules, where every commit
+#changes one module, and scans all its commits twice: once checking out every
+#commit and scanning all its files, as was done before --git-history, and
+#once with --git-history, which scans every distinct blob once. Both scan in
+#this process with the local type inference, and their totals are compared.
+#Usage: python3 benchmarks/benchGitHistory.py [Number of Commits] [Number of Modules]
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", repo, "-c", "user.name=bench", "-c", "user.email=bench@localhost"] + list(args),
+                          stdout = subprocess.PIPE, check = True).stdout.decode()
+
+
+def make_repo(repo, commits, modules):
+    libdir = os.path.dirname(os.__file__)
+    sources = sorted(f for f in os.listdir(libdir) if f.endswith(".py"))[:modules]
+    git(repo, "init", "-q")
+    for f in sources:
+        shutil.copy(os.path.join(libdir, f), os.path.join(repo, f))
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "import")
+    for i in range(1, commits):
+        f = sources[i % len(sources)]
+        with open(os.path.join(repo, f), "a") as out:
+            out.write("\nbench_%d = [x for x in range(%d)]\n" % (i, i))
+        git(repo, "commit", "-q", "-a", "-m", "change " + str(i))
+
+
+def legacy(repo, setup, lib, stdlib):
+    #every file of every commit, read from a checkout
+    totals = []
+    for commit in git(repo, "rev-list", "--reverse", "HEAD").split():
+        git(repo, "checkout", "-q", commit)
+        counts = featureSchema.new_counts()
+        for sourcefile in featureScanner.find_sources(repo):
+            try:
+                root = ast.parse(open(sourcefile, "r").read())
+            except (SyntaxError, ValueError, UnicodeDecodeError):
+                continue
+            visitor = featureScanner.analyzer(setup, lib, stdlib)
+            visitor.run(root, None)
+            featureSchema.add(counts, visitor.counts)
+        totals.append((commit, list(counts)))
+    git(repo, "checkout", "-q", "master")
+    return totals
+
+
+def main():
+    commits = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    modules = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    setup = featureScanner.read_config(os.path.join(BASE, "config.ini"))
+    lib = os.path.join(BASE, "standard_res")
+    stdlib = featureScanner.load_standard_libs(lib)
+    repo = tempfile.mkdtemp()
+    csvfile = os.path.join(repo, ".git", "history.csv")
+    try:
+        make_repo(repo, commits, modules)
+        git(repo, "branch", "-M", "master")
+
+        start = time.perf_counter()
+        old = legacy(repo, setup, lib, stdlib)
+        checkout = time.perf_counter() - start
+        start = time.perf_counter()
+        featureScanner.scan_history(repo, "HEAD", setup, lib, "stream", 1, csvfile, False)
+        history = time.perf_counter() - start
+
+        import csv
+        rows = list(csv.reader(open(csvfile, "r")))[1:]
+        new = [(row[0], [int(c) for c in row[4:]]) for row in rows]
+        print("Commits: %d, %d modules" % (commits, modules))
+        print("Checkout and scan every commit: %.2fs" % checkout)
+        print("--git-history, one worker:      %.2fs" % history)
+        print("Speedup: %.1fx" % (checkout / history))
+        print("Totals equal: %s" % (old == new))
+    finally:
+        shutil.rmtree(repo)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import typeIndex
+
+#Reports parse time and peak RSS of every type result backend on the largest
+#file of a project. Each backend runs in its own process so the peaks do not
+#mix. Without a type inference result directory, a Pysonar2-like fixture is
+#generated for the file.
+#Usage: python3 benchmarks/benchHtmlParse.py [Project Directory] [Type Inference Result Directory]
+
+
+def child(backend, htmlfile):
+    #imports are done before measuring so only the parse is reported
+    if backend == "bs4":
+        import bs4
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with open(htmlfile, "r") as html:
+        index = typeIndex.load(html, backend)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print("%s %f %d %d %d" % (backend, elapsed, before, peak, len(index)))
+
+
+def largest_file(project):
+    largest = None
+    size = -1
+    for dirpath, dirnames, filenames in os.walk(project):
+        for f in filenames:
+            if f.endswith(".py"):
+                path = os.path.join(dirpath, f)
+                if os.path.getsize(path) > size:
+                    size = os.path.getsize(path)
+                    largest = path
+    return largest
+
+
+def main():
+    project = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.__file__)
+    typeres = sys.argv[2] if len(sys.argv) > 2 else None
+    sourcefile = largest_file(project)
+    if sourcefile == None:
+        print("Error: No Python source file in " + project)
+        sys.exit(-1)
+
+    tmp = None
+    if typeres != None:
+        htmlfile = os.path.join(typeres, os.path.relpath(sourcefile, project) + ".html")
+        if not os.path.exists(htmlfile):
+            htmlfile = os.path.join(typeres, os.path.basename(sourcefile) + ".html")
+    else:
+        import fakePysonar
+        tmp = tempfile.NamedTemporaryFile("w", suffix = ".html", delete = False)
+        tmp.write(fakePysonar.generate(open(sourcefile, "r").read()))
+        tmp.close()
+        htmlfile = tmp.name
+
+    print("File: " + sourcefile)
+    print("HTML: " + htmlfile + " (" + str(os.path.getsize(htmlfile)) + " bytes)")
+    print("%-8s %10s %14s %10s" % ("Backend", "Time (s)", "Peak RSS (MB)", "Entries"))
+    try:
+        for backend in typeIndex.BACKENDS:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", backend, htmlfile],
+                                 stdout = subprocess.PIPE, universal_newlines = True, check = True).stdout.split()
+            #ru_maxrss is in kilobytes on Linux
+            print("%-8s %10.3f %14.1f %10s" % (out[0], float(out[1]), int(out[3]) / 1024.0, out[4]))
+    finally:
+        if tmp != None:
+            os.remove(tmp.name)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,133 @@
+import ast
+import os
+import random
+import sys
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+import featureSchema
+
+#Counts the inheritance features of a synthetic module with wide, deep and
+#mixin hierarchies, once with the previous nested loops and recursive parent
+#lists and once with the current parent maps. Only check_inheritance is timed.
+#Usage: python3 benchmarks/benchInheritance.py [Number of Classes] [Depth of Mixin Hierarchy]
+
+#featuremap is built from the counts, so the legacy loops count into the slots
+SLOTS = featureSchema.SLOTS
+
+
+class legacy_analyzer(featureScanner.analyzer):
+    def check_inheritance(self):
+        for key in self.classchildren:
+            if len(self.classchildren[key]) > 1:
+                self.counts[SLOTS["OOP.inheritance.hierarchical"]] += 1
+
+        classwithoutchildren = []
+        for i in self.classes:
+            if i not in self.classchildren:
+                classwithoutchildren.append(i)
+
+        for i in classwithoutchildren:
+            for p in self.classchildren:
+                if i in self.classchildren[p]:
+                    for q in self.classchildren:
+                        if p in self.classchildren[q]:
+                            self.counts[SLOTS["OOP.inheritance.multilevel"]] += 1
+
+        for i in self.classparent:
+            if len(self.classparent[i]) > 1:
+                parents = {}
+                for p in self.classparent[i]:
+                    parents[p] = self.find_parent(p)
+                    parents[p].remove(p)
+                found = False
+                for p in parents:
+                    if found:
+                        break
+                    for i in parents[p]:
+                        if found:
+                            break
+                        for q in parents:
+                            if i in parents[q]:
+                                self.counts[SLOTS["OOP.inheritance.diamond"]] += 1
+                                found = True
+                                break
+
+    def find_parent(self, name):
+        parents = [name]
+        if name in self.classparent:
+            for p in self.classparent[name]:
+                parents += self.find_parent(p)
+        if name == "object":
+            return []
+        return parents
+
+
+def make_source(count, depth):
+    rand = random.Random(0)
+    lines = ["class Base(object):", "    pass"]
+    names = ["Base"]
+
+    def define(name, bases):
+        lines.append("class " + name + "(" + ", ".join(bases) + "):")
+        lines.append("    pass")
+        names.append(name)
+
+    #wide, a tenth of the classes derive directly from Base
+    for i in range(0, count // 10):
+        define("Wide" + str(i), ["Base"])
+    #deep, a single inheritance chain
+    prev = "Base"
+    for i in range(0, count // 5):
+        define("Deep" + str(i), [prev])
+        prev = "Deep" + str(i)
+    #mixins, every level combines a mixin with the level below
+    prev = "Base"
+    for i in range(0, depth):
+        define("Mixin" + str(i), ["object"])
+        define("Level" + str(i), ["Mixin" + str(i), prev])
+        prev = "Level" + str(i)
+    #the rest derive from one to three of the classes defined so far
+    i = 0
+    while len(names) < count:
+        bases = []
+        for j in range(0, rand.choice((1, 1, 2, 3))):
+            base = rand.choice(names)
+            if base not in bases:
+                bases.append(base)
+        define("Mixed" + str(i), bases)
+        i += 1
+    return "\n".join(lines) + "\n"
+
+
+def count(cls, setup, root):
+    visitor = cls(setup, None)
+    visitor.visit(root)
+    start = time.perf_counter()
+    visitor.check_inheritance()
+    elapsed = time.perf_counter() - start
+    return elapsed, visitor.featuremap["OOP"]["inheritance"]
+
+
+def main():
+    classes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    setup = featureScanner.read_config(os.path.join(BASE, "config.ini"))
+    root = ast.parse(make_source(classes, depth))
+    #the recursive parent lists go as deep as the deepest hierarchy
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), classes * 2 + 1000))
+
+    old, old_counts = count(legacy_analyzer, setup, root)
+    new, new_counts = count(featureScanner.analyzer, setup, root)
+    print("Classes: %d, mixin hierarchy depth: %d" % (classes, depth))
+    print("Nested loops and parent lists: %.3fs, %s" % (old, old_counts))
+    print("Parent maps:                   %.3fs, %s" % (new, new_counts))
+    if old_counts != new_counts:
+        print("Error: the inheritance counts differ!")
+        sys.exit(-1)
+
+if __name__ == "__main__":
+    main()
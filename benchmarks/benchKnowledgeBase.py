@@ -0,0 +1,61 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stdlibIndex
+import fakePysonar
+
+#Compares loading the standard lib info from the CSV files with loading the
+#pickled knowledge base, both alone and as part of a single-file scan.
+#Usage: python3 benchmarks/benchKnowledgeBase.py [Standard Lib Info Directory] [Runs]
+
+
+def best_of(runs, func):
+    best = None
+    for i in range(0, runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best == None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    lib = sys.argv[1] if len(sys.argv) > 1 else os.path.join(BASE, "standard_res")
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    tmpdir = tempfile.mkdtemp()
+    try:
+        csvdir = os.path.join(tmpdir, "csv")
+        kbdir = os.path.join(tmpdir, "kb")
+        os.makedirs(csvdir)
+        os.makedirs(kbdir)
+        for table in stdlibIndex.TABLES:
+            shutil.copy(os.path.join(lib, stdlibIndex.TABLES[table]), csvdir)
+        stdlibIndex.save_kb(stdlibIndex.load_csv(csvdir), os.path.join(kbdir, stdlibIndex.KB_FILE))
+
+        print("Load CSV files:      %.1fms" % (best_of(runs, lambda: stdlibIndex.load(csvdir)) * 1000))
+        print("Load knowledge base: %.1fms" % (best_of(runs, lambda: stdlibIndex.load(kbdir)) * 1000))
+
+        sourcefile = os.path.join(os.path.dirname(os.__file__), "bisect.py")
+        htmlfile = os.path.join(tmpdir, "bisect.py.html")
+        with open(htmlfile, "w") as f:
+            f.write(fakePysonar.generate(open(sourcefile, "r").read()))
+        for name, d in (("CSV files", csvdir), ("knowledge base", kbdir)):
+            cmd = [sys.executable, os.path.join(BASE, "featureScanner.py"), "-s", sourcefile, "-t", htmlfile,
+                   "-f", os.path.join(BASE, "config.ini"), "-l", d]
+            elapsed = best_of(runs, lambda: subprocess.run(cmd, stdout = subprocess.DEVNULL, check = True))
+            print("Single-file scan with %s: %.1fms" % (name, elapsed * 1000))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import ast
+import contextlib
+import io
+import os
+import sys
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+import typeIndex
+
+#Compares the --no-typeres local type inference with Pysonar2 results: the
+#scanning throughput of both and how often they agree on the features that
+#depend on type information. Pysonar2's own run time is not included, only
+#reading its results. Without a result directory only the throughput of the
+#local inference is measured.
+#Usage: python3 benchmarks/benchLocalTypes.py <Python Project Directory> [Type Inference Result Directory]
+
+TYPE_FEATURES = [
+    ("TS", "first_class_function", "function_as_parameter"),
+    ("TS", "first_class_function", "function_as_returnvalue"),
+    ("TS", "first_class_function", "function_assignedto_var"),
+    ("DS", "heterogeneous_list", "constant_index"),
+    ("DS", "heterogeneous_list", "variable_index"),
+    ("DS", "heterogeneous_tuple", "constant_index"),
+    ("DS", "heterogeneous_tuple", "variable_index"),
+    ("OOP", "polymorphism", "parametic"),
+    ("FCAP", "recursion"),
+]
+
+
+def feature_value(featuremap, path):
+    for key in path:
+        featuremap = featuremap[key]
+    return featuremap
+
+
+def scan(setup, stdlib, root, htmlfile):
+    visitor = featureScanner.analyzer(setup, None, stdlib)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if htmlfile == None:
+            visitor.run(root, None)
+        else:
+            with open(htmlfile, "r") as html:
+                visitor.run(root, html)
+    return visitor.featuremap, time.perf_counter() - start
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 benchmarks/benchLocalTypes.py <Python Project Directory> [Type Inference Result Directory]")
+        sys.exit(-1)
+    project = sys.argv[1]
+    typeres = sys.argv[2] if len(sys.argv) > 2 else None
+    setup = featureScanner.read_config(os.path.join(BASE, "config.ini"))
+    stdlib = featureScanner.load_standard_libs(os.path.join(BASE, "standard_res"))
+
+    local_time = 0.0
+    local_files = 0
+    pysonar_time = 0.0
+    compared = 0
+    agreed = 0
+    totals = {}
+    matches = {}
+    for path in TYPE_FEATURES:
+        totals[path] = [0, 0]
+        matches[path] = 0
+    for sourcefile in featureScanner.find_sources(project):
+        try:
+            root = ast.parse(open(sourcefile, "r").read())
+            local, elapsed = scan(setup, stdlib, root, None)
+        except (SyntaxError, ValueError, UnicodeDecodeError, RecursionError):
+            continue
+        local_time += elapsed
+        local_files += 1
+        if typeres == None:
+            continue
+        htmlfile = typeIndex.find_result(typeres, project, sourcefile)
+        if htmlfile == None:
+            continue
+        pysonar, elapsed = scan(setup, stdlib, root, htmlfile)
+        pysonar_time += elapsed
+        compared += 1
+        same = True
+        for path in TYPE_FEATURES:
+            a = feature_value(pysonar, path)
+            b = feature_value(local, path)
+            totals[path][0] += a
+            totals[path][1] += b
+            if a == b:
+                matches[path] += 1
+            else:
+                same = False
+        if same:
+            agreed += 1
+
+    if local_files == 0:
+        print("No Python source files scanned in " + project)
+        return
+    print("Local inference: %d files in %.2fs, %.0f files/s" % (local_files, local_time, local_files / local_time))
+    if compared == 0:
+        return
+    print("Pysonar2 results: %d files in %.2fs, %.0f files/s (without running Pysonar2)" % (compared, pysonar_time, compared / pysonar_time))
+    print("Files agreeing on all type dependent features: %d of %d (%.1f%%)" % (agreed, compared, agreed * 100.0 / compared))
+    print("%-60s %8s %8s %8s" % ("Feature", "Pysonar2", "Local", "Agree"))
+    for path in TYPE_FEATURES:
+        print("%-60s %8d %8d %7.1f%%" % ("/".join(path), totals[path][0], totals[path][1], matches[path] * 100.0 / compared))
+
+
+if __name__ == "__main__":
+    main()
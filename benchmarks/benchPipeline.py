@@ -0,0 +1,93 @@
+import ast
+import contextlib
+import functools
+import io
+import os
+import sys
+import tempfile
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+import resultSink
+
+#Compares scanning a project on a slow file system, simulated by a delay
+#before every file is read like a cold NFS directory, once with the serial
+#loop reading, parsing, scanning and writing one file after another, once
+#with the workers reading their files themselves (--prefetch 0), and once
+#with the pipeline reading ahead. The local type inference is used. The
+#workers are not forked from the benchmark, so they add the delay as they
+#start.
+#Usage: python3 benchmarks/benchPipeline.py [Python Project Directory] [Latency in ms] [Number of Jobs]
+
+
+def slow_reader(latency):
+    read_file = featureScanner.read_file
+    def read(path):
+        time.sleep(latency)
+        return read_file(path)
+    return read
+
+
+init_worker = featureScanner.init_worker
+
+
+def slow_worker(latency, *args):
+    featureScanner.read_file = slow_reader(latency)
+    featureScanner.init_worker = functools.partial(slow_worker, latency)
+    init_worker(*args)
+
+
+def serial_loop(sources, setup, lib, stdlib, csvfile):
+    sink = resultSink.csv_sink(csvfile)
+    for sourcefile in sources:
+        try:
+            root = ast.parse(featureScanner.decode(featureScanner.read_file(sourcefile)))
+        except (SyntaxError, ValueError, UnicodeDecodeError):
+            continue
+        visitor = featureScanner.analyzer(setup, lib, stdlib)
+        visitor.run(root, None)
+        sink.write(sourcefile, visitor.counts)
+    sink.close()
+
+
+def pipeline(project, setup, lib, jobs, csvfile, prefetch):
+    with contextlib.redirect_stdout(io.StringIO()):
+        featureScanner.scan_project(project, None, setup, lib, "stream", jobs, csvfile, False, prefetch = prefetch)
+
+
+def main():
+    project = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.__file__), "email")
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.02
+    jobs = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    setup = featureScanner.read_config(os.path.join(BASE, "config.ini"))
+    lib = os.path.join(BASE, "standard_res")
+    stdlib = featureScanner.load_standard_libs(lib)
+    sources = featureScanner.find_sources(project)
+    featureScanner.read_file = slow_reader(latency)
+    featureScanner.init_worker = functools.partial(slow_worker, latency)
+    tmpdir = tempfile.mkdtemp()
+    runs = [("Serial loop", None), ("Workers reading", 0), ("Pipeline, 32 ahead", 32)]
+    res = []
+    for name, prefetch in runs:
+        csvfile = os.path.join(tmpdir, str(len(res)) + ".csv")
+        start = time.perf_counter()
+        if prefetch == None:
+            serial_loop(sources, setup, lib, stdlib, csvfile)
+        else:
+            pipeline(project, setup, lib, jobs, csvfile, prefetch)
+        res.append((name, time.perf_counter() - start, open(csvfile, "r").read()))
+        os.remove(csvfile)
+    os.rmdir(tmpdir)
+
+    print("Project: %s, %d files, %.0f ms latency per file read, %d jobs" % (project, len(sources), latency * 1000, jobs))
+    for name, elapsed, rows in res:
+        print("%-20s %.2fs, %.1f files/s" % (name + ":", elapsed, len(sources) / elapsed))
+    for name, elapsed, rows in res[1:]:
+        if rows != res[0][2]:
+            print("Warning: the rows of " + name + " differ from the serial loop's")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import ast
+import io
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import functionScanner
+import fakePysonar
+
+#Finds the polymorphic functions of every standard lib module with Pysonar2-
+#like results from fakePysonar.py, as --build-kb does, once answered from the
+#type index and once with a regex span search over the whole document per
+#function as functionScanner did before. The search is slow, so it only runs
+#on a sample of the modules, which the index scans again for comparison. The
+#search also misses functions whose line number is the suffix of another
+#(the regex is not anchored), those are counted as differences.
+#Usage: python3 benchmarks/benchPolymorphism.py [Standard Lib Directory] [Sample Size]
+
+
+class legacy_scanner(functionScanner.scanner):
+    def __init__(self, html, parametic_poly):
+        from bs4 import BeautifulSoup
+        functionScanner.scanner.__init__(self, None, parametic_poly)
+        self.soup = BeautifulSoup(html, features="html.parser")
+
+    def check_polymorphism(self, name, lineno):
+        spans = self.soup.find_all("span", text = re.compile(" *" + str(lineno)))
+        if len(spans) > 1 or len(spans) == 0:
+            return False
+        else:
+            p = spans[0].next_sibling
+            while(p != None and p.name != "span"):
+                if hasattr(p, "xid") and hasattr(p, "title") and p.string == name:
+                    types = p["title"].split(" / ")
+                    count = 0
+                    returnvalues = {}
+                    for t in types:
+                        if "?" not in t and " -> " in t:
+                            sig = t.split(" -> ")
+                            if "|" in sig[0] and "{" in sig[0] and "}" in sig[0]:
+                                return True
+                            if sig[1] not in returnvalues:
+                                returnvalues[sig[1]] = sig[0]
+                            elif returnvalues[sig[1]] != sig[0]:
+                                count += 1
+                    if count > 0:
+                        return True
+                    else:
+                        return False
+                p = p.next_sibling
+        return False
+
+
+def scan(cls, html, root):
+    #reading the HTML included
+    start = time.perf_counter()
+    visitor = cls(html, True)
+    visitor.visit(root)
+    visitor.finalize()
+    return time.perf_counter() - start, visitor.rows()
+
+
+def main():
+    libdir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.__file__)
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(libdir):
+        dirnames.sort()
+        for f in sorted(filenames):
+            if f.endswith(".py"):
+                sources.append(os.path.join(dirpath, f))
+    step = max(1, len(sources) // sample)
+
+    modules = 0
+    functions = 0
+    indexed = 0
+    sampled = 0
+    indexed_sample = 0
+    legacy_sample = 0
+    differences = 0
+    for i in range(0, len(sources)):
+        try:
+            source = open(sources[i], "r").read()
+            root = ast.parse(source)
+            html = fakePysonar.generate(source)
+        except (SyntaxError, ValueError, UnicodeDecodeError, RecursionError):
+            continue
+        modules += 1
+        elapsed, rows = scan(functionScanner.scanner, io.StringIO(html), root)
+        indexed += elapsed
+        functions += len(rows)
+        if i % step == 0:
+            sampled += 1
+            indexed_sample += elapsed
+            legacy_elapsed, legacy_rows = scan(legacy_scanner, html, root)
+            legacy_sample += legacy_elapsed
+            differences += len(set(map(tuple, rows)) ^ set(map(tuple, legacy_rows)))
+
+    print("Modules: %d in %s, %d polymorphic functions" % (modules, libdir, functions))
+    print("Type index, all modules:      %.2fs" % indexed)
+    print("Sample of %d modules:" % sampled)
+    print("  Type index:                 %.2fs" % indexed_sample)
+    print("  Regex span search:          %.2fs" % legacy_sample)
+    if indexed_sample > 0:
+        print("  Speedup:                    %.0fx" % (legacy_sample / indexed_sample))
+    print("  Functions found differently: %d" % differences)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import projectGraph
+
+#Feeds the project graph with the summaries of a synthetic project, whose
+#classes inherit from and call into classes of other modules through from
+#imports, and measures the time and memory it takes to build and analyse.
+#Usage: python3 benchmarks/benchProjectGraph.py [Number of Classes] [Classes per Module]
+
+
+def make_summary(rand, m, per_module):
+    fromimports = {}
+    classes = []
+    funcs = {}
+    methods = {}
+    for i in range(0, per_module):
+        name = "C" + str(i)
+        bases = []
+        if i > 0 and rand.random() < 0.5:
+            bases.append("C" + str(rand.randrange(0, i)))
+        if m > 0 and rand.random() < 0.5:
+            #a class of another module, imported under a module unique name
+            other = str(rand.randrange(0, m))
+            orig = "C" + str(rand.randrange(0, per_module))
+            alias = "M" + other + orig
+            fromimports[alias] = [0, "pkg.mod" + other, orig]
+            bases.append(alias)
+        classes.append([name, bases])
+        methods[name] = {}
+        for j in range(0, 3):
+            calls = [[name, "m" + str(rand.randrange(0, 3))]]
+            if len(fromimports) > 0 and rand.random() < 0.3:
+                alias = rand.choice(list(fromimports))
+                calls.append([alias, "m" + str(rand.randrange(0, 3))])
+            calls.append(["f" + str(rand.randrange(0, 5))])
+            methods[name]["m" + str(j)] = calls
+    for i in range(0, 5):
+        funcs["f" + str(i)] = [["f" + str(rand.randrange(0, 5))]]
+    return {"imports": {}, "fromimports": fromimports, "classes": classes, "funcs": funcs, "methods": methods}
+
+
+def build(summaries):
+    graph = projectGraph.project_graph()
+    for m in range(0, len(summaries)):
+        graph.add("pkg.mod" + str(m), summaries[m])
+    return graph
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    per_module = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    modules = count // per_module
+    rand = random.Random(0)
+    summaries = []
+    for m in range(0, modules):
+        summaries.append(make_summary(rand, m, per_module))
+
+    #timed without tracing, which slows down allocations a lot
+    start = time.perf_counter()
+    graph = build(summaries)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    recursion = graph.check_recursion(5)
+    inheritance = graph.check_inheritance()
+    analysed = time.perf_counter() - start
+
+    graph = None
+    tracemalloc.start()
+    graph = build(summaries)
+    size = tracemalloc.get_traced_memory()[0]
+    graph.check_recursion(5)
+    graph.check_inheritance()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print("Modules: %d, classes: %d, functions and methods: %d, interned names: %d" % (modules, len(graph.classes), len(graph.calls), len(graph.names)))
+    print("Build:   %.2fs, graph memory %.1f MB" % (built, size / 1024.0 / 1024.0))
+    print("Analyse: %.2fs, peak memory %.1f MB" % (analysed, peak / 1024.0 / 1024.0))
+    print("Recursive: %d, hierarchical: %d, multilevel: %d, diamond: %d" % (recursion, inheritance["hierarchical"], inheritance["multilevel"], inheritance["diamond"]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+
+#Compares the wall-clock time per 1000 files of running Pysonar2 once per
+#file, as analyze_project.sh used to, with the batched project mode, where
+#one JVM infers the whole project or each top-level directory and scanning
+#overlaps with it. The per-file run only covers a sample of the files.
+#Usage: python3 benchmarks/benchPysonarBatch.py <Pysonar2 Jar File> <Python Project Directory> [Per-file Sample Size]
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python3 benchmarks/benchPysonarBatch.py <Pysonar2 Jar File> <Python Project Directory> [Per-file Sample Size]")
+        sys.exit(-1)
+    jar = sys.argv[1]
+    project = sys.argv[2]
+    sample = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    sources = featureScanner.find_sources(project)
+    if len(sources) == 0:
+        print("No Python source files in " + project)
+        return
+    tmpdir = tempfile.mkdtemp()
+    try:
+        outdir = os.path.join(tmpdir, "perfile")
+        os.makedirs(outdir)
+        files = sources[:sample]
+        start = time.perf_counter()
+        for f in files:
+            subprocess.run(["java", "-jar", jar, f, outdir], stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        print("One JVM per file (%d files, without scanning): %.1fs per 1000 files" % (len(files), elapsed * 1000 / len(files)))
+
+        for batch in ("project", "dir"):
+            outdir = os.path.join(tmpdir, batch)
+            cmd = [sys.executable, os.path.join(BASE, "featureScanner.py"), "-p", project, "-t", outdir,
+                   "--pysonar", jar, "--pysonar-batch", batch, "-f", os.path.join(BASE, "config.ini"),
+                   "-l", os.path.join(BASE, "standard_res"), "-c", os.path.join(tmpdir, batch + ".csv")]
+            start = time.perf_counter()
+            subprocess.run(cmd, stdout = subprocess.DEVNULL, check = True)
+            elapsed = time.perf_counter() - start
+            print("Batch %-7s (%d files, with scanning): %.1fs per 1000 files" % (batch, len(sources), elapsed * 1000 / len(sources)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
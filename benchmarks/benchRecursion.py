@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import callGraph
+
+#Records the calls of a synthetic module with many methods and finds the
+#recursive ones, once with the previous callee lists and depth limited walk
+#and once with callee sets and strongly connected components, with and
+#without a bound on the cycle length.
+#Usage: python3 benchmarks/benchRecursion.py [Number of Methods] [Calls per Method]
+
+
+def legacy_check(funcsum, caller, callees, limit):
+    if caller in callees:
+        return True
+    if limit < 0:
+        return False
+    for f in callees:
+        if len(f) == 2 and f[0] in funcsum and f[1] in funcsum[f[0]]:
+            return legacy_check(funcsum, caller, funcsum[f[0]][f[1]], limit - 1)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    limit = 3
+    rand = random.Random(0)
+    methods = []
+    for i in range(0, count):
+        methods.append(("class" + str(i // 20), "method" + str(i)))
+    #calls to the following methods, many of them repeated, and sometimes a
+    #call back to a method of the same class which closes a cycle
+    recorded = []
+    for i in range(0, count):
+        seq = []
+        for j in range(0, calls):
+            if rand.random() < 0.01:
+                seq.append(methods[rand.randrange(i - i % 20, i + 1)])
+            else:
+                seq.append(methods[min(count - 1, i + rand.randrange(1, calls))])
+        recorded.append(seq)
+
+    start = time.perf_counter()
+    funcsum = {}
+    for i in range(0, count):
+        c, m = methods[i]
+        if c not in funcsum:
+            funcsum[c] = {}
+        callees = []
+        for callee in recorded[i]:
+            callee = list(callee)
+            if callee not in callees:
+                callees.append(callee)
+        funcsum[c][m] = callees
+    old_found = 0
+    for c in funcsum:
+        for m in funcsum[c]:
+            if legacy_check(funcsum, [c, m], funcsum[c][m], limit) == True:
+                old_found += 1
+    old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graph = {}
+    for i in range(0, count):
+        callees = set()
+        for callee in recorded[i]:
+            callees.add(callee)
+        graph[methods[i]] = callees
+    new_found = len(callGraph.recursive_nodes(graph))
+    new = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bounded_found = len(callGraph.recursive_nodes(graph, limit + 2))
+    bounded = time.perf_counter() - start
+
+    print("Methods: %d, recorded calls: %d" % (count, count * calls))
+    print("Callee lists and depth limited walk:    %.3fs, %d recursive" % (old, old_found))
+    print("Callee sets and SCCs:                   %.3fs, %d recursive" % (new, new_found))
+    print("Only cycles of at most %d functions:     +%.3fs, %d recursive" % (limit + 2, bounded, bounded_found))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import ast
+import csv
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import featureScanner
+import resultSink
+import syntheticCorpus
+
+#Times each phase of scanning files, parsing the AST, parsing the type
+#inference result HTML, visiting (with the checks after the visit) and writing
+#the CSV output, on synthetic projects from syntheticCorpus.py with the
+#results of fakePysonar.py, so it runs offline and without Java and gives
+#comparable numbers on every machine. One sweep doubles the lines of the
+#files, another the number of files. The standard lib info is loaded once,
+#before measuring. Peak memory of every phase is measured with tracemalloc in
+#a second pass, as tracing slows the scanner down. The numbers are written to
+#scaling.csv in the output directory, and plotted into scaling.png when
+#matplotlib is installed.
+#Usage: python3 benchmarks/benchScaling.py [Output Directory] [Most Lines per File] [Most Files] [Depth] [Hierarchy] [Calls]
+
+PHASES = ["ast_parse", "html_parse", "visit", "output"]
+#files of the size sweep, and lines per file of the count sweep
+SIZE_FILES = 10
+COUNT_LINES = 250
+
+
+def doubling(first, last):
+    res = []
+    while first <= last:
+        res.append(first)
+        first *= 2
+    return res
+
+
+def scan(sources, typeres, project, setup, lib, stdlib, csvfile, traced):
+    #seconds, or peak bytes with traced, of every phase over all files
+    res = dict.fromkeys(PHASES, 0)
+    files = []
+    for sourcefile in sources:
+        htmlfile = featureScanner.typeIndex.find_result(typeres, project, sourcefile)
+        files.append((sourcefile, open(sourcefile, "r").read(), open(htmlfile, "r").read()))
+    if os.path.exists(csvfile):
+        os.remove(csvfile)
+    sink = resultSink.csv_sink(csvfile)
+    visitor = featureScanner.analyzer(setup, lib, stdlib)
+    for sourcefile, source, html in files:
+        visitor.reset()
+        phase = [None]
+        def run():
+            if phase[0] == "ast_parse":
+                phase.append(ast.parse(source))
+            elif phase[0] == "html_parse":
+                visitor.load_types(phase[1], io.StringIO(html))
+            elif phase[0] == "visit":
+                visitor.visit(phase[1])
+                visitor.finalize()
+            else:
+                sink.write(sourcefile, visitor.counts)
+        for name in PHASES:
+            phase[0] = name
+            if traced:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                run()
+                res[name] = max(res[name], tracemalloc.get_traced_memory()[1] - before)
+            else:
+                start = time.perf_counter()
+                run()
+                res[name] += time.perf_counter() - start
+    start = time.perf_counter()
+    sink.close()
+    if not traced:
+        res["output"] += time.perf_counter() - start
+    return res
+
+
+def measure(workdir, files, lines, depth, hierarchy, calls, setup, lib, stdlib):
+    project = os.path.join(workdir, "project")
+    typeres = os.path.join(workdir, "typeres")
+    shutil.rmtree(project, ignore_errors = True)
+    shutil.rmtree(typeres, ignore_errors = True)
+    sources = syntheticCorpus.write_corpus(project, typeres, files, lines, depth, hierarchy, calls)
+    csvfile = os.path.join(workdir, "result.csv")
+    seconds = scan(sources, typeres, project, setup, lib, stdlib, csvfile, False)
+    tracemalloc.start()
+    try:
+        peaks = scan(sources, typeres, project, setup, lib, stdlib, csvfile, True)
+    finally:
+        tracemalloc.stop()
+    return seconds, peaks
+
+
+def plot(rows, pngfile):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, not plotting %s" % pngfile)
+        return
+    fig, axes = plt.subplots(2, 2, figsize = (11, 8))
+    for col, (sweep, x, label) in enumerate((("size", 2, "Lines per file (%d files)" % SIZE_FILES),
+                                             ("count", 1, "Files (%d lines each)" % COUNT_LINES))):
+        for phase in PHASES:
+            points = [row for row in rows if row[0] == sweep and row[3] == phase]
+            axes[0][col].plot([p[x] for p in points], [p[4] for p in points], marker = "o", label = phase)
+            axes[1][col].plot([p[x] for p in points], [p[5] for p in points], marker = "o", label = phase)
+        for row, ylabel in ((0, "Seconds"), (1, "Peak MB per file")):
+            axes[row][col].set_xscale("log", base = 2)
+            if row == 0:
+                #linear growth is a straight line of slope 1
+                axes[row][col].set_yscale("log")
+            axes[row][col].set_xlabel(label)
+            axes[row][col].set_ylabel(ylabel)
+            axes[row][col].legend()
+    fig.tight_layout()
+    fig.savefig(pngfile)
+    print("Plotted %s" % pngfile)
+
+
+def main():
+    outdir = sys.argv[1] if len(sys.argv) > 1 else "."
+    most_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 4000
+    most_files = int(sys.argv[3]) if len(sys.argv) > 3 else 160
+    depth = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+    hierarchy = sys.argv[5] if len(sys.argv) > 5 else "chain"
+    calls = int(sys.argv[6]) if len(sys.argv) > 6 else 3
+    setup = featureScanner.read_config(os.path.join(BASE, "config.ini"))
+    lib = os.path.join(BASE, "standard_res")
+    start = time.perf_counter()
+    stdlib = featureScanner.load_standard_libs(lib)
+    print("Standard lib info loaded in %.2fs" % (time.perf_counter() - start))
+    print("Depth %d, %s hierarchy, %d calls per function" % (depth, hierarchy, calls))
+
+    rows = []
+    workdir = tempfile.mkdtemp()
+    try:
+        points = [("size", SIZE_FILES, lines) for lines in doubling(125, most_lines)]
+        points += [("count", files, COUNT_LINES) for files in doubling(10, most_files)]
+        print("%-6s %6s %6s  %s" % ("Sweep", "Files", "Lines", "  ".join("%-21s" % (p + " s/MB") for p in PHASES)))
+        for sweep, files, lines in points:
+            seconds, peaks = measure(workdir, files, lines, depth, hierarchy, calls, setup, lib, stdlib)
+            cells = []
+            for phase in PHASES:
+                rows.append((sweep, files, lines, phase, seconds[phase], peaks[phase] / (1024 * 1024)))
+                cells.append("%-21s" % ("%.3f / %.2f" % (seconds[phase], peaks[phase] / (1024 * 1024))))
+            print("%-6s %6d %6d  %s" % (sweep, files, lines, "  ".join(cells)))
+    finally:
+        shutil.rmtree(workdir)
+
+    os.makedirs(outdir, exist_ok = True)
+    with open(os.path.join(outdir, "scaling.csv"), "w", newline = "") as f:
+        out = csv.writer(f)
+        out.writerow(["sweep", "files", "lines", "phase", "seconds", "peak_mb"])
+        out.writerows(rows)
+    print("Wrote %s" % os.path.join(outdir, "scaling.csv"))
+    plot(rows, os.path.join(outdir, "scaling.png"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import ast
+import os
+import subprocess
+import sys
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+import scanSession
+
+#Measures the latency of scanning one small source with the local type
+#inference, through a scan session, through a new analyzer per source in
+#the same process, and through one featureScanner.py process per source as
+#a service had to do before. The session results are checked against the
+#analyzer's.
+#Usage: python3 benchmarks/benchSession.py [Python Source File] [Number of Scans]
+
+
+def main():
+    sourcefile = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.__file__), "colorsys.py")
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    cfg_file = os.path.join(BASE, "config.ini")
+    lib = os.path.join(BASE, "standard_res")
+    text = open(sourcefile, "r").read()
+
+    start = time.perf_counter()
+    session = scanSession.scan_session(cfg_file, lib)
+    created = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(0, count):
+        counts = session.scan_source(text)
+    warm = (time.perf_counter() - start) / count
+
+    setup = featureScanner.read_config(cfg_file)
+    stdlib = featureScanner.load_standard_libs(lib)
+    start = time.perf_counter()
+    for i in range(0, count):
+        visitor = featureScanner.analyzer(setup, lib, stdlib)
+        visitor.run(ast.parse(text), None)
+    fresh = (time.perf_counter() - start) / count
+    if counts.featuremap() != visitor.featuremap:
+        print("Warning: the session counts differ from the analyzer's")
+
+    runs = min(count, 10)
+    start = time.perf_counter()
+    for i in range(0, runs):
+        subprocess.run([sys.executable, os.path.join(BASE, "featureScanner.py"), "-s", sourcefile, "--no-typeres",
+                        "-f", cfg_file, "-l", lib], stdout = subprocess.DEVNULL, check = True)
+    process = (time.perf_counter() - start) / runs
+
+    print("Source: %s, %d lines" % (sourcefile, text.count("\n")))
+    print("Session created once:        %.1f ms" % (created * 1000))
+    print("Session scan_source:         %.2f ms per source" % (warm * 1000))
+    print("New analyzer per source:     %.2f ms per source" % (fresh * 1000))
+    print("featureScanner.py process:   %.1f ms per source" % (process * 1000))
+
+if __name__ == "__main__":
+    main()
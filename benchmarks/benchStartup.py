@@ -0,0 +1,78 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+#Measures the startup cost of the scanner with python -X importtime and checks
+#that the heavy optional packages stay off the plain scanning path. Bytecode
+#goes to a temporary cache so warm starts are measured even when
+#PYTHONDONTWRITEBYTECODE is set. Exits non-zero if the median import time of
+#featureScanner is above the given limit.
+#Usage: python3 benchmarks/benchStartup.py [Runs] [Max Milliseconds]
+
+HEAVY = ["pandas", "bs4", "astpretty", "prettytable", "sqlite3", "concurrent.futures", "numpy"]
+
+
+def import_times(pycache):
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    cmd = [sys.executable, "-X", "importtime", "-X", "pycache_prefix=" + pycache, "-c", "import featureScanner"]
+    res = subprocess.run(cmd, cwd = BASE, env = env, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE,
+                         universal_newlines = True, check = True)
+    times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if not parts[0].strip().isdigit():
+            continue
+        #self and cumulative time in microseconds
+        times[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    return times
+
+
+def loaded_modules():
+    cmd = [sys.executable, "-c", "import sys, featureScanner; print(' '.join(sys.modules))"]
+    res = subprocess.run(cmd, cwd = BASE, stdout = subprocess.PIPE, universal_newlines = True, check = True)
+    return set(res.stdout.split())
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    limit = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    pycache = tempfile.mkdtemp()
+    try:
+        import_times(pycache)
+        samples = []
+        for i in range(0, runs):
+            samples.append(import_times(pycache))
+    finally:
+        shutil.rmtree(pycache)
+
+    totals = sorted(s["featureScanner"][1] for s in samples)
+    median = totals[len(totals) // 2] / 1000
+    print("import featureScanner: median %.1fms, best %.1fms over %d runs" % (median, totals[0] / 1000, runs))
+    print("Slowest modules (cumulative, last run):")
+    last = samples[len(samples) - 1]
+    names = sorted(last, key = lambda n: last[n][1], reverse = True)
+    for name in names[1:11]:
+        print("  %-30s %6.1fms" % (name.strip(), last[name][1] / 1000))
+
+    modules = loaded_modules()
+    failed = False
+    for name in HEAVY:
+        if name in modules:
+            print("Heavy module imported at startup: " + name)
+            failed = True
+    if limit != None and median > limit:
+        print("Startup %.1fms is above the limit of %.1fms" % (median, limit))
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
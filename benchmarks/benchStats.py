@@ -0,0 +1,98 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import featureSchema
+import featureStats
+
+#Computes feature totals, per-project totals, per-file percentiles and the
+#number of projects using every feature for synthetic per-file counts, once
+#by merging nested featuremaps and sorting per-feature lists in Python, as
+#the results were kept before, and once with the numpy aggregator.
+#Usage: python3 benchmarks/benchStats.py [Number of Files] [Number of Projects]
+
+
+def merge_featuremap(total, featuremap):
+    for key in featuremap:
+        if isinstance(featuremap[key], dict):
+            merge_featuremap(total[key], featuremap[key])
+        else:
+            total[key] += featuremap[key]
+
+
+def flat_values(featuremap, values):
+    for key in featuremap:
+        if isinstance(featuremap[key], dict):
+            flat_values(featuremap[key], values)
+        else:
+            values.append(featuremap[key])
+    return values
+
+
+def legacy_stats(files, percentiles):
+    zeros = featureSchema.to_featuremap(featureSchema.new_counts())
+    total = featureSchema.to_featuremap(featureSchema.new_counts())
+    projects = {}
+    columns = [[] for name in featureSchema.FEATURES]
+    for project, featuremap in files:
+        merge_featuremap(total, featuremap)
+        if project not in projects:
+            projects[project] = featureSchema.to_featuremap(featureSchema.new_counts())
+        merge_featuremap(projects[project], featuremap)
+        values = flat_values(featuremap, [])
+        for i in range(0, len(values)):
+            columns[i].append(values[i])
+    res = []
+    for column in columns:
+        column.sort()
+        res.append([column[min(len(column) - 1, int(len(column) * p / 100))] for p in percentiles])
+    using = [0] * len(featureSchema.FEATURES)
+    for project in projects:
+        values = flat_values(projects[project], [])
+        for i in range(0, len(values)):
+            if values[i] > 0:
+                using[i] += 1
+    return flat_values(total, []), res, using
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    project_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rand = random.Random(0)
+    rows = []
+    for i in range(0, count):
+        counts = featureSchema.new_counts()
+        for j in range(0, len(counts)):
+            if rand.random() < 0.3:
+                counts[j] = int(rand.expovariate(0.2))
+        rows.append((rand.randrange(0, project_count), counts))
+
+    files = [(project, featureSchema.to_featuremap(counts)) for project, counts in rows]
+    start = time.perf_counter()
+    old_totals, old_percentiles, old_using = legacy_stats(files, featureStats.PERCENTILES)
+    old = time.perf_counter() - start
+    files = None
+
+    start = time.perf_counter()
+    stats = featureStats.aggregator()
+    for project, counts in rows:
+        stats.add(project, counts)
+    added = time.perf_counter() - start
+    start = time.perf_counter()
+    totals = stats.totals()
+    stats.project_totals()
+    stats.percentiles()
+    using = stats.projects_using()
+    new = time.perf_counter() - start
+
+    print("Files: %d, projects: %d, features: %d" % (count, project_count, len(featureSchema.FEATURES)))
+    print("Nested featuremaps and lists: %.2fs" % old)
+    print("Aggregator: %.2fs to add the files, %.3fs for the statistics" % (added, new))
+    if list(totals) != old_totals or list(using) != old_using:
+        print("Warning: the totals differ!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import ast
+import configparser
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import featureScanner
+import fakePysonar
+import typeIndex
+
+#Measures how many AST nodes per second the analyzer visits. The type index
+#and the standard lib info are prepared up front so only the traversal and
+#the checks done on the way are timed.
+#Usage: python3 benchmarks/benchTraversal.py [Python Source Files or Directory]
+
+
+def main():
+    paths = sys.argv[1:]
+    if len(paths) == 0:
+        paths = [os.path.dirname(os.__file__)]
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(glob.glob(os.path.join(path, "*.py")))
+        else:
+            files.append(path)
+
+    config = configparser.ConfigParser()
+    config.read(os.path.join(BASE, "config.ini"))
+    setup = dict(config["scanner_defaults"])
+    stdlib = featureScanner.load_standard_libs(os.path.join(BASE, "standard_res"))
+
+    inputs = []
+    for f in files:
+        try:
+            source = open(f, "r").read()
+            root = ast.parse(source)
+        except (SyntaxError, ValueError, UnicodeDecodeError):
+            continue
+        index = typeIndex.load(fakePysonar.generate(source))
+        nodes = sum(1 for n in ast.walk(root))
+        inputs.append((root, index, nodes))
+
+    total_nodes = 0
+    elapsed = 0.0
+    for root, index, nodes in inputs:
+        visitor = featureScanner.analyzer(setup, None, stdlib)
+        visitor.typeindex = index
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            visitor.visit(root)
+            visitor.finalize()
+        elapsed += time.perf_counter() - start
+        total_nodes += nodes
+
+    start = time.perf_counter()
+    for root, index, nodes in inputs:
+        ast.NodeVisitor().visit(root)
+    bare = time.perf_counter() - start
+
+    print("Files: %d, AST nodes: %d" % (len(inputs), total_nodes))
+    print("Analyzer:                 %.2fs, %.0f nodes/s" % (elapsed, total_nodes / elapsed))
+    print("Bare ast.NodeVisitor walk: %.2fs, %.0f nodes/s" % (bare, total_nodes / bare))
+
+
+if __name__ == "__main__":
+    main()
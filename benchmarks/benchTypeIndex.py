@@ -0,0 +1,88 @@
+import ast
+import configparser
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import featureScanner
+import fakePysonar
+from bs4 import BeautifulSoup
+
+#Compares the type lookups answered from the per-file type index against the
+#previous behaviour, which searched the whole Pysonar2 HTML document on every
+#lookup.
+#Usage: python3 benchmarks/benchTypeIndex.py [Python Source File]
+
+
+class legacy_analyzer(featureScanner.analyzer):
+    def run(self, node, html):
+        self.soup = BeautifulSoup(html, features="html.parser")
+        self.visit(node)
+        self.finalize()
+
+    def line_anchors(self, name, lineno):
+        spans = self.soup.find_all(class_ ="lineno")
+        if len(spans) < lineno:
+            return []
+        titles = []
+        p = spans[lineno - 1].next_sibling
+        while(p != None and p.name != "span"):
+            if hasattr(p, "xid") and hasattr(p, "title") and p.string == name:
+                titles.append(p["title"])
+            p = p.next_sibling
+        return titles
+
+    def check_func(self, name, lineno):
+        self.typeindex = {(lineno, name): self.line_anchors(name, lineno)}
+        return featureScanner.analyzer.check_func(self, name, lineno)
+
+    def check_heterogeneous(self, name, lineno):
+        self.typeindex = {(lineno, name): self.line_anchors(name, lineno)}
+        return featureScanner.analyzer.check_heterogeneous(self, name, lineno)
+
+    def check_polymorphism(self, name, lineno):
+        self.typeindex = {(lineno, name): self.line_anchors(name, lineno)}
+        return featureScanner.analyzer.check_polymorphism(self, name, lineno)
+
+    def check_type(self, name, lineno):
+        self.typeindex = {(lineno, name): self.line_anchors(name, lineno)}
+        return featureScanner.analyzer.check_type(self, name, lineno)
+
+
+def scan(cls, setup, lib, root, html):
+    visitor = cls(setup, lib)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        visitor.run(root, io.StringIO(html))
+    return time.perf_counter() - start, visitor.featuremap
+
+
+def main():
+    base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    sourcefile = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.__file__), "argparse.py")
+    config = configparser.ConfigParser()
+    config.read(os.path.join(base, "config.ini"))
+    setup = dict(config["scanner_defaults"])
+    lib = os.path.join(base, "standard_res")
+
+    source = open(sourcefile, "r").read()
+    html = fakePysonar.generate(source)
+    root = ast.parse(source)
+    print("File: " + sourcefile + " (" + str(len(source.splitlines())) + " lines, " + str(len(html)) + " bytes of HTML)")
+
+    before, before_map = scan(legacy_analyzer, setup, lib, root, html)
+    print("Before (find_all per lookup): %.2fs" % before)
+    after, after_map = scan(featureScanner.analyzer, setup, lib, root, html)
+    print("After (type index):           %.2fs" % after)
+    print("Speedup: %.1fx" % (before / after))
+    if before_map != after_map:
+        print("Warning: the feature counts differ!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import ast
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import localTypes
+import pysonarTypes
+
+#Runs the function, heterogeneous and polymorphism checks on every type title
+#the local type inference gives the standard lib modules, which are written
+#in Pysonar2's notation, once with the string tests the checks did before and
+#once with the parsed types, with the parse cache cold and warm. Titles on
+#which the checks disagree are counted.
+#Usage: python3 benchmarks/benchTypeParse.py [Standard Lib Directory] [Number of Modules]
+
+
+def legacy_func(t):
+    return "->" in t and "(" in t and ")" in t
+
+
+def legacy_heterogeneous(t):
+    if t.startswith("[") and t.endswith("]") and "|" in t:
+        types = t[2:len(t) - 3].split(" | ")
+        count = 0
+        for i in types:
+            if "#" not in i and "?" not in i:
+                count += 1
+        if count > 1:
+            return "list"
+        else:
+            return False
+    if t.startswith("(") and t.endswith(")"):
+        res = t[1: len(t) - 1]
+        types = res.split(", ")
+        for i in types:
+            for j in types:
+                if i != j and "?" not in i and "?" not in j and "#" not in i and "#" not in j:
+                    return "tuple"
+    return None
+
+
+def legacy_polymorphism(t):
+    types = t.split(" / ")
+    count = 0
+    returnvalues = {}
+    for t in types:
+        if "?" not in t and " -> " in t:
+            sig = t.split(" -> ")
+            if "|" in sig[0] and "{" in sig[0] and "}" in sig[0] and "None" not in sig[0]:
+                return True
+            if sig[1] not in returnvalues and "None" not in sig[0]:
+                returnvalues[sig[1]] = sig[0]
+            elif sig[1] in returnvalues and returnvalues[sig[1]] != sig[0] and "None" not in sig[0]:
+                count += 1
+    return count > 0
+
+
+def legacy_checks(titles):
+    return [(legacy_func(t), legacy_heterogeneous(t), legacy_polymorphism(t)) for t in titles]
+
+
+def parsed_checks(titles):
+    res = []
+    for t in titles:
+        p = pysonarTypes.parse(t)
+        res.append((p.function, pysonarTypes.heterogeneous(p), pysonarTypes.polymorphic(p, True)))
+    return res
+
+
+def main():
+    libdir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.__file__)
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    titles = []
+    modules = 0
+    for dirpath, dirnames, filenames in os.walk(libdir):
+        dirnames.sort()
+        for f in sorted(filenames):
+            if not f.endswith(".py") or modules >= count:
+                continue
+            try:
+                root = ast.parse(open(os.path.join(dirpath, f), "r").read())
+                index = localTypes.infer(root)
+            except (SyntaxError, ValueError, UnicodeDecodeError, RecursionError):
+                continue
+            modules += 1
+            for key in index:
+                titles.extend(index[key])
+
+    start = time.perf_counter()
+    old = legacy_checks(titles)
+    legacy = time.perf_counter() - start
+    pysonarTypes.parse.cache_clear()
+    pysonarTypes.interned.clear()
+    start = time.perf_counter()
+    new = parsed_checks(titles)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    parsed_checks(titles)
+    warm = time.perf_counter() - start
+    info = pysonarTypes.parse.cache_info()
+
+    print("Titles: %d from %d modules, %d distinct" % (len(titles), modules, len(set(titles))))
+    print("String tests:         %.3fs, %.2f us per title" % (legacy, legacy * 1e6 / len(titles)))
+    print("Parsed, cache cold:   %.3fs, %.2f us per title" % (cold, cold * 1e6 / len(titles)))
+    print("Parsed, cache warm:   %.3fs, %.2f us per title" % (warm, warm * 1e6 / len(titles)))
+    print("Cache: %d hits, %d misses, %d types made" % (info.hits, info.misses, len(pysonarTypes.interned)))
+    differ = [titles[i] for i in range(0, len(titles)) if old[i] != new[i]]
+    print("Titles checked differently: %d" % len(differ))
+    for t in sorted(set(differ))[:5]:
+        print("  " + t)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import ast
+import html
+import io
+import sys
+import tokenize
+import zlib
+
+#Writes a Pysonar2-like HTML type inference result for a source file, so the
+#scanner can be benchmarked without a JVM. The layout follows Pysonar2's
+#output: one <span class='lineno'> per source line followed by an anchor for
+#every identifier with its type in the title attribute.
+
+SIMPLE_TYPES = ["int", "str", "float", "bool", "?", "None"]
+
+
+def collect_kinds(root):
+    kinds = {}
+    for node in ast.walk(root):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            kinds[node.name] = "func"
+        elif isinstance(node, ast.Assign):
+            for t in node.targets:
+                if isinstance(t, ast.Name):
+                    if isinstance(node.value, ast.List):
+                        kinds[t.id] = "list"
+                    elif isinstance(node.value, ast.Tuple):
+                        kinds[t.id] = "tuple"
+                    elif isinstance(node.value, ast.Lambda):
+                        kinds[t.id] = "func"
+    return kinds
+
+
+def title_for(name, kind):
+    h = zlib.crc32(name.encode("utf-8"))
+    if kind == "func":
+        if h % 3 == 0:
+            return "(int) -> int / (str) -> int"
+        return "(int, str) -> None"
+    if kind == "list":
+        if h % 2 == 0:
+            return "[{int | str}]"
+        return "[int]"
+    if kind == "tuple":
+        if h % 2 == 0:
+            return "(int, str)"
+        return "(int, int)"
+    return SIMPLE_TYPES[h % len(SIMPLE_TYPES)]
+
+
+def generate(source):
+    root = ast.parse(source)
+    kinds = collect_kinds(root)
+    lines = source.splitlines()
+    anchors = {}
+    tokens = tokenize.generate_tokens(io.StringIO(source).readline)
+    for tok in tokens:
+        if tok.type == tokenize.NAME and tok.start[0] == tok.end[0]:
+            anchors.setdefault(tok.start[0], []).append((tok.start[1], tok.end[1], tok.string))
+
+    out = ["<html><head><title>fake pysonar</title></head><body><pre>"]
+    xid = 0
+    for lineno in range(1, len(lines) + 1):
+        line = lines[lineno - 1]
+        out.append("<span class='lineno'>%4d</span> " % lineno)
+        pos = 0
+        for start, end, name in anchors.get(lineno, []):
+            xid += 1
+            out.append(html.escape(line[pos:start]))
+            out.append("<a name='n%d' id='%d' xid='%d' class='anchor' title='%s'>%s</a>"
+                       % (xid, xid, xid, html.escape(title_for(name, kinds.get(name)), quote = True), name))
+            pos = end
+        out.append(html.escape(line[pos:]))
+        out.append("\n")
+    out.append("</pre></body></html>")
+    return "".join(out)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python3 benchmarks/fakePysonar.py <Python Source File> <HTML File>")
+        sys.exit(-1)
+    with open(sys.argv[1], "r") as f:
+        content = generate(f.read())
+    with open(sys.argv[2], "w") as f:
+        f.write(content)
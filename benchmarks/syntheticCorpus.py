@@ -0,0 +1,179 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fakePysonar
+
+#Writes a synthetic Python project and its Pysonar2-like type inference
+#results, for benchmarks which have to give the same numbers on every machine
+#without a JVM or a network. A module is made of classes and functions until
+#it has the given number of lines. The bodies of functions nest loops, try
+#statements and nested functions up to the given depth, and make the given
+#number of calls to the other functions, the classes inherit in the given
+#shape:
+#  flat       every class on its own
+#  chain      every class from the one before, multilevel inheritance
+#  wide       every class from the first one, hierarchical inheritance
+#  diamond    every class from the two before, diamond inheritance
+#Most handlers of the scanner find something to count. The modules are only
+#parsed, never run, and the same arguments and seed give the same files.
+#Usage: python3 benchmarks/syntheticCorpus.py <Project Directory> <Type Inference Result Directory> [Files] [Lines] [Depth] [Hierarchy] [Calls]
+
+HIERARCHIES = ["flat", "chain", "wide", "diamond"]
+BLOCKS = ["for", "while", "try", "def"]
+#modules per package
+PACKAGE = 50
+
+
+class module:
+    def __init__(self, rng, depth, hierarchy, calls):
+        self.rng = rng
+        self.depth = depth
+        self.hierarchy = hierarchy
+        self.calls = calls
+        self.lines = []
+        self.functions = []
+        self.classes = []
+
+    def add(self, indent, line):
+        self.lines.append("    " * indent + line)
+
+    def call(self, indent, args):
+        #callees are the functions made so far and the one being made, so some
+        #calls are recursive
+        callee = self.rng.choice(self.functions)
+        if self.rng.random() < 0.3:
+            self.add(indent, "r = %s(%s, *rest, key=r)" % (callee, args))
+        else:
+            self.add(indent, "r = %s(%s)" % (callee, args))
+
+    def block(self, indent, level, var):
+        if level >= self.depth:
+            for i in range(0, self.calls):
+                self.call(indent, var)
+            self.add(indent, "items = [x * 2 for x in range(%s) if x != r]" % var)
+            return
+        kind = BLOCKS[level % len(BLOCKS)]
+        if kind == "for":
+            self.add(indent, "for i%d in range(%s):" % (level, var))
+            self.add(indent + 1, "if i%d %% 7 == 0:" % level)
+            self.add(indent + 2, "continue")
+            self.block(indent + 1, level + 1, "i" + str(level))
+        elif kind == "while":
+            self.add(indent, "while %s > 0:" % var)
+            self.add(indent + 1, "%s -= 1" % var)
+            self.add(indent + 1, "if %s == 3:" % var)
+            self.add(indent + 2, "break")
+            self.block(indent + 1, level + 1, var)
+        elif kind == "try":
+            self.add(indent, "try:")
+            self.block(indent + 1, level + 1, var)
+            self.add(indent, "except (KeyError, ValueError) as e:")
+            self.add(indent + 1, "raise RuntimeError(*e.args)")
+        else:
+            self.add(indent, "def inner%d(v%d, *rest, key=None):" % (level, level))
+            self.block(indent + 1, level + 1, "v" + str(level))
+            self.add(indent + 1, "return v%d, key" % level)
+            self.add(indent, "r = inner%d(%s, key=r)" % (level, var))
+
+    def function(self, name, decorated):
+        self.functions.append(name)
+        if decorated:
+            self.add(0, "@functools.lru_cache(maxsize=None)")
+        self.add(0, "def %s(a: int, *rest, key=None, **options) -> int:" % name)
+        self.add(1, "r = key")
+        self.block(1, 0, "a")
+        if self.rng.random() < 0.5:
+            self.add(1, "return r, a")
+        else:
+            self.add(1, "yield r")
+        self.add(0, "")
+
+    def cls(self, i):
+        name = "Node%d" % i
+        bases = []
+        if len(self.classes) > 0:
+            if self.hierarchy == "chain":
+                bases = [self.classes[len(self.classes) - 1]]
+            elif self.hierarchy == "wide":
+                bases = [self.classes[0]]
+            elif self.hierarchy == "diamond":
+                bases = self.classes[max(0, len(self.classes) - 2):]
+                bases.reverse()
+        self.classes.append(name)
+        if len(bases) > 0:
+            self.add(0, "class %s(%s):" % (name, ", ".join(bases)))
+        else:
+            self.add(0, "class %s:" % name)
+        self.add(1, "class Options:")
+        self.add(2, "depth = 0")
+        self.add(0, "")
+        self.add(1, "def __init__(self, a, key=None):")
+        self.add(2, "self._size = a")
+        self.add(2, "self.__key = key")
+        self.add(2, "self.pair = (a, 'name')")
+        self.add(2, "self.items = [a, 'name', None]")
+        self.add(0, "")
+        self.add(1, "def _visit(self, a, *, depth=0):")
+        self.add(2, "if isinstance(a, %s) and hasattr(a, '_size'):" % name)
+        self.add(3, "return getattr(a, '_size')")
+        for i in range(0, self.calls):
+            self.add(2, "a = %s(a, key=self.pair[0])" % self.rng.choice(self.functions))
+        self.add(2, "return self._visit(self.items[depth], depth=depth + 1)")
+        self.add(0, "")
+        self.add(1, "def __check(self, a, /, b):")
+        self.add(2, "setattr(self, 'checked', a)")
+        self.add(2, "return self.items[a], self.pair[b]")
+        self.add(0, "")
+
+    def generate(self, size):
+        self.add(0, "import functools")
+        self.add(0, "")
+        self.add(0, "handler = lambda x: x")
+        self.add(0, "table = [1, 'one', 1.0]")
+        self.add(0, "pair = (1, 'one')")
+        self.add(0, "first = table[0] + pair[0]")
+        self.add(0, "mapped = list(map(handler, table))")
+        self.add(0, "")
+        i = 0
+        while len(self.lines) < size:
+            self.function("work%d" % i, i % 5 == 0)
+            if i % 3 == 0:
+                self.cls(i)
+            i += 1
+        return "\n".join(self.lines) + "\n"
+
+
+def generate(size, depth = 3, hierarchy = "chain", calls = 3, seed = 0):
+    #the source of a module of about size lines
+    if hierarchy not in HIERARCHIES:
+        raise ValueError("Unknown hierarchy " + hierarchy + ", please use one of " + ", ".join(HIERARCHIES))
+    return module(random.Random(seed), depth, hierarchy, calls).generate(size)
+
+
+def write_corpus(project, typeres, files, size, depth = 3, hierarchy = "chain", calls = 3, seed = 0):
+    #files modules in packages of PACKAGE, the results where the scanner finds
+    #them with -t, returns the source files
+    sources = []
+    for i in range(0, files):
+        relpath = os.path.join("pkg%d" % (i // PACKAGE), "mod%d.py" % i)
+        source = generate(size, depth, hierarchy, calls, seed * 1000003 + i)
+        for directory, name, content in ((project, relpath, source), (typeres, relpath + ".html", None)):
+            path = os.path.join(directory, name)
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            if content == None:
+                content = fakePysonar.generate(source)
+            with open(path, "w") as f:
+                f.write(content)
+        sources.append(os.path.join(project, relpath))
+    return sources
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python3 benchmarks/syntheticCorpus.py <Project Directory> <Type Inference Result Directory> [Files] [Lines] [Depth] [Hierarchy] [Calls]")
+        sys.exit(-1)
+    args = sys.argv[3:] + [None] * 5
+    write_corpus(sys.argv[1], sys.argv[2], int(args[0] or 100), int(args[1] or 500), int(args[2] or 3), args[3] or "chain", int(args[4] or 3))
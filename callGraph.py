@@ -0,0 +1,124 @@
+#Call graphs are dicts from a function to the set of its callees. Callees
+#which are not keys of the graph, like library functions, are ignored.
+
+
+def strongly_connected(graph):
+    #Tarjan's algorithm, walking with an explicit stack so deep call chains
+    #do not hit the recursion limit
+    index = {}
+    lowlink = {}
+    onstack = set()
+    stack = []
+    components = []
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        onstack.add(root)
+        work = [(root, iter(graph[root]))]
+        while len(work) > 0:
+            node, callees = work[len(work) - 1]
+            advanced = False
+            for callee in callees:
+                if callee not in graph:
+                    continue
+                if callee not in index:
+                    index[callee] = lowlink[callee] = len(index)
+                    stack.append(callee)
+                    onstack.add(callee)
+                    work.append((callee, iter(graph[callee])))
+                    advanced = True
+                    break
+                if callee in onstack and index[callee] < lowlink[node]:
+                    lowlink[node] = index[callee]
+            if advanced:
+                continue
+            work.pop()
+            if len(work) > 0:
+                parent = work[len(work) - 1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    onstack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def reach(graph, node, members, depth):
+    #breadth first search from node within members, mapping every function
+    #reached to the one it was reached from
+    parents = {}
+    frontier = [node]
+    for i in range(0, depth):
+        following = []
+        for n in frontier:
+            for callee in graph[n]:
+                if callee in members and callee not in parents:
+                    parents[callee] = n
+                    if callee == node:
+                        return parents
+                    following.append(callee)
+        if len(following) == 0:
+            break
+        frontier = following
+    return parents
+
+
+def walk_back(parents, start, node):
+    path = [start]
+    n = parents[start]
+    while n != node:
+        path.append(n)
+        n = parents[n]
+    return path
+
+
+def short_cycle(graph, reverse, node, members, limit):
+    #a cycle through node of at most limit calls, searched from both ends so
+    #each search only goes about half of the limit deep
+    forward = reach(graph, node, members, (limit + 1) // 2)
+    if node in forward:
+        return walk_back(forward, node, node)
+    backward = reach(reverse, node, members, limit // 2)
+    if node in backward:
+        return walk_back(backward, node, node)
+    for n in forward:
+        if n in backward:
+            return walk_back(forward, n, node) + walk_back(backward, n, node) + [node]
+    return None
+
+
+def recursive_nodes(graph, limit = None):
+    #every function on a call cycle, with a limit only on cycles of at most
+    #that many functions
+    found = set()
+    for component in strongly_connected(graph):
+        if len(component) == 1:
+            if component[0] in graph[component[0]]:
+                found.add(component[0])
+        elif limit == None:
+            found.update(component)
+        else:
+            members = set(component)
+            reverse = {}
+            for node in component:
+                reverse[node] = []
+            for node in component:
+                for callee in graph[node]:
+                    if callee in members:
+                        reverse[callee].append(node)
+            #all functions on a short cycle are recursive, not only the one
+            #it was found from
+            for node in component:
+                if node not in found:
+                    cycle = short_cycle(graph, reverse, node, members, limit)
+                    if cycle != None:
+                        found.update(cycle)
+    return found
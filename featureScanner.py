@@ -1,61 +1,156 @@
 import ast
-import astpretty
-from bs4 import BeautifulSoup
-import re
 import sys, getopt
-from prettytable import PrettyTable
 import configparser
-import pandas as pd
+import locale
 import os
-import datetime
 import time
-import signal
-
-class TimeoutError(Exception):
-    def __init__(self, msg):
-        super(TimeoutError, self).__init__()
-        self.msg = msg
- 
- 
-def time_out(interval, callback):
-    def decorator(func):
-        def handler(signum, frame):
-            raise TimeoutError("Scanner Timed Out. This may because it encounters a very large file.")
- 
-        def wrapper(*args, **kwargs):
-            try:
-                signal.signal(signal.SIGALRM, handler)
-                signal.alarm(interval)     
-                result = func(*args, **kwargs)
-                signal.alarm(0)         
-                return result
-            except TimeoutError:
-                callback()
-        return wrapper
-    return decorator
- 
- 
-def timeout_callback():
-    print("Scanner Timed Out. This may because it encounters a very large file.")
-
-class analyzer(ast.NodeVisitor):
-    def __init__(self, setup, lib):
-        self.featuremap = {}
+import typeIndex
+import pysonarTypes
+import stdlibIndex
+import callGraph
+import featureSchema
+import resultSink
+
+#astpretty, prettytable, workerPool and resultCache are only imported by the
+#code paths using them, so a plain scan starts quickly
+
+#fields holding expression contexts and operators, which are leaves that no
+#handler is interested in
+LEAF_FIELDS = ["ctx", "op", "ops"]
+NODE_FIELDS = {}
+
+#Children of a node in the order ast.NodeVisitor visits them
+def child_nodes(node):
+    fields = NODE_FIELDS.get(type(node))
+    if fields == None:
+        fields = tuple([f for f in node._fields if f not in LEAF_FIELDS])
+        NODE_FIELDS[type(node)] = fields
+    children = []
+    for field in fields:
+        value = getattr(node, field, None)
+        if isinstance(value, ast.AST):
+            children.append(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, ast.AST):
+                    children.append(item)
+    return children
+
+
+#A class body, or the module for the outermost scope, with the stack of
+#functions currently open in it
+class scope:
+    __slots__ = ("name", "funcs", "attrs")
+
+    def __init__(self, name):
+        self.name = name
+        self.funcs = []
+        self.attrs = []
+
+
+#features answered from the type inference result, and those answered from
+#the standard lib info, a scan counting none of them loads neither
+TYPE_FEATURES = frozenset([
+    "TS.first_class_function.function_as_parameter",
+    "TS.first_class_function.function_as_returnvalue",
+    "TS.first_class_function.function_assignedto_var",
+    "OOP.polymorphism.parametic",
+    "DS.heterogeneous_list.constant_index",
+    "DS.heterogeneous_list.variable_index",
+    "DS.heterogeneous_tuple.constant_index",
+    "DS.heterogeneous_tuple.variable_index",
+    #calls on objects are told apart by the type of the object
+    "FCAP.recursion",
+])
+STDLIB_FEATURES = frozenset([
+    "TS.first_class_function.function_as_parameter",
+    "TS.first_class_function.function_assignedto_var",
+    "OOP.polymorphism.parametic",
+])
+
+#the features counted by each handler, a handler none of whose features are
+#selected is left out. The handlers of imports, functions and classes keep
+#the state of the others, and the one of raise picks the nodes visited below
+#it, so they are always there.
+HANDLER_FEATURES = {
+    "visit_Return": ["FCAP.multiple_return", "TS.first_class_function.function_as_returnvalue"],
+    "visit_arguments": ["FCAP.kwonlyargs", "FCAP.posonlyargs", "FCAP.kwarg", "FCAP.packing_and_unpacking.packing", "TS.gradual_typing"],
+    "visit_While": ["FCAP.loop.while"],
+    "visit_For": ["FCAP.loop.for"],
+    "visit_Continue": ["FCAP.loop.continue"],
+    "visit_Break": ["FCAP.loop.break"],
+    "visit_Call": ["FCAP.packing_and_unpacking.unpacking", "FCAP.kwarg", "TS.first_class_function.function_as_parameter",
+                   "MP.introspection", "MP.reflection", "OOP.polymorphism.parametic", "FCAP.recursion"],
+    "visit_Try": ["FCAP.exception.try"],
+    "visit_Name": ["FCAP.exception.with_args"],
+    "visit_Yield": ["ES.generator"],
+    "visit_ListComp": ["DS.list_comprehension"],
+    "visit_Assign": ["TS.first_class_function.function_assignedto_var", "OOP.encapsulation.protected.var", "OOP.encapsulation.private.var"],
+    "visit_Subscript": ["DS.heterogeneous_list.constant_index", "DS.heterogeneous_list.variable_index",
+                        "DS.heterogeneous_tuple.constant_index", "DS.heterogeneous_tuple.variable_index"],
+    "visit_Delete": ["MP.reflection"],
+    "visit_Attribute": ["MP.introspection"],
+}
+
+
+def selected_features(setup):
+    #the features setup selects, None for all of them
+    features = setup.get("features", "")
+    if features == None or features.strip() == "":
+        return None
+    return featureSchema.select(features.split(","))
+
+
+def needs_types(features):
+    return features == None or not features.isdisjoint(TYPE_FEATURES)
 
+
+def needs_stdlib(features):
+    return features == None or not features.isdisjoint(STDLIB_FEATURES)
+
+
+class analyzer:
+    def __init__(self, setup, lib, stdlib = None):
         self.setup = {}
         self.setup["introspection_funcs"] = setup["introspection_funcs"].split(", ")
         self.setup["introspection_attrs"] = setup["introspection_attrs"].split(", ")
         self.setup["reflection_funcs"] = setup["reflection_funcs"].split(", ")
-        self.setup["recursion_limit"] = int(setup["recursion_limit"])
+        #an empty recursion limit counts call cycles of any length
+        limit = setup.get("recursion_limit", "").strip()
+        self.setup["recursion_limit"] = int(limit) if limit != "" else None
         self.lib = lib
+        #the features counted, None for all, the others stay 0
+        self.features = selected_features(setup)
+
+        self.reset_file()
 
-        #useful info
-        self.funcnames = [[]]
+        #the counts of all features, in the slots of featureSchema, and the
+        #occurrences found at the current node while the tree is walked with
+        #walk()
+        self.counts = featureSchema.new_counts()
+        self.occurrences = None
+
+        #read standard libs
+        if stdlib == None and self.lib != None and needs_stdlib(self.features):
+            stdlib = load_standard_libs(self.lib)
+        self.stdlib = stdlib
+
+        #node type -> handler, every visit_<Node> method handles that node type
+        self.handlers = {}
+        for name in dir(self):
+            if name.startswith("visit_") and hasattr(ast, name[6:]):
+                if self.features != None and name in HANDLER_FEATURES and self.features.isdisjoint(HANDLER_FEATURES[name]):
+                    continue
+                self.handlers[getattr(ast, name[6:])] = getattr(self, name)
+
+
+    def reset_file(self):
+        #useful info, funcsum maps each function and method to the set of its
+        #callees, (name,) for functions and (class, name) for methods
+        self.scopes = [scope(None)]
         self.classchildren = {}
         self.classparent = {}
         self.classes = []
-        self.classattrs = []
-        self.classnames = []
         self.funcsum = {}
         self.funcsum["funcs"] = {}
         self.funcsum["classes"] = {}
@@ -63,84 +158,74 @@ class analyzer(ast.NodeVisitor):
         self.isleftvalue = False
         self.modules = []
         self.modulealias = {}
-
-
-        #Function Call and Argument Passing 
-        self.featuremap["FCAP"] = {}
-        self.featuremap["FCAP"]["kwonlyargs"] = 0
-        self.featuremap["FCAP"]["kwarg"] = 0
-        self.featuremap["FCAP"]["posonlyargs"] = 0
-        self.featuremap["FCAP"]["multiple_return"] = 0
-        self.featuremap["FCAP"]["loop"] = {}
-        self.featuremap["FCAP"]["loop"]["while"] = 0
-        self.featuremap["FCAP"]["loop"]["for"] = 0
-        self.featuremap["FCAP"]["loop"]["continue"] = 0
-        self.featuremap["FCAP"]["loop"]["break"] = 0
-        self.featuremap["FCAP"]["recursion"] = 0
-        self.featuremap["FCAP"]["nested_function"] = 0
-        self.featuremap["FCAP"]["exception"] = {}
-        self.featuremap["FCAP"]["exception"]["try"] = 0
-        self.featuremap["FCAP"]["exception"]["raise"] = 0
-        self.featuremap["FCAP"]["exception"]["with_args"] = 0
-        self.featuremap["FCAP"]["packing_and_unpacking"] = {}
-        self.featuremap["FCAP"]["packing_and_unpacking"]["packing"] = 0
-        self.featuremap["FCAP"]["packing_and_unpacking"]["unpacking"] = 0
-        self.featuremap["FCAP"]["decorator"] = 0
-
-        #Type System
-        self.featuremap["TS"] = {}
-        self.featuremap["TS"]["first_class_function"] = {}
-        self.featuremap["TS"]["first_class_function"]["function_as_parameter"] = 0
-        self.featuremap["TS"]["first_class_function"]["function_as_returnvalue"] = 0
-        self.featuremap["TS"]["first_class_function"]["function_assignedto_var"] = 0
-        self.featuremap["TS"]["gradual_typing"] = 0
-
-        #Evaluation Strategy
-        self.featuremap["ES"] = {}
-        self.featuremap["ES"]["generator"] = 0
-
-        #Object Oriented Programming
-        self.featuremap["OOP"] = {}
-        self.featuremap["OOP"]["nested_class"] = 0
-        self.featuremap["OOP"]["inheritance"] = {}
-        self.featuremap["OOP"]["inheritance"]["single"] = 0
-        self.featuremap["OOP"]["inheritance"]["multiple"] = 0
-        self.featuremap["OOP"]["inheritance"]["hierarchical"] = 0
-        self.featuremap["OOP"]["inheritance"]["multilevel"] = 0
-        self.featuremap["OOP"]["inheritance"]["diamond"] = 0
-        self.featuremap["OOP"]["polymorphism"] = {}
-        self.featuremap["OOP"]["polymorphism"]["parametic"] = 0
-        self.featuremap["OOP"]["encapsulation"] = {}
-        self.featuremap["OOP"]["encapsulation"]["protected"] = {}
-        self.featuremap["OOP"]["encapsulation"]["protected"]["var"] = 0
-        self.featuremap["OOP"]["encapsulation"]["protected"]["method"] = 0
-        self.featuremap["OOP"]["encapsulation"]["private"] = {}
-        self.featuremap["OOP"]["encapsulation"]["private"]["var"] = 0
-        self.featuremap["OOP"]["encapsulation"]["private"]["method"] = 0
-
-        #Data Structure
-        self.featuremap["DS"] = {}
-        self.featuremap["DS"]["list_comprehension"] = 0
-        self.featuremap["DS"]["heterogeneous_list"] = {}
-        self.featuremap["DS"]["heterogeneous_list"]["constant_index"] = 0
-        self.featuremap["DS"]["heterogeneous_list"]["variable_index"] = 0
-        self.featuremap["DS"]["heterogeneous_tuple"] = {}
-        self.featuremap["DS"]["heterogeneous_tuple"]["constant_index"] = 0
-        self.featuremap["DS"]["heterogeneous_tuple"]["variable_index"] = 0
-
-        #MetaProgramming
-        self.featuremap["MP"] = {}
-        self.featuremap["MP"]["introspection"] = 0
-        self.featuremap["MP"]["reflection"] = 0
-        self.featuremap["MP"]["metaclass"] = 0
-
-        #read standard libs
-        polymorphsim_file = self.lib +"/standard_polymorphism.csv"
-        func_file = self.lib + "/standard_funcs.csv"
-        self.polys = pd.read_csv(polymorphsim_file, header = None, names = ["filepath", "class", "func"], sep = ",")
-        self.funcs = pd.read_csv(func_file, header = None, names = ["filepath", "class", "func"], sep = ",")
-
-
+        #names imported from modules, and the dotted bases of every class,
+        #for the project graph
+        self.fromimports = {}
+        self.classbases = []
+        self.typeindex = {}
+
+    def reset(self):
+        #ready to scan another file, keeping the handlers and the standard libs
+        self.counts = featureSchema.new_counts()
+        self.reset_file()
+
+    @property
+    def featuremap(self):
+        #the counts as nested dicts, like featuremap["FCAP"]["loop"]["while"]
+        return featureSchema.to_featuremap(self.counts)
+
+    def visit(self, root):
+        for occurrence in self.walk(root, False):
+            pass
+
+    #Walks the tree iteratively in the same order as ast.NodeVisitor. A handler
+    #returns the items to visit next, or None to visit all children of the
+    #node. Items are nodes or (function, argument) actions run when reached.
+    #With record, yields (feature, lineno, col, function, class) for every
+    #occurrence right after the node it was found at.
+    def walk(self, root, record = True):
+        occurrences = None
+        if record:
+            occurrences = self.occurrences = []
+        handlers = self.handlers
+        stack = [root]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            node = pop()
+            cls = type(node)
+            if cls is tuple:
+                node[0](node[1])
+                continue
+            handler = handlers.get(cls)
+            children = None
+            if handler != None:
+                children = handler(node)
+            if children == None:
+                children = child_nodes(node)
+            if children:
+                extend(reversed(children))
+            if occurrences:
+                yield from occurrences
+                occurrences.clear()
+        self.occurrences = None
+
+    def selected(self, feature):
+        return self.features == None or feature in self.features
+
+    def count(self, node, feature):
+        if self.features != None and feature not in self.features:
+            return
+        self.counts[featureSchema.SLOTS[feature]] += 1
+        if self.occurrences != None:
+            current = self.scopes[len(self.scopes) - 1]
+            function = None
+            if len(current.funcs) > 0:
+                function = current.funcs[len(current.funcs) - 1]
+            if not hasattr(node, "lineno"):
+                #keywords have no location before Python 3.9, their values do
+                node = node.value
+            self.occurrences.append((feature, node.lineno, node.col_offset, function, current.name))
 
     def visit_Import(self, node):
         if len(node.names) > 0:
@@ -149,44 +234,53 @@ class analyzer(ast.NodeVisitor):
                     self.modules.append(n.name)
                 if hasattr(n, "name") and hasattr(n, "asname") and n.asname != None:
                     self.modulealias[n.asname] = n.name
+        return []
+
+    def visit_ImportFrom(self, node):
+        for n in node.names:
+            if n.name != "*":
+                name = n.asname if n.asname != None else n.name
+                self.fromimports[name] = [node.level, node.module if node.module != None else "", n.name]
+        return []
 
-        
-    
     def visit_FunctionDef(self, node):
-        if len(self.funcnames[len(self.funcnames) - 1]) > 0:
-            self.featuremap["FCAP"]["nested_function"] += 1
-        self.funcnames[len(self.funcnames) - 1].append(node.name)
-        
+        current = self.scopes[len(self.scopes) - 1]
+        inclass = len(self.scopes) > 1
+        if len(current.funcs) > 0:
+            self.count(node, "FCAP.nested_function")
+        current.funcs.append(node.name)
+
         #add call info
-        if len(self.classnames) == 0 and node.name not in self.funcsum["funcs"]:
-            self.funcsum["funcs"][node.name] = []
-        elif len(self.classnames) > 0 and self.classnames[len(self.classnames) - 1] != None and node.name not in self.funcsum["classes"][self.classnames[len(self.classnames) - 1]]:
-            self.funcsum["classes"][self.classnames[len(self.classnames) - 1]][node.name] = []
+        if not inclass and node.name not in self.funcsum["funcs"]:
+            self.funcsum["funcs"][node.name] = set()
+        elif inclass and node.name not in self.funcsum["classes"][current.name]:
+            self.funcsum["classes"][current.name][node.name] = set()
 
-        
         #check return value annotations
         if node.returns != None:
-            self.featuremap["TS"]["gradual_typing"] += 1
-        
+            self.count(node, "TS.gradual_typing")
+
         #check protected and private methods
-        if node.name.startswith("__") and len(self.classnames) > 0 and node.name != "__init__":
-            self.featuremap["OOP"]["encapsulation"]["private"]["method"] += 1
-        elif node.name.startswith("_") and len(self.classnames) > 0 and node.name != "__init__":
-            self.featuremap["OOP"]["encapsulation"]["protected"]["method"] += 1
+        if node.name.startswith("__") and inclass and node.name != "__init__":
+            self.count(node, "OOP.encapsulation.private.method")
+        elif node.name.startswith("_") and inclass and node.name != "__init__":
+            self.count(node, "OOP.encapsulation.protected.method")
 
         #check decorators
-        if len(node.decorator_list) > 0:
-            self.featuremap["FCAP"]["decorator"] += len(node.decorator_list)
+        for i in node.decorator_list:
+            self.count(i, "FCAP.decorator")
+
+        children = child_nodes(node)
+        children.append((self.leave_function, current))
+        return children
 
-        self.generic_visit(node)
-        self.funcnames[len(self.funcnames) - 1].pop(len(self.funcnames[len(self.funcnames) - 1]) - 1)
+    def leave_function(self, current):
+        current.funcs.pop()
 
     def visit_ClassDef(self, node):
-        if len(self.classnames) > 0:
-            self.featuremap["OOP"]["nested_class"] += 1
-        self.classnames.append(node.name)
-        self.classattrs.append([])
-        self.funcnames.append([])
+        if len(self.scopes) > 1:
+            self.count(node, "OOP.nested_class")
+        self.scopes.append(scope(node.name))
 
         #add call info
         if node.name not in self.funcsum["classes"]:
@@ -194,404 +288,353 @@ class analyzer(ast.NodeVisitor):
 
         #check single and multiple inheritance
         if len(node.bases) == 1 and hasattr(node.bases[0], "id") and node.bases[0].id != "object":
-            self.featuremap["OOP"]["inheritance"]["single"] += 1
+            self.count(node, "OOP.inheritance.single")
         elif len(node.bases) > 1:
-            self.featuremap["OOP"]["inheritance"]["multiple"] += 1
+            self.count(node, "OOP.inheritance.multiple")
 
         #build inheritance graph
-        if len(node.bases) > 0 and hasattr(node, "name"):
-            for i in node.bases:
-                if hasattr(i, "id") and i.id != "object":
-                    if i.id not in self.classchildren:
-                        self.classchildren[i.id] = []
-                    self.classchildren[i.id].append(node.name)
-                    if node.name not in self.classparent and node.name != "object":
-                        self.classparent[node.name] = []
-                    self.classparent[node.name].append(i.id)
-        if hasattr(node, "name"):
-            self.classes.append(node.name)
+        for i in node.bases:
+            if hasattr(i, "id") and i.id != "object":
+                if i.id not in self.classchildren:
+                    self.classchildren[i.id] = []
+                self.classchildren[i.id].append(node.name)
+                if node.name not in self.classparent and node.name != "object":
+                    self.classparent[node.name] = []
+                self.classparent[node.name].append(i.id)
+        self.classes.append(node.name)
+        bases = []
+        for i in node.bases:
+            attrs = self.resolve_attribute(i) if type(i) == ast.Attribute else [getattr(i, "id", None)]
+            if attrs != None and None not in attrs:
+                bases.append(".".join(attrs))
+        self.classbases.append([node.name, bases])
 
         #check metaclass
         for i in node.keywords:
-            if hasattr(i, "arg") and i.arg == "metaclass":
-                self.featuremap["MP"]["metaclass"] += 1
+            if i.arg == "metaclass":
+                self.count(i, "MP.metaclass")
 
-        self.generic_visit(node)
-
-        self.classattrs.pop(len(self.classattrs) - 1)
-        self.classnames.pop(len(self.classnames) - 1)
-        self.funcnames.pop(len(self.funcnames) - 1)
+        children = child_nodes(node)
+        children.append((self.leave_class, None))
+        return children
 
+    def leave_class(self, unused):
+        self.scopes.pop()
 
     def visit_Return(self, node):
-        multiple = False
         #check multiple return
         if hasattr(node.value, "elts") and len(node.value.elts) > 1:
-            multiple = True
-            self.featuremap["FCAP"]["multiple_return"] += 1
-
-        #check if return value is a function
-        if multiple:
+            self.count(node, "FCAP.multiple_return")
+            #check if return values are functions
             for i in node.value.elts:
-                if hasattr(i, "id") and self.check_func(i.id, node.lineno):
-                    self.featuremap["TS"]["first_class_function"]["function_as_returnvalue"] += 1
-        else:
-            if hasattr(node.value, "id") and self.check_func(node.value.id, node.lineno):
-                self.featuremap["TS"]["first_class_function"]["function_as_returnvalue"] += 1
-
-        self.generic_visit(node)
+                if type(i) == ast.Name and self.check_func(i.id, node.lineno):
+                    self.count(i, "TS.first_class_function.function_as_returnvalue")
+        elif type(node.value) == ast.Name and self.check_func(node.value.id, node.lineno):
+            self.count(node, "TS.first_class_function.function_as_returnvalue")
+        return None
 
     def visit_arguments(self, node):
-        if len(node.kwonlyargs) > 0:
-            self.featuremap["FCAP"]["kwonlyargs"] += len(node.kwonlyargs)
-        if len(node.posonlyargs) > 0:
-            self.featuremap["FCAP"]["posonlyargs"] += len(node.posonlyargs)
+        #arguments have no location, their parts are counted instead
+        for i in node.kwonlyargs:
+            self.count(i, "FCAP.kwonlyargs")
+        for i in node.posonlyargs:
+            self.count(i, "FCAP.posonlyargs")
         if node.kwarg != None:
-            self.featuremap["FCAP"]["kwarg"] += 1
-        if len(node.defaults) > 0:
-            self.featuremap["FCAP"]["kwarg"] += len(node.defaults)
+            self.count(node.kwarg, "FCAP.kwarg")
+        for i in node.defaults:
+            self.count(i, "FCAP.kwarg")
         if node.vararg != None:
-            self.featuremap["FCAP"]["packing_and_unpacking"]["packing"] += 1
+            self.count(node.vararg, "FCAP.packing_and_unpacking.packing")
 
         for i in node.args:
             if i.annotation != None:
-                self.featuremap["TS"]["gradual_typing"] += 1
-
-        self.generic_visit(node)
+                self.count(i, "TS.gradual_typing")
+        return None
 
     def visit_While(self, node):
-        self.featuremap["FCAP"]["loop"]["while"] += 1
-        self.generic_visit(node)
-    
+        self.count(node, "FCAP.loop.while")
+        return None
+
     def visit_For(self, node):
-        self.featuremap["FCAP"]["loop"]["for"] += 1
-        self.generic_visit(node)
+        self.count(node, "FCAP.loop.for")
+        return None
 
     def visit_Continue(self, node):
-        self.featuremap["FCAP"]["loop"]["continue"] += 1
+        self.count(node, "FCAP.loop.continue")
+        return []
 
     def visit_Break(self, node):
-        self.featuremap["FCAP"]["loop"]["break"] += 1
-    
+        self.count(node, "FCAP.loop.break")
+        return []
+
+    def current_callees(self):
+        #calls are recorded for the innermost open function of the current
+        #class, or of the module outside classes
+        current = self.scopes[len(self.scopes) - 1]
+        if len(current.funcs) == 0:
+            return None
+        if len(self.scopes) == 1:
+            return self.funcsum["funcs"][current.funcs[len(current.funcs) - 1]]
+        return self.funcsum["classes"][current.name][current.funcs[len(current.funcs) - 1]]
+
     def visit_Call(self, node):
+        func = node.func
+        funcname = None
+        if type(func) == ast.Name:
+            funcname = func.id
 
         #add call info
-        if (len(self.funcnames[0]) != 0 and hasattr(node.func, "id") and 
-            len(self.classnames) == 0 and [node.func.id] not in self.funcsum["funcs"][self.funcnames[0][len(self.funcnames[0]) - 1]]):
-            self.funcsum["funcs"][self.funcnames[0][len(self.funcnames[0]) - 1]].append([node.func.id])
-        elif (len(self.funcnames[len(self.funcnames) - 1]) != 0 and hasattr(node.func, "id") and 
-            len(self.classnames) > 0 and [node.func.id] not in self.funcsum["classes"][self.classnames[len(self.classnames) - 1]][self.funcnames[len(self.funcnames) - 1][len(self.funcnames[len(self.funcnames) - 1]) - 1]]):
-            self.funcsum["classes"][self.classnames[len(self.classnames) - 1]][self.funcnames[len(self.funcnames) - 1][len(self.funcnames[len(self.funcnames) - 1]) - 1]].append([node.func.id])
-        else:
-            if (len(self.funcnames[0]) != 0 and hasattr(node.func, "attr") and hasattr(node.func, "value") and hasattr(node.func.value, "id") and 
-                len(self.classnames) == 0 and [self.check_type(node.func.value.id, node.func.value.lineno), node.func.attr] not in self.funcsum["funcs"][self.funcnames[0][len(self.funcnames[0]) - 1]]):
-                self.funcsum["funcs"][self.funcnames[0][len(self.funcnames[0]) - 1]].append([self.check_type(node.func.value.id, node.func.value.lineno), node.func.attr])
-            elif (len(self.funcnames[len(self.funcnames) - 1]) != 0 and hasattr(node.func, "attr") and hasattr(node.func, "value") and hasattr(node.func.value, "id") and 
-                len(self.classnames) > 0 and [self.check_type(node.func.value.id, node.func.value.lineno), node.func.attr] not in self.funcsum["classes"][self.classnames[len(self.classnames) - 1]][self.funcnames[len(self.funcnames) - 1][len(self.funcnames[len(self.funcnames) - 1]) - 1]]):
-                self.funcsum["classes"][self.classnames[len(self.classnames) - 1]][self.funcnames[len(self.funcnames) - 1][len(self.funcnames[len(self.funcnames) - 1]) - 1]].append([self.check_type(node.func.value.id, node.func.value.lineno), node.func.attr])
-
+        callees = self.current_callees()
+        if callees != None:
+            if funcname != None:
+                callees.add((funcname,))
+            elif type(func) == ast.Attribute and type(func.value) == ast.Name and func.value.id in self.modulealias:
+                callees.add((self.modulealias[func.value.id] + "." + func.attr,))
+            elif type(func) == ast.Attribute and type(func.value) == ast.Name and func.value.id not in self.modules:
+                callees.add((self.check_type(func.value.id, func.value.lineno), func.attr))
+            elif type(func) == ast.Attribute:
+                #calls through imported modules keep their dotted name
+                attrs = self.resolve_attribute(func)
+                if attrs[0] != None and None not in attrs and ".".join(attrs[:len(attrs) - 1]) in self.modules:
+                    callees.add((".".join(attrs),))
 
         #check unpacking arguments
         for i in node.args:
             if type(i) == ast.Starred:
-                self.featuremap["FCAP"]["packing_and_unpacking"]["unpacking"] += 1
+                self.count(i, "FCAP.packing_and_unpacking.unpacking")
 
         for i in node.keywords:
-            if type(i) == ast.keyword and i.arg == None:
-                self.featuremap["FCAP"]["packing_and_unpacking"]["unpacking"] += 1
-            elif type(i) == ast.keyword:
-                self.featuremap["FCAP"]["kwarg"] += 1
+            if i.arg == None:
+                self.count(i, "FCAP.packing_and_unpacking.unpacking")
+            else:
+                self.count(i, "FCAP.kwarg")
 
         #check if parameter is a function
         for i in node.args:
-            if hasattr(i, "id") and self.check_func(i.id, i.lineno):
-                print(i.lineno)
-                self.featuremap["TS"]["first_class_function"]["function_as_parameter"] += 1
+            if type(i) == ast.Name and self.check_func(i.id, i.lineno):
+                self.count(i, "TS.first_class_function.function_as_parameter")
             elif self.check_outside_func(i):
-                print(i.lineno)            
-                self.featuremap["TS"]["first_class_function"]["function_as_parameter"] += 1
-
-        #check introspection
-        if hasattr(node.func, "id") and node.func.id in self.setup["introspection_funcs"]:
-            self.featuremap["MP"]["introspection"] += 1
-        
-        #check reflection
-        if hasattr(node.func, "id") and node.func.id in self.setup["reflection_funcs"]:
-            self.featuremap["MP"]["reflection"] += 1
-
-        #type which can be either introspection or reflection
-        if hasattr(node.func, "id") and node.func.id == "type" and len(node.args) == 1:
-            self.featuremap["MP"]["introspection"] += 1
-        elif hasattr(node.func, "id") and node.func.id == "type" and len(node.args) == 3:
-            self.featuremap["MP"]["reflection"] += 1
-        
+                self.count(i, "TS.first_class_function.function_as_parameter")
 
-        #check parametic polymorphism
-        if hasattr(node.func, "id") and self.check_polymorphism(node.func.id, node.func.lineno):
-            self.featuremap["OOP"]["polymorphism"]["parametic"] += 1
-        elif type(node.func) == ast.Attribute and self.check_outside_polymorphism(node.func):
-            self.featuremap["OOP"]["polymorphism"]["parametic"] += 1
-        
+        if funcname != None:
+            #check introspection
+            if funcname in self.setup["introspection_funcs"]:
+                self.count(node, "MP.introspection")
+
+            #check reflection
+            if funcname in self.setup["reflection_funcs"]:
+                self.count(node, "MP.reflection")
 
-        self.generic_visit(node)    
+            #type which can be either introspection or reflection
+            if funcname == "type" and len(node.args) == 1:
+                self.count(node, "MP.introspection")
+            elif funcname == "type" and len(node.args) == 3:
+                self.count(node, "MP.reflection")
+
+        #check parametic polymorphism
+        if funcname != None and self.check_polymorphism(funcname, func.lineno):
+            self.count(node, "OOP.polymorphism.parametic")
+        elif type(func) == ast.Attribute and self.check_outside_polymorphism(func):
+            self.count(node, "OOP.polymorphism.parametic")
+        return None
 
     def visit_Try(self, node):
-        self.featuremap["FCAP"]["exception"]["try"] += 1
-        self.generic_visit(node)
+        self.count(node, "FCAP.exception.try")
+        return None
 
     def visit_Raise(self, node):
-        self.featuremap["FCAP"]["exception"]["raise"] += 1
+        self.count(node, "FCAP.exception.raise")
+        #only the insides of the exception arguments are visited, the first
+        #name found in each of them makes an exception with variable arguments
+        children = []
         if hasattr(node.exc, "args"):
             for i in node.exc.args:
-                self.check_args = True
-                self.generic_visit(i)
-                self.check_args = False
+                children.append((self.set_check_args, True))
+                children += child_nodes(i)
+                children.append((self.set_check_args, False))
+        return children
+
+    def set_check_args(self, value):
+        self.check_args = value
 
     def visit_Name(self, node):
-        if hasattr(node, "id") and self.check_args == True:
+        if self.check_args == True:
             self.check_args = False
-            self.featuremap["FCAP"]["exception"]["with_args"] += 1
+            self.count(node, "FCAP.exception.with_args")
+        return []
 
     def visit_Yield(self, node):
-        self.featuremap["ES"]["generator"] += 1
-        self.generic_visit(node)
+        self.count(node, "ES.generator")
+        return None
 
     def visit_ListComp(self, node):
-        self.featuremap["DS"]["list_comprehension"] += 1
-        self.generic_visit(node)
+        self.count(node, "DS.list_comprehension")
+        return None
 
     def visit_Assign(self, node):
         #check if a function var assigned to another var
-        if hasattr(node.value, "id") and self.check_func(node.value.id, node.value.lineno):
-            self.featuremap["TS"]["first_class_function"]["function_assignedto_var"] += 1
+        if type(node.value) == ast.Name and self.check_func(node.value.id, node.value.lineno):
+            self.count(node, "TS.first_class_function.function_assignedto_var")
         elif type(node.value) == ast.Attribute and self.check_func(node.value.attr, node.value.lineno):
-            self.featuremap["TS"]["first_class_function"]["function_assignedto_var"] += 1
-        elif self.check_outside_func(node.value):          
-            self.featuremap["TS"]["first_class_function"]["function_assignedto_var"] += 1
-        
-        #check left value
-        for i in node.targets:
-            if type(i) == ast.Attribute and hasattr(i.value, "id") and i.value.id == "self" and i.attr.startswith("__") and len(self.classnames) > 0 and i.attr not in self.classattrs[len(self.classattrs) - 1]:
-                self.featuremap["OOP"]["encapsulation"]["private"]["var"] += 1
-            elif type(i) == ast.Attribute and hasattr(i.value, "id") and i.value.id == "self" and i.attr.startswith("_") and len(self.classnames) > 0 and i.attr not in self.classattrs[len(self.classattrs) - 1]:
-                self.featuremap["OOP"]["encapsulation"]["protected"]["var"] += 1
-
-        self.generic_visit(node)
+            self.count(node, "TS.first_class_function.function_assignedto_var")
+        elif self.check_outside_func(node.value):
+            self.count(node, "TS.first_class_function.function_assignedto_var")
 
+        #check left value
+        if len(self.scopes) > 1:
+            attrs = self.scopes[len(self.scopes) - 1].attrs
+            for i in node.targets:
+                if type(i) == ast.Attribute and type(i.value) == ast.Name and i.value.id == "self" and i.attr not in attrs:
+                    if i.attr.startswith("__"):
+                        self.count(i, "OOP.encapsulation.private.var")
+                    elif i.attr.startswith("_"):
+                        self.count(i, "OOP.encapsulation.protected.var")
+        return None
 
     def visit_Subscript(self, node):
         #check heterogeneous list and tuple
-        if (hasattr(node.value, "id") and self.check_heterogeneous(node.value.id, node.value.lineno) == "list" 
-            and hasattr(node.slice, "value") and hasattr(node.slice.value, "id")):
-            self.featuremap["DS"]["heterogeneous_list"]["variable_index"] += 1
-        if (hasattr(node.value, "id") and self.check_heterogeneous(node.value.id, node.value.lineno) == "list" 
-            and hasattr(node.slice, "value") and hasattr(node.slice.value, "n")):
-            self.featuremap["DS"]["heterogeneous_list"]["constant_index"] += 1
-        if (hasattr(node.value, "id") and self.check_heterogeneous(node.value.id, node.value.lineno) == "tuple" 
-            and hasattr(node.slice, "value") and hasattr(node.slice.value, "id")):
-            self.featuremap["DS"]["heterogeneous_tuple"]["variable_index"] += 1
-        if (hasattr(node.value, "id") and self.check_heterogeneous(node.value.id, node.value.lineno) == "tuple" 
-            and hasattr(node.slice, "value") and hasattr(node.slice.value, "n")):
-            self.featuremap["DS"]["heterogeneous_tuple"]["constant_index"] += 1
-
-        self.generic_visit(node)
+        if type(node.value) == ast.Name and hasattr(node.slice, "value"):
+            kind = self.check_heterogeneous(node.value.id, node.value.lineno)
+            if kind == "list" and hasattr(node.slice.value, "id"):
+                self.count(node, "DS.heterogeneous_list.variable_index")
+            if kind == "list" and hasattr(node.slice.value, "n"):
+                self.count(node, "DS.heterogeneous_list.constant_index")
+            if kind == "tuple" and hasattr(node.slice.value, "id"):
+                self.count(node, "DS.heterogeneous_tuple.variable_index")
+            if kind == "tuple" and hasattr(node.slice.value, "n"):
+                self.count(node, "DS.heterogeneous_tuple.constant_index")
+        return None
 
     def visit_Delete(self, node):
         #delete statement has reflection features
-        self.featuremap["MP"]["reflection"] += 1
-        self.generic_visit(node)
+        self.count(node, "MP.reflection")
+        return None
 
     def visit_Attribute(self, node):
         #some attributes have reflection features
         if node.attr in self.setup["introspection_attrs"]:
-            self.featuremap["MP"]["introspection"] += 1
-        self.generic_visit(node)
+            self.count(node, "MP.introspection")
+        return None
 
 
     def check_inheritance(self):
         #check hierarchical inheritance
-        for key in self.classchildren:
-            if len(self.classchildren[key]) > 1:
-                self.featuremap["OOP"]["inheritance"]["hierarchical"] += 1
-
-        #check multilevel inheritance
-        classwithoutchildren = []
-        for i in self.classes:
-            if i not in self.classchildren:
-                classwithoutchildren.append(i)
-
-        for i in classwithoutchildren:
-            for p in self.classchildren:
-                if i in self.classchildren[p]:
-                    for q in self.classchildren:
-                        if p in self.classchildren[q]:
-                            self.featuremap["OOP"]["inheritance"]["multilevel"] += 1
-
-        #check diamond inheritance
-        for i in self.classparent:
-            if len(self.classparent[i]) > 1:
-                parents = {}
-                for p in self.classparent[i]:
-                    parents[p] = self.find_parent(p)
-                    parents[p].remove(p)
-                found = False
-                for p in parents:
-                    if found:
-                        break
-                    for i in parents[p]:
-                        if found:
+        if self.selected("OOP.inheritance.hierarchical"):
+            for key in self.classchildren:
+                if len(self.classchildren[key]) > 1:
+                    self.counts[featureSchema.SLOTS["OOP.inheritance.hierarchical"]] += 1
+
+        #check multilevel inheritance, every class without children counts
+        #once for each of its parents' parents
+        if self.selected("OOP.inheritance.multilevel"):
+            for i in self.classes:
+                if i not in self.classchildren and i in self.classparent:
+                    for p in set(self.classparent[i]):
+                        if p in self.classparent:
+                            self.counts[featureSchema.SLOTS["OOP.inheritance.multilevel"]] += len(set(self.classparent[p]))
+
+        #check diamond inheritance, the ancestors of each parent are compared
+        #with those of all parents, itself included, so a class with several
+        #parents counts once one of them has ancestors, and they are never
+        #listed, which also keeps inheritance cycles from looping
+        if self.selected("OOP.inheritance.diamond"):
+            for i in self.classparent:
+                if len(self.classparent[i]) > 1:
+                    for p in self.classparent[i]:
+                        if p in self.classparent:
+                            self.counts[featureSchema.SLOTS["OOP.inheritance.diamond"]] += 1
                             break
-                        for q in parents:
-                            if i in parents[q]:
-                                self.featuremap["OOP"]["inheritance"]["diamond"] += 1
-                                found = True
-                                break
-
 
-    def find_parent(self, name):
-        parents = [name]
-        if name in self.classparent:
-            for p in self.classparent[name]:
-                parents += self.find_parent(p)
-        if name == "object":
-            return []
-        return parents
+    def merge(self, counts):
+        featureSchema.add(self.counts, counts)
 
+    def summary(self):
+        #what the project graph needs from this file, as plain lists and dicts
+        funcs = {}
+        for f in self.funcsum["funcs"]:
+            funcs[f] = sorted(list(c) for c in self.funcsum["funcs"][f] if None not in c)
+        methods = {}
+        for c in self.funcsum["classes"]:
+            methods[c] = {}
+            for f in self.funcsum["classes"][c]:
+                methods[c][f] = sorted(list(i) for i in self.funcsum["classes"][c][f] if None not in i)
+        return {"imports": self.modulealias, "fromimports": self.fromimports, "classes": self.classbases, "funcs": funcs, "methods": methods}
 
     def finalize(self):
         self.check_inheritance()
-        self.check_recursion()
+        if self.selected("FCAP.recursion"):
+            self.check_recursion()
+
+    def load_types(self, node, html, backend = "stream"):
+        #HTML Result, or the local type inference without one, and no types
+        #when the selected features need none
+        if not needs_types(self.features):
+            self.typeindex = {}
+        elif html == None:
+            import localTypes
+            self.typeindex = localTypes.infer(node)
+        else:
+            self.typeindex = typeIndex.load(html, backend)
 
-    def run(self, node, html):
-        #HTML Result
-        self.soup = BeautifulSoup(html, features="html.parser")
+    def run(self, node, html, backend = "stream"):
+        self.load_types(node, html, backend)
         self.visit(node)
         self.finalize()
 
+    def stream(self, node, html, backend = "stream"):
+        #like run, yielding every feature occurrence as soon as it is found,
+        #the features counted at the end have no occurrences
+        self.load_types(node, html, backend)
+        yield from self.walk(node)
+        self.finalize()
+
     def check_func(self, name, lineno):
-        spans = self.soup.find_all(class_ ="lineno")
-        if len(spans) < lineno:
-            return False
-        else:
-            p = spans[lineno - 1].next_sibling
-            while(p != None and p.name != "span"):
-                if hasattr(p, "xid") and hasattr(p, "title") and p.string == name and "->" in p["title"] and "(" in p["title"] and ")" in p["title"]:
-                    return True
-                p = p.next_sibling
+        for t in typeIndex.lookup(self.typeindex, name, lineno):
+            if pysonarTypes.parse(t).function:
+                return True
         return False
 
     def check_heterogeneous(self, name, lineno):
-        spans = self.soup.find_all(class_ ="lineno")
-        if len(spans) < lineno:
-            return False
-        else:
-            p = spans[lineno - 1].next_sibling
-            while(p != None and p.name != "span"):
-                if hasattr(p, "xid") and hasattr(p, "title") and p.string == name and p["title"].startswith("[") and p["title"].endswith("]") and "|" in p["title"]:
-                    types = p["title"][2:len(p["title"]) - 3].split(" | ")
-                    count = 0
-                    for t in types:
-                        if "#" not in t and "?" not in t:
-                            count += 1
-                    if count > 1:
-                        return "list"
-                    else:
-                        return False
-                if hasattr(p, "xid") and hasattr(p, "title") and p.string == name and p["title"].startswith("(") and p["title"].endswith(")"):
-                    res = p["title"][1: len(p["title"]) - 1]
-                    types = res.split(", ")
-                    for i in types:
-                        for j in types:
-                            if i != j and "?" not in i and "?" not in j and "#" not in i and "#" not in j:
-                                return "tuple"
-                p = p.next_sibling
+        for t in typeIndex.lookup(self.typeindex, name, lineno):
+            res = pysonarTypes.heterogeneous(pysonarTypes.parse(t))
+            if res != None:
+                return res
         return False
 
     def check_polymorphism(self, name, lineno):
-        spans = self.soup.find_all(class_ ="lineno")
-        if len(spans) < lineno:
+        titles = typeIndex.lookup(self.typeindex, name, lineno)
+        if len(titles) == 0:
             return False
-        else:
-            p = spans[lineno - 1].next_sibling
-            while(p != None and p.name != "span"):
-                if hasattr(p, "xid") and hasattr(p, "title") and p.string == name:
-                    types = p["title"].split(" / ")
-                    count = 0
-                    returnvalues = {}
-                    for t in types:
-                        if "?" not in t and " -> " in t:
-                            sig = t.split(" -> ")
-                            if "|" in sig[0] and "{" in sig[0] and "}" in sig[0] and "None" not in sig[0]:
-                                return True
-                            if sig[1] not in returnvalues and "None" not in sig[0]:
-                                returnvalues[sig[1]] = sig[0]
-                            elif sig[1] in returnvalues and returnvalues[sig[1]] != sig[0] and "None" not in sig[0]:
-                                count += 1
-                    if count > 0:
-                        return True
-                    else:
-                        return False
-                p = p.next_sibling
-        return False
+        return pysonarTypes.polymorphic(pysonarTypes.parse(titles[0]), True)
 
     def check_outside_polymorphism(self, node):
-        if type(node) == ast.Name or self.lib == None:
+        attrs = self.resolve_stdlib(node)
+        if attrs == None:
             return False
-        elif type(node) == ast.Attribute and self.lib != None:
-            attrs = self.resolve_attribute(node)
-            if attrs == None or (attrs[0] not in self.modules and attrs[0] not in self.modulealias.keys()):
-                return False
-            direct_path = "standard_libs/polymorphism_files"
-            indirect_path = "standard_libs/polymorphism_files"
-            for i in range(0, len(attrs) - 2):
-                direct_path += "/"
-                indirect_path += "/"
-                direct_path += attrs[i]
-                indirect_path += attrs[i]
-            direct_path += "/"
-            direct_path += attrs[len(attrs) - 2]
-            direct_path += ".csv"
-            indirect_path += ".csv"
-            if  self.polys.loc[(self.polys["filepath"] == direct_path) & (self.polys["class"] == "None") & (self.polys["func"] == attrs[len(attrs) - 1])].empty == False:
-                return True
-            elif self.polys.loc[(self.polys["filepath"] == indirect_path) & (self.polys["class"] == attrs[len(attrs) - 2]) & (self.polys["func"] == attrs[len(attrs) - 1])].empty == False:
-                return True
-            else:
-                return False
-        return False
+        return self.stdlib.contains("polys", attrs)
 
     def check_type(self, name, lineno):
-        spans = self.soup.find_all(class_ ="lineno")
-        if len(spans) < lineno:
+        titles = typeIndex.lookup(self.typeindex, name, lineno)
+        if len(titles) == 0:
             return None
-        else:
-            p = spans[lineno - 1].next_sibling
-            while(p != None and p.name != "span"):
-                if hasattr(p, "xid") and hasattr(p, "title") and p.string == name:
-                    return p["title"]
-                p = p.next_sibling
-        return None
+        return titles[0]
 
-    def check_recursion(self):
+    def call_graph(self):
+        graph = {}
         for func in self.funcsum["funcs"]:
-            if self.check_recursion_interal([func], self.funcsum["funcs"][func], self.setup["recursion_limit"]) == True:
-                self.featuremap["FCAP"]["recursion"] += 1
+            graph[(func,)] = self.funcsum["funcs"][func]
         for c in self.funcsum["classes"]:
             for func in self.funcsum["classes"][c]:
-                if self.check_recursion_interal([c, func], self.funcsum["classes"][c][func], self.setup["recursion_limit"]) == True:
-                    self.featuremap["FCAP"]["recursion"] += 1
-
+                graph[(c, func)] = self.funcsum["classes"][c][func]
+        return graph
 
-    def check_recursion_interal(self, caller, callees, limit):
-        if caller in callees:
-            return True
-        if limit < 0:
-            return False
-        for f in callees:
-            if len(f) == 1 and f[0] in self.funcsum["funcs"]:
-                return self.check_recursion_interal(caller, self.funcsum["funcs"][f[0]], limit - 1)
-            elif len(f) == 2 and f[0] in self.funcsum["classes"] and f[1] in self.funcsum["classes"][f[0]]:
-                return self.check_recursion_interal(caller, self.funcsum["classes"][f[0]][f[1]], limit - 1)
+    def check_recursion(self):
+        #every function on a call cycle is recursive, the recursion limit keeps
+        #its meaning of how many calls deep a cycle is followed from a function
+        limit = self.setup["recursion_limit"]
+        if limit != None:
+            limit += 2
+        self.counts[featureSchema.SLOTS["FCAP.recursion"]] += len(callGraph.recursive_nodes(self.call_graph(), limit))
 
     def resolve_attribute(self, node):
         if type(node) == ast.Attribute:
@@ -603,32 +646,22 @@ class analyzer(ast.NodeVisitor):
                 return [None, node.attr]
 
     def check_outside_func(self, node):
-        if type(node) == ast.Name or self.lib == None:
+        attrs = self.resolve_stdlib(node)
+        if attrs == None:
             return False
-        elif type(node) == ast.Attribute and self.lib != None:
-            attrs = self.resolve_attribute(node)
-            if attrs == None or (attrs[0] not in self.modules and attrs[0] not in self.modulealias.keys()):
-                return False
-            direct_path = "standard_libs/funcs"
-            indirect_path = "standard_libs/funcs"
-            for i in range(0, len(attrs) - 2):
-                direct_path += "/"
-                indirect_path += "/"
-                direct_path += attrs[i]
-                indirect_path += attrs[i]
-            direct_path += "/"
-            direct_path += attrs[len(attrs) - 2]
-            direct_path += ".csv"
-            indirect_path += ".csv"
-            if  self.polys.loc[(self.polys["filepath"] == direct_path) & (self.polys["class"] == "None") & (self.polys["func"] == attrs[len(attrs) - 1])].empty == False:
-                return True
-            elif self.polys.loc[(self.polys["filepath"] == indirect_path) & (self.polys["class"] == attrs[len(attrs) - 2]) & (self.polys["func"] == attrs[len(attrs) - 1])].empty == False:
-                return True
-            else:
-                return False
-        return False
+        return self.stdlib.contains("funcs", attrs)
+
+    def resolve_stdlib(self, node):
+        #attribute chains starting with an imported module may refer to standard libs
+        if type(node) != ast.Attribute or self.stdlib == None:
+            return None
+        attrs = self.resolve_attribute(node)
+        if attrs == None or (attrs[0] not in self.modules and attrs[0] not in self.modulealias.keys()):
+            return None
+        return attrs
 
     def standard_print(self, sort = False):
+        from prettytable import PrettyTable
         table = PrettyTable(["Category Number", "Language Feature", "Nums of Appearance"])
         table.align["Language Feature"] = 'l'
         table.sortby = "Category Number"
@@ -642,100 +675,409 @@ class analyzer(ast.NodeVisitor):
             table.add_row(["4", "Object-oriented Programming", "----------"])
             table.add_row(["5", "Data Structure", "----------"])
             table.add_row(["6", "MetaProgramming", "----------"])
-        table.add_row(["1.1", "Keyword-only Parameter", self.featuremap["FCAP"]["kwonlyargs"]])
-        table.add_row(["1.2", "Keyword Parameter", self.featuremap["FCAP"]["kwarg"]])
-        table.add_row(["1.3", "Position-only Parameter", self.featuremap["FCAP"]["posonlyargs"]])
-        table.add_row(["1.4", "Multiple Return", self.featuremap["FCAP"]["multiple_return"]])
+        featuremap = self.featuremap
+        table.add_row(["1.1", "Keyword-only Parameter", featuremap["FCAP"]["kwonlyargs"]])
+        table.add_row(["1.2", "Keyword Parameter", featuremap["FCAP"]["kwarg"]])
+        table.add_row(["1.3", "Position-only Parameter", featuremap["FCAP"]["posonlyargs"]])
+        table.add_row(["1.4", "Multiple Return", featuremap["FCAP"]["multiple_return"]])
         #table.add_row(["1.4", "Loop", ""])
-        table.add_row(["1.5.1", "Loop - While Statement", self.featuremap["FCAP"]["loop"]["while"]])
-        table.add_row(["1.5.2", "Loop - For Statement", self.featuremap["FCAP"]["loop"]["for"]])
-        table.add_row(["1.5.3", "Loop - Continue Statement", self.featuremap["FCAP"]["loop"]["continue"]])
-        table.add_row(["1.5.4", "Loop - Break Statement", self.featuremap["FCAP"]["loop"]["break"]])
-        table.add_row(["1.6", "Recursion", self.featuremap["FCAP"]["recursion"]])
-        table.add_row(["1.7", "Nested Function", self.featuremap["FCAP"]["nested_function"]])
+        table.add_row(["1.5.1", "Loop - While Statement", featuremap["FCAP"]["loop"]["while"]])
+        table.add_row(["1.5.2", "Loop - For Statement", featuremap["FCAP"]["loop"]["for"]])
+        table.add_row(["1.5.3", "Loop - Continue Statement", featuremap["FCAP"]["loop"]["continue"]])
+        table.add_row(["1.5.4", "Loop - Break Statement", featuremap["FCAP"]["loop"]["break"]])
+        table.add_row(["1.6", "Recursion", featuremap["FCAP"]["recursion"]])
+        table.add_row(["1.7", "Nested Function", featuremap["FCAP"]["nested_function"]])
         #table.add_row(["1.7", "Exception", ""])
-        table.add_row(["1.8.1", "Exception - Try Statement", self.featuremap["FCAP"]["exception"]["try"]])
-        table.add_row(["1.8.2", "Exception - Raise Statement", self.featuremap["FCAP"]["exception"]["raise"]])
-        table.add_row(["1.8.3", "Exception - Exceptions with Variable Arguments", self.featuremap["FCAP"]["exception"]["with_args"]])
+        table.add_row(["1.8.1", "Exception - Try Statement", featuremap["FCAP"]["exception"]["try"]])
+        table.add_row(["1.8.2", "Exception - Raise Statement", featuremap["FCAP"]["exception"]["raise"]])
+        table.add_row(["1.8.3", "Exception - Exceptions with Variable Arguments", featuremap["FCAP"]["exception"]["with_args"]])
         #table.add_row(["1.8", "Packing and Unpacking arguments", ""])
-        table.add_row(["1.9.1", "Packing Arguments", self.featuremap["FCAP"]["packing_and_unpacking"]["packing"]])
-        table.add_row(["1.9.2", "Unpacking Arguments", self.featuremap["FCAP"]["packing_and_unpacking"]["unpacking"]])
-        table.add_row(["1.10", "Decorator", self.featuremap["FCAP"]["decorator"]])
+        table.add_row(["1.9.1", "Packing Arguments", featuremap["FCAP"]["packing_and_unpacking"]["packing"]])
+        table.add_row(["1.9.2", "Unpacking Arguments", featuremap["FCAP"]["packing_and_unpacking"]["unpacking"]])
+        table.add_row(["1.10", "Decorator", featuremap["FCAP"]["decorator"]])
         #table.add_row(["2.1", "First Class Function", ""])
-        table.add_row(["2.1.1", "First Class Function - As Parameter", self.featuremap["TS"]["first_class_function"]["function_as_parameter"]])
-        table.add_row(["2.1.2", "First Class Function - As Return Value", self.featuremap["TS"]["first_class_function"]["function_as_returnvalue"]])
-        table.add_row(["2.1.3", "First Class Function - Assigned to Variables", self.featuremap["TS"]["first_class_function"]["function_assignedto_var"]])
-        table.add_row(["2.2", "Gradual Typing", self.featuremap["TS"]["gradual_typing"]])
-        table.add_row(["3.1", "Generator", self.featuremap["ES"]["generator"]])
-        table.add_row(["4.1.1", "Inheritance - Single Inheritance", self.featuremap["OOP"]["inheritance"]["single"]])
-        table.add_row(["4.1.2", "Inheritance - Multiple Inheritance", self.featuremap["OOP"]["inheritance"]["multiple"]])
-        table.add_row(["4.1.3", "Inheritance - Hierarchical Inheritance", self.featuremap["OOP"]["inheritance"]["hierarchical"]])
-        table.add_row(["4.1.4", "Inheritance - Multilevel Inheritance", self.featuremap["OOP"]["inheritance"]["multilevel"]])
-        table.add_row(["4.1.5", "Inheritance - Diamond Inheritance", self.featuremap["OOP"]["inheritance"]["diamond"]])
-        table.add_row(["4.2.1", "Encapsulation - Protected Methods", self.featuremap["OOP"]["encapsulation"]["protected"]["method"]])
-        table.add_row(["4.2.2", "Encapsulation - Protected Attributes", self.featuremap["OOP"]["encapsulation"]["protected"]["var"]])
-        table.add_row(["4.2.3", "Encapsulation - Private Methods", self.featuremap["OOP"]["encapsulation"]["private"]["method"]])
-        table.add_row(["4.2.4", "Encapsulation - Private Attributes", self.featuremap["OOP"]["encapsulation"]["private"]["var"]])
-        table.add_row(["4.3", "Nested Class", self.featuremap["OOP"]["nested_class"]])
-        table.add_row(["4.4", "Parametic Polymorphism", self.featuremap["OOP"]["polymorphism"]["parametic"]])
-        table.add_row(["5.1", "List Comprehension", self.featuremap["DS"]["list_comprehension"]])
-        table.add_row(["5.2.1", "Heterogeneous List - Constant Index", self.featuremap["DS"]["heterogeneous_list"]["constant_index"]])
-        table.add_row(["5.2.2", "Heterogeneous List - Variable Index", self.featuremap["DS"]["heterogeneous_list"]["variable_index"]])
-        table.add_row(["5.3.1", "Heterogeneous Tuple - Constant Index", self.featuremap["DS"]["heterogeneous_tuple"]["constant_index"]])
-        table.add_row(["5.3.2", "Heterogeneous Tuple - Variable Index", self.featuremap["DS"]["heterogeneous_tuple"]["variable_index"]])
-        table.add_row(["6.1", "Introspection", self.featuremap["MP"]["introspection"]])
-        table.add_row(["6.2", "Reflection", self.featuremap["MP"]["reflection"]])
-        table.add_row(["6.3", "Metaclass", self.featuremap["MP"]["metaclass"]])
+        table.add_row(["2.1.1", "First Class Function - As Parameter", featuremap["TS"]["first_class_function"]["function_as_parameter"]])
+        table.add_row(["2.1.2", "First Class Function - As Return Value", featuremap["TS"]["first_class_function"]["function_as_returnvalue"]])
+        table.add_row(["2.1.3", "First Class Function - Assigned to Variables", featuremap["TS"]["first_class_function"]["function_assignedto_var"]])
+        table.add_row(["2.2", "Gradual Typing", featuremap["TS"]["gradual_typing"]])
+        table.add_row(["3.1", "Generator", featuremap["ES"]["generator"]])
+        table.add_row(["4.1.1", "Inheritance - Single Inheritance", featuremap["OOP"]["inheritance"]["single"]])
+        table.add_row(["4.1.2", "Inheritance - Multiple Inheritance", featuremap["OOP"]["inheritance"]["multiple"]])
+        table.add_row(["4.1.3", "Inheritance - Hierarchical Inheritance", featuremap["OOP"]["inheritance"]["hierarchical"]])
+        table.add_row(["4.1.4", "Inheritance - Multilevel Inheritance", featuremap["OOP"]["inheritance"]["multilevel"]])
+        table.add_row(["4.1.5", "Inheritance - Diamond Inheritance", featuremap["OOP"]["inheritance"]["diamond"]])
+        table.add_row(["4.2.1", "Encapsulation - Protected Methods", featuremap["OOP"]["encapsulation"]["protected"]["method"]])
+        table.add_row(["4.2.2", "Encapsulation - Protected Attributes", featuremap["OOP"]["encapsulation"]["protected"]["var"]])
+        table.add_row(["4.2.3", "Encapsulation - Private Methods", featuremap["OOP"]["encapsulation"]["private"]["method"]])
+        table.add_row(["4.2.4", "Encapsulation - Private Attributes", featuremap["OOP"]["encapsulation"]["private"]["var"]])
+        table.add_row(["4.3", "Nested Class", featuremap["OOP"]["nested_class"]])
+        table.add_row(["4.4", "Parametic Polymorphism", featuremap["OOP"]["polymorphism"]["parametic"]])
+        table.add_row(["5.1", "List Comprehension", featuremap["DS"]["list_comprehension"]])
+        table.add_row(["5.2.1", "Heterogeneous List - Constant Index", featuremap["DS"]["heterogeneous_list"]["constant_index"]])
+        table.add_row(["5.2.2", "Heterogeneous List - Variable Index", featuremap["DS"]["heterogeneous_list"]["variable_index"]])
+        table.add_row(["5.3.1", "Heterogeneous Tuple - Constant Index", featuremap["DS"]["heterogeneous_tuple"]["constant_index"]])
+        table.add_row(["5.3.2", "Heterogeneous Tuple - Variable Index", featuremap["DS"]["heterogeneous_tuple"]["variable_index"]])
+        table.add_row(["6.1", "Introspection", featuremap["MP"]["introspection"]])
+        table.add_row(["6.2", "Reflection", featuremap["MP"]["reflection"]])
+        table.add_row(["6.3", "Metaclass", featuremap["MP"]["metaclass"]])
 
         print(table)
 
     def print_tocsv(self, csvfile, sourcefile):
-        keys = ["filepath"]
-        values = [sourcefile]
-        for cat in self.featuremap:
-            for f in self.featuremap[cat]:
-                if isinstance(self.featuremap[cat][f], dict):
-                    for i in self.featuremap[cat][f]:
-                        if isinstance(self.featuremap[cat][f][i], dict):
-                            for j in self.featuremap[cat][f][i]:
-                                keys.append(cat+f+i+j)
-                                values.append(self.featuremap[cat][f][i][j])
-                        else:
-                            keys.append(cat+f+i)
-                            values.append(self.featuremap[cat][f][i])
-                else:
-                    keys.append(cat+f)
-                    values.append(self.featuremap[cat][f])
-    
+        with resultSink.csv_sink(csvfile) as sink:
+            sink.write(sourcefile, self.counts)
+
+
+def load_standard_libs(lib):
+    return stdlibIndex.load(lib)
 
-        if os.path.exists(csvfile):
-            newdict = {}
-            for i in range(0, len(keys)):
-                newdict[keys[i]] = values[i]
-            df = pd.read_csv(csvfile, header=None, names = keys, sep = ",")
-            df = df.append(newdict, ignore_index = True)
-            df.to_csv(csvfile, index = False, header = False)
 
+def read_config(cfg_file):
+    setup = {}
+    config = configparser.ConfigParser()
+    config.read(cfg_file)
+    if "scanner_defaults" not in config.keys():
+        print("Error: Can not read config file!")
+        exit(-1)
+    for key in config["scanner_defaults"]:
+        setup[key] = config["scanner_defaults"][key]
+    return setup
+
+
+def find_sources(project):
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(project):
+        dirnames.sort()
+        for f in sorted(filenames):
+            if f.endswith(".py"):
+                sources.append(os.path.join(dirpath, f))
+    return sources
+
+
+#state of a project mode worker process, set once by init_worker
+worker = {}
+
+def init_worker(setup, lib, stdlib, backend, typeres, occurrences = False, profiling = False):
+    worker["setup"] = setup
+    worker["lib"] = lib
+    worker["stdlib"] = stdlib
+    worker["backend"] = backend
+    worker["typeres"] = typeres
+    worker["occurrences"] = occurrences
+    worker["profiling"] = profiling
+
+
+def scan_file(job):
+    #the source and type inference result come read ahead by the parent, or
+    #as None to be read here
+    sourcefile, htmlfile, source, html = job
+    if htmlfile == None and worker["typeres"] != None:
+        return sourcefile, None, "type inference result file missing"
+    prof = None
+    if worker["profiling"]:
+        import scanProfile
+        prof = scanProfile.profile()
+    start = time.perf_counter()
+    try:
+        if source == None:
+            source = read_file(sourcefile)
+        root = ast.parse(decode(source))
+        if prof != None:
+            prof.add("ast_parse", time.perf_counter() - start)
+        visitor = analyzer(worker["setup"], worker["lib"], worker["stdlib"])
+        if prof != None:
+            prof.instrument(visitor)
+        if htmlfile != None:
+            if html == None:
+                html = read_file(htmlfile)
+            html = decode(html)
+        #the occurrences of one file go back to the parent together
+        found = None
+        if worker["occurrences"]:
+            found = list(visitor.stream(root, html, worker["backend"]))
         else:
-            newdict = {}
-            for i in range(0, len(keys)):
-                newdict[keys[i]] = [values[i]]
-            df = pd.DataFrame(newdict)
-            df.to_csv(csvfile, index = False, header = True)
-#@profile
-#@time_out(600, timeout_callback)
+            visitor.run(root, html, worker["backend"])
+    except (SyntaxError, ValueError, UnicodeDecodeError, RecursionError) as e:
+        return sourcefile, None, type(e).__name__ + ": " + str(e)
+    result = {"counts": list(visitor.counts), "summary": visitor.summary()}
+    if found != None:
+        result["occurrences"] = found
+    if prof != None:
+        prof.add("scan", time.perf_counter() - start)
+        result["profile"] = prof.stats
+    return sourcefile, result, None
+
+
+def skipped_file(job, reason):
+    return job[0], None, reason
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def decode(data):
+    #as open() in text mode would have read it
+    return data.decode(locale.getpreferredencoding(False))
+
+
+def read_job(job):
+    #a file which can not be read here is left to the worker, to be skipped
+    #with the reason there
+    sourcefile, htmlfile = job
+    try:
+        source = read_file(sourcefile)
+        html = None
+        if htmlfile != None:
+            html = read_file(htmlfile)
+    except OSError:
+        return sourcefile, htmlfile, None, None
+    return sourcefile, htmlfile, source, html
+
+
+def file_cache_key(source, html, setup, version):
+    #source and html are the contents of the files, html None without one
+    import resultCache
+    if html == None:
+        html = "no-typeres"
+    return resultCache.cache_key(source, html, setup, version)
+
+
+def scan_project(project, typeres, setup, lib, backend, jobs, csvfile, sort, cache = None, pysonar = None, batch = "project", jsonlfile = None, occurrences = False, profilefile = None,
+                 timeout = None, max_rss = None, prefetch = 32):
+    import workerPool
+    import resultCache
+    import projectGraph
+    start = time.perf_counter()
+    sources = find_sources(project)
+    total = analyzer(setup, None)
+    stdlib = None
+    if lib != None and needs_stdlib(total.features):
+        stdlib = load_standard_libs(lib)
+    graph = projectGraph.project_graph()
+    if cache != None:
+        version = resultCache.scanner_version(lib)
+
+    #with Pysonar2 run here, the files of each batch are scanned once it is done
+    if pysonar != None:
+        import pysonarBatch
+        groups = pysonarBatch.runner(pysonar, project, sources, typeres, batch)
+        groups.start()
+    else:
+        groups = [sources]
+
+    scanned = 0
+    sinks = []
+    if csvfile != None:
+        sinks.append(resultSink.csv_sink(csvfile))
+    if jsonlfile != None:
+        sinks.append(resultSink.jsonl_sink(jsonlfile))
+    #the results are formatted and written by a thread of its own
+    writer = resultSink.writer(sinks)
+    prof = None
+    if profilefile != None:
+        import scanProfile
+        prof = scanProfile.profile()
+
+    def locate(sourcefile):
+        htmlfile = None
+        if typeres != None:
+            htmlfile = typeIndex.find_result(typeres, project, sourcefile)
+        return sourcefile, htmlfile
+
+    def fetch(job):
+        #prefetch files ahead are read by threads while the workers scan
+        if prefetch > 0:
+            return read_job(locate(job))
+        return locate(job) + (None, None)
+
+    keys = {}
+    def lookup(group):
+        #answer unchanged files from the cache, only the others go to the workers
+        if prefetch > 0:
+            fetched = workerPool.read_ahead(fetch, group, prefetch)
+        else:
+            fetched = map(fetch, group)
+        for job in fetched:
+            sourcefile, htmlfile, source, html = job
+            if cache != None and (htmlfile != None or typeres == None):
+                if source == None:
+                    job = read_job((sourcefile, htmlfile))
+                    source, html = job[2], job[3]
+                if source != None:
+                    key = file_cache_key(source, html, setup, version)
+                    #the cache has no occurrences, finding them needs a scan
+                    result = None
+                    if not occurrences:
+                        result = cache.get(key)
+                    if result != None:
+                        yield workerPool.done((sourcefile, result, None))
+                        continue
+                    keys[sourcefile] = key
+            yield job
+
+    #every file is given to a worker on its own, one which goes over the time or
+    #memory budget is replaced and the file tried again after the others
+    with workerPool.pool(jobs, scan_file, init_worker, (setup, lib, stdlib, backend, typeres, occurrences, prof != None),
+                         timeout, max_rss) as executor:
+        for group in groups:
+            for sourcefile, result, error in executor.map(lookup(group), skipped_file, prefetch):
+                if error == None and sourcefile in keys:
+                    cache.put(keys.pop(sourcefile), {"counts": result["counts"], "summary": result["summary"]})
+                if error != None:
+                    print("Skip File: " + sourcefile + " (" + error + ")")
+                    writer.skipped(sourcefile, error)
+                    continue
+                scanned += 1
+                total.merge(result["counts"])
+                relpath = os.path.relpath(sourcefile, project)
+                graph.add(projectGraph.module_name(relpath), result["summary"], os.path.basename(relpath) == "__init__.py")
+                output = time.perf_counter()
+                writer.write(sourcefile, result["counts"], result.get("occurrences", ()))
+                #cached results were not scanned and have no profile
+                if prof != None and "profile" in result:
+                    prof.add("output", time.perf_counter() - output)
+                    prof.merge(result["profile"])
+                    prof.file(sourcefile, result["profile"]["scan"][1])
+    output = time.perf_counter()
+    writer.close()
+    elapsed = time.perf_counter() - start
+    print("Scanned " + str(scanned) + " of " + str(len(sources)) + " files in " + project)
+    if pysonar != None:
+        print("Pysonar2: ran " + str(groups.inferred) + " of " + str(len(groups.batches)) + " batches in " + str(round(groups.elapsed, 2)) + "s")
+    #recursion and inheritance across the files of the project
+    limit = total.setup["recursion_limit"]
+    if limit != None:
+        limit += 2
+    inheritance = graph.check_inheritance()
+    found = []
+    if total.selected("FCAP.recursion"):
+        found.append(str(graph.check_recursion(limit)) + " recursive functions")
+    kinds = [str(inheritance[k]) + " " + k for k in ("hierarchical", "multilevel", "diamond") if total.selected("OOP.inheritance." + k)]
+    if len(kinds) > 1:
+        kinds = [", ".join(kinds[:len(kinds) - 1]) + " and " + kinds[len(kinds) - 1]]
+    if len(kinds) > 0:
+        found.append(kinds[0] + " inheritances")
+    if len(found) > 0:
+        print("Project-wide: " + ", ".join(found))
+    if len(sources) > 0:
+        print("Wall-clock: " + str(round(elapsed, 2)) + "s, " + str(round(elapsed * 1000 / len(sources), 2)) + "s per 1000 files")
+    if cache != None:
+        print("Cache: " + str(cache.hits) + " hits, " + str(cache.misses) + " misses")
+    if timeout != None or max_rss != None:
+        print("Budget: " + str(executor.retried) + " files tried again, " + str(executor.skipped) + " skipped, "
+              + str(executor.recycled) + " workers replaced")
+    if csvfile == None and jsonlfile == None:
+        total.standard_print(sort)
+    if prof != None:
+        prof.add("output", time.perf_counter() - output, 0)
+        prof.print_table()
+        prof.write(profilefile)
+
+
+def scan_history(repo, revs, setup, lib, backend, jobs, csvfile, sort, cache = None, jsonlfile = None, timeout = None, max_rss = None):
+    #the files of every commit are read from the git objects, with the local
+    #type inference, and every distinct blob is scanned once
+    import workerPool
+    import resultCache
+    import gitHistory
+    start = time.perf_counter()
+    total = analyzer(setup, None)
+    stdlib = None
+    if lib != None and needs_stdlib(total.features):
+        stdlib = load_standard_libs(lib)
+    if cache != None:
+        version = resultCache.scanner_version(lib)
+    hist = gitHistory.history(repo, revs)
+    try:
+        hist.read_trees()
+        blobs = list(hist.blobs)
+        keys = {}
+
+        def fetch():
+            #blobs are read through the one git process, so here and in order
+            for i in range(0, len(blobs)):
+                source = hist.read_blob(blobs[i])
+                if cache != None:
+                    key = file_cache_key(source, None, setup, version)
+                    result = cache.get(key)
+                    if result != None:
+                        yield workerPool.done((hist.blobs[blobs[i]], result, None))
+                        continue
+                    keys[i] = key
+                yield hist.blobs[blobs[i]], None, source, None
+
+        results = {}
+        with workerPool.pool(jobs, scan_file, init_worker, (setup, lib, stdlib, backend, None), timeout, max_rss) as executor:
+            i = 0
+            for path, result, error in executor.map(fetch(), skipped_file):
+                if error != None:
+                    print("Skip File: " + path + " in blob " + blobs[i] + " (" + error + ")")
+                    results[blobs[i]] = None
+                else:
+                    if i in keys:
+                        cache.put(keys.pop(i), {"counts": result["counts"], "summary": result["summary"]})
+                    results[blobs[i]] = result["counts"]
+                i += 1
+        totals = hist.totals(results, featureSchema.new_counts, featureSchema.add)
+        files = hist.files()
+    finally:
+        hist.close()
+
+    sinks = []
+    if csvfile != None:
+        sinks.append(resultSink.csv_sink(csvfile))
+    if jsonlfile != None:
+        sinks.append(resultSink.jsonl_sink(jsonlfile))
+    for sink in sinks:
+        with sink:
+            for commit, timestamp, scanned, skipped, counts in totals:
+                sink.commit(commit, timestamp, scanned, skipped, counts)
+    elapsed = time.perf_counter() - start
+    print("Scanned " + str(len(blobs)) + " distinct files of " + str(files) + " files in " + str(len(totals)) + " commits of " + repo)
+    print("Wall-clock: " + str(round(elapsed, 2)) + "s")
+    if cache != None:
+        print("Cache: " + str(cache.hits) + " hits, " + str(cache.misses) + " misses")
+    if timeout != None or max_rss != None:
+        print("Budget: " + str(executor.retried) + " files tried again, " + str(executor.skipped) + " skipped, "
+              + str(executor.recycled) + " workers replaced")
+    #without an output file, the totals of the last commit are shown
+    if csvfile == None and jsonlfile == None and len(totals) > 0:
+        total.merge(totals[len(totals) - 1][4])
+        print("Commit: " + totals[len(totals) - 1][0])
+        total.standard_print(sort)
+
+
 def main():
     sourcefile = None
     htmlfile = None
     showast = False
     sort = False
-    setup = {}
     csv = False
     csvfile = None
     lib = None
     cfg_file = None
+    backend = "stream"
+    project = None
+    jobs = os.cpu_count()
+    cachedir = None
+    cache_size = 512
+    cache_age = 30
+    notyperes = False
+    pysonar = None
+    batch = "project"
+    jsonlfile = None
+    occurrences = False
+    profilefile = None
+    timeout = None
+    max_rss = None
+    prefetch = 32
+    features = None
+    repo = None
+    revs = "HEAD"
     try:
-        opts, args = getopt.getopt(sys.argv[1:],"-h-s:-t:-a-m-c:-l:-f:",["source=","typeres=", "ast", "most-frequently", "csvfile=", "standard-libs=", "configfile="])
+        opts, args = getopt.getopt(sys.argv[1:],"-h-s:-t:-a-m-c:-l:-f:-p:-j:",["source=","typeres=", "ast", "most-frequently", "csvfile=", "standard-libs=", "configfile=", "html-parser=", "project=", "jobs=", "cache-dir=", "cache-max-size=", "cache-max-age=", "no-typeres", "pysonar=", "pysonar-batch=", "jsonl=", "occurrences", "profile=", "file-timeout=", "max-rss=", "prefetch=", "features=", "git-history=", "revs="])
     except getopt.GetoptError:
         print("Unsupportable arguments, please see featureScanner.py -h")
         sys.exit(-1)
@@ -746,7 +1088,25 @@ def main():
             print("-a/--ast : Show the AST of source code")
             print("-m/--most-frequently : Sort the results and show language features which used most frequenly")
             print("-c/--csvfile <CSV File> : Write the result into the csv file")
+            print("--jsonl <JSON Lines File> : Write the result of every file into the JSON Lines file as it is scanned")
+            print("--occurrences : Also write a record for every feature occurrence into the JSON Lines file, with its location and enclosing function and class")
             print("-l/--standard-libs <Standard Libs Info Directiry Path> : Indicate the info directory of standard libs to help conduct accurate cognition")
+            print("--html-parser <stream|bs4> : Indicate how to read the type inference result file, stream by default")
+            print("-p/--project <Python Project Directory> : Scan all Python source files under the directory, -t then indicates the directory of type inference result files")
+            print("-j/--jobs <Number> : Indicate the number of processes used to scan a project, the number of CPUs by default")
+            print("--cache-dir <Cache Directory> : Reuse the results of unchanged files from the cache in the directory")
+            print("--cache-max-size <MB> : Evict the least recently used results when the cache grows larger, 512 by default")
+            print("--cache-max-age <Days> : Evict the results older than the given days, 30 by default")
+            print("--no-typeres : Use a built-in local type inference instead of Pysonar2 results, faster but less precise")
+            print("--pysonar <Pysonar2 Jar File> : Run Pysonar2 on the project before and while scanning it, writing the results into the -t directory")
+            print("--pysonar-batch <project|dir> : Run one JVM for the whole project, or one per top-level directory and scan each as soon as it is done, project by default")
+            print("--file-timeout <Seconds> : Stop scanning a file of a project after the given seconds, it is tried once more after the other files and then skipped")
+            print("--prefetch <Number> : Indicate how many files of a project are read ahead while others are scanned, 32 by default, 0 to read them in the workers")
+            print("--features <Names> : Only count the given features, like TS.gradual_typing,FCAP.loop,DS, the others stay 0, without type dependent features no type inference result is read")
+            print("--git-history <Git Repository> : Scan the Python files of every commit of a local repository from its objects, every distinct file once, and write the totals of every commit, with the local type inference")
+            print("--revs <Revisions> : Indicate the commits to scan with --git-history as git rev-list takes them, like v1.0..main, HEAD by default")
+            print("--max-rss <MB> : Stop scanning a file of a project when its process uses more memory, it is tried once more after the other files and then skipped")
+            print("--profile <JSON File> : Show the time spent in every handler, type lookup and phase of scanning, and write it into the JSON file")
             sys.exit()
         elif opt in ("-s", "--source"):
             sourcefile = arg
@@ -763,29 +1123,184 @@ def main():
             lib = arg
         elif opt in ("-f", "--configfile"):
             cfg_file = arg
-      
-    if sourcefile != None and htmlfile != None and cfg_file != None:
-        
-        #set config
-        config = configparser.ConfigParser()
-        config.read(cfg_file)
-        if "scanner_defaults" not in config.keys():
-            print("Error: Can not read config file!")
-            exit(-1)
-        for key in config["scanner_defaults"]:
-            setup[key] = config["scanner_defaults"][key]
-        visitor = analyzer(setup, lib)
-        source = open(sourcefile, "r").read()
-        root = ast.parse(source)
-        if showast == True:
-            astpretty.pprint(root, indent = '    ')
-        visitor.run(root, open(htmlfile, "r"))
-        if csv == True and csvfile != None:
-            visitor.print_tocsv(csvfile, sourcefile)
+        elif opt == "--html-parser":
+            if arg not in typeIndex.BACKENDS:
+                print("Error: Unknown HTML parser " + arg + ", please use one of " + ", ".join(typeIndex.BACKENDS))
+                sys.exit(-1)
+            backend = arg
+        elif opt in ("-p", "--project"):
+            project = arg
+        elif opt in ("-j", "--jobs"):
+            if not arg.isdigit() or int(arg) < 1:
+                print("Error: The number of jobs should be a positive integer!")
+                sys.exit(-1)
+            jobs = int(arg)
+        elif opt == "--cache-dir":
+            cachedir = arg
+        elif opt in ("--cache-max-size", "--cache-max-age"):
+            if not arg.isdigit():
+                print("Error: " + opt + " should be a non-negative integer!")
+                sys.exit(-1)
+            if opt == "--cache-max-size":
+                cache_size = int(arg)
+            else:
+                cache_age = int(arg)
+        elif opt == "--no-typeres":
+            notyperes = True
+        elif opt == "--pysonar":
+            pysonar = arg
+        elif opt == "--jsonl":
+            jsonlfile = arg
+        elif opt == "--occurrences":
+            occurrences = True
+        elif opt == "--profile":
+            profilefile = arg
+        elif opt in ("--file-timeout", "--max-rss"):
+            if not arg.isdigit() or int(arg) < 1:
+                print("Error: " + opt + " should be a positive integer!")
+                sys.exit(-1)
+            if opt == "--file-timeout":
+                timeout = int(arg)
+            else:
+                max_rss = int(arg) * 1024 * 1024
+        elif opt == "--features":
+            try:
+                if len(featureSchema.select(arg.split(","))) == 0:
+                    raise ValueError("No features given")
+            except ValueError as e:
+                print("Error: " + str(e) + ", the feature names are listed in featureSchema.py!")
+                sys.exit(-1)
+            features = arg
+        elif opt == "--git-history":
+            repo = arg
+        elif opt == "--revs":
+            revs = arg
+        elif opt == "--prefetch":
+            if not arg.isdigit():
+                print("Error: --prefetch should be a non-negative integer!")
+                sys.exit(-1)
+            prefetch = int(arg)
+        elif opt == "--pysonar-batch":
+            if arg not in ("project", "dir"):
+                print("Error: Unknown Pysonar2 batch " + arg + ", please use project or dir")
+                sys.exit(-1)
+            batch = arg
+
+    if notyperes and htmlfile != None:
+        print("Error: -t/--typeres and --no-typeres can not be used together!")
+        sys.exit(-1)
+    if pysonar != None and (project == None or htmlfile == None):
+        print("Error: --pysonar needs a project (-p) and a directory for the type inference results (-t)!")
+        sys.exit(-1)
+    if repo != None and (project != None or sourcefile != None or htmlfile != None or pysonar != None or occurrences):
+        print("Error: --git-history can not be used with -s, -p, -t, --pysonar or --occurrences!")
+        sys.exit(-1)
+    if (timeout != None or max_rss != None) and project == None and repo == None:
+        print("Error: --file-timeout and --max-rss only apply to a project (-p) or a git history (--git-history)!")
+        sys.exit(-1)
+    if occurrences and jsonlfile == None:
+        print("Error: --occurrences needs a JSON Lines file (--jsonl)!")
+        sys.exit(-1)
+
+    setup = None
+    if cfg_file != None:
+        setup = read_config(cfg_file)
+        if features != None:
+            setup["features"] = features
+        try:
+            selection = selected_features(setup)
+        except ValueError as e:
+            print("Error: " + str(e) + " in " + cfg_file + ", the feature names are listed in featureSchema.py!")
+            sys.exit(-1)
+        #the type inference results are not read when no selected feature needs them
+        if not needs_types(selection):
+            htmlfile = None
+            notyperes = True
+            pysonar = None
+
+    cache = None
+    if cachedir != None:
+        import resultCache
+        cache = resultCache.result_cache(cachedir, cache_size * 1024 * 1024, cache_age * 24 * 3600)
+
+    #the cache keeps what was scanned even when the scan is interrupted
+    try:
+        if repo != None and cfg_file != None:
+            import subprocess
+            try:
+                scan_history(repo, revs, setup, lib, backend, jobs, csvfile, sort, cache, jsonlfile, timeout, max_rss)
+            except subprocess.CalledProcessError as e:
+                print("Error: Can not read the revisions " + revs + " of " + repo + ": " + e.stderr.decode().strip())
+        elif project != None and (htmlfile != None or notyperes) and cfg_file != None:
+            scan_project(project, htmlfile, setup, lib, backend, jobs, csvfile, sort, cache, pysonar, batch, jsonlfile, occurrences, profilefile,
+                         timeout, max_rss, prefetch)
+        elif sourcefile != None and (htmlfile != None or notyperes) and cfg_file != None:
+            counts = None
+            if cache != None:
+                import resultCache
+                html = None
+                if htmlfile != None:
+                    html = read_file(htmlfile)
+                key = file_cache_key(read_file(sourcefile), html, setup, resultCache.scanner_version(lib))
+                #the cache has no occurrences, finding them needs a scan
+                result = None
+                if not occurrences:
+                    result = cache.get(key)
+                if result != None:
+                    counts = result["counts"]
+            prof = None
+            if profilefile != None:
+                import scanProfile
+                prof = scanProfile.profile()
+            start = time.perf_counter()
+            source = open(sourcefile, "r").read()
+            root = ast.parse(source)
+            if prof != None:
+                prof.add("ast_parse", time.perf_counter() - start)
+            if showast == True:
+                import astpretty
+                astpretty.pprint(root, indent = '    ')
+            jsonl = None
+            if jsonlfile != None:
+                jsonl = resultSink.jsonl_sink(jsonlfile)
+            if counts != None:
+                visitor = analyzer(setup, None)
+                visitor.merge(counts)
+            else:
+                loading = time.perf_counter()
+                visitor = analyzer(setup, lib)
+                if prof != None:
+                    prof.add("load_stdlib", time.perf_counter() - loading)
+                    prof.instrument(visitor)
+                html = None
+                if not notyperes:
+                    html = open(htmlfile, "r")
+                if occurrences:
+                    for occurrence in visitor.stream(root, html, backend):
+                        jsonl.occurrence(sourcefile, occurrence)
+                else:
+                    visitor.run(root, html, backend)
+                if cache != None:
+                    cache.put(key, {"counts": list(visitor.counts), "summary": visitor.summary()})
+            output = time.perf_counter()
+            if jsonl != None:
+                jsonl.write(sourcefile, visitor.counts)
+                jsonl.close()
+            if csv == True and csvfile != None:
+                visitor.print_tocsv(csvfile, sourcefile)
+            elif jsonl == None:
+                visitor.standard_print(sort)
+            if prof != None:
+                prof.add("output", time.perf_counter() - output)
+                prof.add("scan", time.perf_counter() - start)
+                prof.file(sourcefile, time.perf_counter() - start)
+                prof.print_table()
+                prof.write(profilefile)
         else:
-            visitor.standard_print(sort)
-    else:
-        print("Error: Python source file or type inference result file or config file missing!")
+            print("Error: Python source file or type inference result file or config file missing!")
+    finally:
+        if cache != None:
+            cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+from array import array
+
+#The fixed list of features PyScan counts. Every feature has an integer slot,
+#its position in FEATURES, and the counts of a file are an array of longs in
+#that order. Feature names are the dotted paths of the nested featuremap the
+#results are shown as.
+
+FEATURES = (
+    #Function Call and Argument Passing
+    "FCAP.kwonlyargs",
+    "FCAP.kwarg",
+    "FCAP.posonlyargs",
+    "FCAP.multiple_return",
+    "FCAP.loop.while",
+    "FCAP.loop.for",
+    "FCAP.loop.continue",
+    "FCAP.loop.break",
+    "FCAP.recursion",
+    "FCAP.nested_function",
+    "FCAP.exception.try",
+    "FCAP.exception.raise",
+    "FCAP.exception.with_args",
+    "FCAP.packing_and_unpacking.packing",
+    "FCAP.packing_and_unpacking.unpacking",
+    "FCAP.decorator",
+    #Type System
+    "TS.first_class_function.function_as_parameter",
+    "TS.first_class_function.function_as_returnvalue",
+    "TS.first_class_function.function_assignedto_var",
+    "TS.gradual_typing",
+    #Evaluation Strategy
+    "ES.generator",
+    #Object-oriented Programming
+    "OOP.nested_class",
+    "OOP.inheritance.single",
+    "OOP.inheritance.multiple",
+    "OOP.inheritance.hierarchical",
+    "OOP.inheritance.multilevel",
+    "OOP.inheritance.diamond",
+    "OOP.polymorphism.parametic",
+    "OOP.encapsulation.protected.var",
+    "OOP.encapsulation.protected.method",
+    "OOP.encapsulation.private.var",
+    "OOP.encapsulation.private.method",
+    #Data Structure
+    "DS.list_comprehension",
+    "DS.heterogeneous_list.constant_index",
+    "DS.heterogeneous_list.variable_index",
+    "DS.heterogeneous_tuple.constant_index",
+    "DS.heterogeneous_tuple.variable_index",
+    #MetaProgramming
+    "MP.introspection",
+    "MP.reflection",
+    "MP.metaclass",
+)
+
+SLOTS = {}
+for i in range(0, len(FEATURES)):
+    SLOTS[FEATURES[i]] = i
+
+ZEROS = array("l", [0]) * len(FEATURES)
+
+
+def select(names):
+    #the features named, a name is a feature or a prefix of features like
+    #FCAP.loop or DS
+    res = set()
+    for name in names:
+        name = name.strip()
+        if name == "":
+            continue
+        found = [f for f in FEATURES if f == name or f.startswith(name + ".")]
+        if len(found) == 0:
+            raise ValueError("Unknown feature: " + name)
+        res.update(found)
+    return frozenset(res)
+
+
+def new_counts():
+    return array("l", ZEROS)
+
+
+def add(total, counts):
+    for i in range(0, len(FEATURES)):
+        total[i] += counts[i]
+
+
+def to_featuremap(counts):
+    featuremap = {}
+    for i in range(0, len(FEATURES)):
+        keys = FEATURES[i].split(".")
+        inner = featuremap
+        for key in keys[:len(keys) - 1]:
+            if key not in inner:
+                inner[key] = {}
+            inner = inner[key]
+        inner[keys[len(keys) - 1]] = counts[i]
+    return featuremap
+
+
+def csv_keys():
+    #the CSV columns are the featuremap keys run together, like FCAPloopwhile
+    keys = ["filepath"]
+    for name in FEATURES:
+        keys.append(name.replace(".", ""))
+    return keys
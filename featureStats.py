@@ -0,0 +1,118 @@
+import csv
+import json
+import sys
+from array import array
+
+import featureSchema
+
+#Statistics over the per-file counts of many projects, like how feature usage
+#is distributed. The counts of all files are appended to one flat array which
+#numpy sees as a files x features matrix, so totals, percentiles and how many
+#projects use a feature are computed for all features at once.
+#Usage: python3 featureStats.py <CSV or JSON Lines Result File> ...
+#Every result file, written by -c or --jsonl, holds one project.
+
+PERCENTILES = [50, 90, 99]
+
+
+class aggregator:
+    def __init__(self):
+        self.projects = []
+        self.index = {}
+        #project of every file, and the counts of all files one after another
+        self.owner = array("l")
+        self.values = array("l")
+
+    def add(self, project, counts):
+        if project not in self.index:
+            self.index[project] = len(self.projects)
+            self.projects.append(project)
+        self.owner.append(self.index[project])
+        self.values.extend(counts)
+
+    def files(self):
+        return len(self.owner)
+
+    def matrix(self):
+        import numpy
+        return numpy.frombuffer(self.values, dtype = "l").reshape(-1, len(featureSchema.FEATURES))
+
+    def totals(self):
+        return self.matrix().sum(axis = 0)
+
+    def project_totals(self):
+        #projects x features, the files of each project summed up
+        import numpy
+        owner = numpy.frombuffer(self.owner, dtype = "l")
+        order = numpy.argsort(owner, kind = "stable")
+        starts = numpy.searchsorted(owner[order], numpy.arange(len(self.projects)))
+        return numpy.add.reduceat(self.matrix()[order], starts, axis = 0)
+
+    def percentiles(self, percentiles = PERCENTILES):
+        #per file counts at the given percentiles, one row each
+        import numpy
+        return numpy.percentile(self.matrix(), percentiles, axis = 0)
+
+    def files_using(self):
+        return (self.matrix() > 0).sum(axis = 0)
+
+    def projects_using(self):
+        return (self.project_totals() > 0).sum(axis = 0)
+
+    def summary(self, percentiles = PERCENTILES):
+        totals = self.totals()
+        files = self.files_using()
+        projects = self.projects_using()
+        values = self.percentiles(percentiles)
+        res = {}
+        for i in range(0, len(featureSchema.FEATURES)):
+            stats = {"total": int(totals[i]), "files": int(files[i]), "projects": int(projects[i])}
+            for j in range(0, len(percentiles)):
+                stats["p" + str(percentiles[j])] = float(values[j][i])
+            res[featureSchema.FEATURES[i]] = stats
+        return res
+
+    def read(self, resultfile, project = None):
+        #the file records of a CSV or JSON Lines result file, by default the
+        #result file is the project
+        if project == None:
+            project = resultfile
+        if resultfile.endswith(".jsonl"):
+            with open(resultfile, "r") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record["type"] == "file":
+                        features = record["features"]
+                        self.add(project, [features[name] for name in featureSchema.FEATURES])
+            return
+        with open(resultfile, "r", newline = "") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            columns = [header.index(key) for key in featureSchema.csv_keys()[1:]]
+            for row in reader:
+                self.add(project, [int(row[i]) for i in columns])
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 featureStats.py <CSV or JSON Lines Result File> ...")
+        sys.exit(-1)
+    stats = aggregator()
+    for resultfile in sys.argv[1:]:
+        stats.read(resultfile)
+    if stats.files() == 0:
+        print("No files in the results")
+        return
+    from prettytable import PrettyTable
+    table = PrettyTable(["Language Feature", "Total", "Files", "Projects"] + ["P" + str(p) + " per File" for p in PERCENTILES])
+    table.align["Language Feature"] = 'l'
+    summary = stats.summary()
+    for name in featureSchema.FEATURES:
+        row = summary[name]
+        table.add_row([name, row["total"], row["files"], row["projects"]] + [round(row["p" + str(p)], 1) for p in PERCENTILES])
+    print(str(stats.files()) + " files in " + str(len(stats.projects)) + " projects")
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
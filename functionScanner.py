@@ -2,18 +2,21 @@ import ast
 import getopt
 import sys
 import csv
-from bs4 import BeautifulSoup
-import re
+import os
+import typeIndex
+import pysonarTypes
+import stdlibIndex
 
 class scanner(ast.NodeVisitor):
-    def __init__(self, html, parametic_poly):
+    def __init__(self, html, parametic_poly, backend = "stream"):
         self.funcs = {}
         self.funcs["funcs"] = []
         self.funcs["classes"] = {}
         self.classnames = []
         self.parametic_poly = parametic_poly
+        self.typeindex = {}
         if html != None:
-            self.soup = BeautifulSoup(html, features="html.parser")
+            self.typeindex = typeIndex.load(html, backend)
 
     def visit_FunctionDef(self, node):
         if len(self.classnames) == 0 and not node.name.startswith("_") and node.name not in self.funcs["funcs"] and self.parametic_poly == True and self.check_polymorphism(node.name, node.lineno):
@@ -43,14 +46,18 @@ class scanner(ast.NodeVisitor):
         for c in deletekeys:
             del self.funcs["classes"][c]
 
-    def print_to_csv(self, csvfile):
-        keys = ["class", "func"]
+    def rows(self):
         values = []
         for func in self.funcs["funcs"]:
             values.append(["None", func])
         for c in self.funcs["classes"]:
             for func in self.funcs["classes"][c]:
                 values.append([c, func])
+        return values
+
+    def print_to_csv(self, csvfile):
+        keys = ["class", "func"]
+        values = self.rows()
 
         if len(values) > 0:
             with open(csvfile, "w") as csvcontent:
@@ -59,33 +66,59 @@ class scanner(ast.NodeVisitor):
                 writer.writerows(values)
 
     def check_polymorphism(self, name, lineno):
-        spans = self.soup.find_all("span", text = re.compile(" *" + str(lineno)))
-        if len(spans) > 1 or len(spans) == 0:
+        titles = typeIndex.lookup(self.typeindex, name, lineno)
+        if len(titles) == 0:
             return False
-        else:
-            p = spans[0].next_sibling
-            while(p != None and p.name != "span"):
-                if hasattr(p, "xid") and hasattr(p, "title") and p.string == name:
-                    types = p["title"].split(" / ")
-                    count = 0
-                    returnvalues = {}
-                    for t in types:
-                        if "?" not in t and " -> " in t:
-                            sig = t.split(" -> ")
-                            if "|" in sig[0] and "{" in sig[0] and "}" in sig[0]:
-                                return True
-                            if sig[1] not in returnvalues:
-                                returnvalues[sig[1]] = sig[0]
-                            elif returnvalues[sig[1]] != sig[0]:
-                                count += 1
-                    if count > 0:
-                        return True
-                    else:
-                        return False
-                p = p.next_sibling
-        return False
-        
+        return pysonarTypes.polymorphic(pysonarTypes.parse(titles[0]))
+
+
+def scan_module(job):
+    sourcefile, module, htmlfile, backend = job
+    try:
+        root = ast.parse(open(sourcefile, "r").read())
+    except (SyntaxError, ValueError, UnicodeDecodeError, RecursionError):
+        return module, None
+    rows = {}
+    visitor = scanner(None, False)
+    visitor.visit(root)
+    visitor.finalize()
+    rows["funcs"] = visitor.rows()
+    rows["polys"] = []
+    if htmlfile != None:
+        with open(htmlfile, "r") as html:
+            visitor = scanner(html, True, backend)
+        visitor.visit(root)
+        visitor.finalize()
+        rows["polys"] = visitor.rows()
+    return module, rows
+
+
+def build_kb(libdir, kbfile, typeres, backend, jobs):
+    import concurrent.futures
+    jobs_list = []
+    for dirpath, dirnames, filenames in os.walk(libdir):
+        dirnames.sort()
+        for f in sorted(filenames):
+            if f.endswith(".py"):
+                sourcefile = os.path.join(dirpath, f)
+                module = os.path.relpath(sourcefile, libdir)[0:-3].replace(os.sep, "/")
+                htmlfile = None
+                if typeres != None:
+                    htmlfile = typeIndex.find_result(typeres, libdir, sourcefile)
+                jobs_list.append((sourcefile, module, htmlfile, backend))
 
+    index = stdlibIndex.stdlib_index()
+    skipped = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers = jobs) as executor:
+        for module, rows in executor.map(scan_module, jobs_list, chunksize = 16):
+            if rows == None:
+                skipped += 1
+                continue
+            for table in rows:
+                for c, func in rows[table]:
+                    index.add(table, module, c, func)
+    stdlibIndex.save_kb(index, kbfile)
+    print("Scanned " + str(len(jobs_list) - skipped) + " of " + str(len(jobs_list)) + " files, " + str(len(index.tables["funcs"])) + " functions and " + str(len(index.tables["polys"])) + " polymorphic functions written to " + kbfile)
 
 
 if __name__ == "__main__":
@@ -93,8 +126,12 @@ if __name__ == "__main__":
     csvfile = None
     parametic_poly = False
     htmlfile = None
+    backend = "stream"
+    libdir = None
+    kbfile = os.path.join("standard_res", stdlibIndex.KB_FILE)
+    jobs = os.cpu_count()
     try:
-        opts, args = getopt.getopt(sys.argv[1:],"-h-s:-c:-p-t:",["source=", "csvfile=", "parametic-poly", "typeres="])
+        opts, args = getopt.getopt(sys.argv[1:],"-h-s:-c:-p-t:-o:-j:",["source=", "csvfile=", "parametic-poly", "typeres=", "html-parser=", "build-kb=", "output=", "jobs="])
     except getopt.GetoptError:
         print("Unsupportable arguments, please see functionScanner.py -h")
         sys.exit(-1)
@@ -102,6 +139,12 @@ if __name__ == "__main__":
         if opt == '-h':
             print("Usage:\n-s/--source <Python Source File> : Indicate the path of Python source file")
             print("-c/--csvfile <CSV File> : Write the result into the csv file")
+            print("-p/--parametic-poly : Only keep the functions with parametic polymorphism")
+            print("-t/--typeres <Type Inference Result File> : Indicate the path of type inference result file")
+            print("--html-parser <stream|bs4> : Indicate how to read the type inference result file, stream by default")
+            print("--build-kb <Standard Lib Directory> : Scan all standard lib files into one knowledge base, -t then indicates the directory of type inference result files")
+            print("-o/--output <Knowledge Base File> : Where to write the knowledge base, standard_res/" + stdlibIndex.KB_FILE + " by default")
+            print("-j/--jobs <Number> : Indicate the number of processes used to build the knowledge base, the number of CPUs by default")
             sys.exit()
         elif opt in ("-s", "--source"):
             sourcefile = arg
@@ -111,12 +154,30 @@ if __name__ == "__main__":
             parametic_poly = True
         elif opt in ("-t", "--typeres"):
             htmlfile = arg
+        elif opt == "--html-parser":
+            if arg not in typeIndex.BACKENDS:
+                print("Error: Unknown HTML parser " + arg + ", please use one of " + ", ".join(typeIndex.BACKENDS))
+                sys.exit(-1)
+            backend = arg
+        elif opt == "--build-kb":
+            libdir = arg
+        elif opt in ("-o", "--output"):
+            kbfile = arg
+        elif opt in ("-j", "--jobs"):
+            if not arg.isdigit() or int(arg) < 1:
+                print("Error: The number of jobs should be a positive integer!")
+                sys.exit(-1)
+            jobs = int(arg)
 
-    if sourcefile != None:
+    if libdir != None:
+        build_kb(libdir, kbfile, htmlfile, backend, jobs)
+    elif sourcefile != None:
         source = open(sourcefile, "r").read()
         root = ast.parse(source)
-        html = open(htmlfile, "r")
-        visitor = scanner(html, parametic_poly)
+        html = None
+        if htmlfile != None:
+            html = open(htmlfile, "r")
+        visitor = scanner(html, parametic_poly, backend)
         visitor.visit(root)
         visitor.finalize()
         print(visitor.funcs)
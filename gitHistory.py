@@ -0,0 +1,142 @@
+import subprocess
+
+#Reads the Python files of many commits straight from the objects of a git
+#repository, through one git cat-file --batch process, for scanning the
+#history of a project without checking anything out. Trees and blobs are
+#named by their content, so a tree shared by many commits is read once, and
+#the files of all commits come down to their distinct blobs. Once the blobs
+#are scanned, the totals of every tree are added up once as well, and the
+#totals of a commit are those of its root tree.
+
+#modes of the tree entries read, symbolic links and submodules are left out
+TREE_MODE = b"40000"
+FILE_MODES = (b"100644", b"100755")
+
+
+def list_commits(repo, revs):
+    #(commit, committer timestamp) of the revisions, oldest first, revs as
+    #git rev-list takes them, like v1.0..main
+    out = subprocess.run(["git", "-C", repo, "rev-list", "--reverse", "--timestamp"] + revs.split(),
+                         stdout = subprocess.PIPE, stderr = subprocess.PIPE, check = True).stdout.decode()
+    commits = []
+    for line in out.splitlines():
+        timestamp, commit = line.split()
+        commits.append((commit, int(timestamp)))
+    return commits
+
+
+def parse_tree(data, size):
+    #(mode, name, object) of every entry of a tree object, whose object ids
+    #are size bytes long
+    entries = []
+    i = 0
+    while i < len(data):
+        space = data.index(b" ", i)
+        nul = data.index(b"\0", space)
+        entries.append((data[i:space], data[space + 1:nul].decode("utf-8", "surrogateescape"), data[nul + 1:nul + 1 + size].hex()))
+        i = nul + 1 + size
+    return entries
+
+
+class object_reader:
+    def __init__(self, repo):
+        self.process = subprocess.Popen(["git", "-C", repo, "cat-file", "--batch"], stdin = subprocess.PIPE, stdout = subprocess.PIPE)
+
+    def read(self, name):
+        #(type, content) of an object
+        self.process.stdin.write(name.encode() + b"\n")
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) != 3:
+            raise KeyError("No git object " + name)
+        data = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)
+        return header[1].decode(), data
+
+    def close(self):
+        if self.process.poll() == None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.process.stdout.close()
+
+
+class history:
+    def __init__(self, repo, revs):
+        self.commits = list_commits(repo, revs)
+        self.reader = object_reader(repo)
+        #root tree of every commit, the subtrees and Python blobs of every
+        #tree, and for every blob the first path it was found at
+        self.roots = {}
+        self.trees = {}
+        self.blobs = {}
+
+    def read_trees(self):
+        for commit, timestamp in self.commits:
+            kind, data = self.reader.read(commit)
+            root = data.split(b"\n", 1)[0].split()[1].decode()
+            self.roots[commit] = root
+            stack = [(root, "")]
+            while stack:
+                tree, path = stack.pop()
+                if tree in self.trees:
+                    continue
+                kind, data = self.reader.read(tree)
+                subtrees = []
+                blobs = []
+                for mode, name, obj in parse_tree(data, len(tree) // 2):
+                    if mode == TREE_MODE:
+                        subtrees.append(obj)
+                        stack.append((obj, path + name + "/"))
+                    elif mode in FILE_MODES and name.endswith(".py"):
+                        blobs.append(obj)
+                        if obj not in self.blobs:
+                            self.blobs[obj] = path + name
+                self.trees[tree] = (subtrees, blobs)
+
+    def read_blob(self, blob):
+        return self.reader.read(blob)[1]
+
+    def files(self):
+        #the number of Python files in all commits, the same blob counted in
+        #every commit and path it is in
+        return sum(self.tree_files(self.roots[commit], {}) for commit, timestamp in self.commits)
+
+    def tree_files(self, tree, memo):
+        if tree not in memo:
+            subtrees, blobs = self.trees[tree]
+            memo[tree] = len(blobs) + sum(self.tree_files(t, memo) for t in subtrees)
+        return memo[tree]
+
+    def totals(self, results, new_counts, add):
+        #(commit, timestamp, files, skipped, counts) for every commit, results
+        #map every blob to its counts, or None for a blob that was skipped
+        memo = {}
+        res = []
+        for commit, timestamp in self.commits:
+            files, skipped, counts = self.tree_totals(self.roots[commit], results, new_counts, add, memo)
+            res.append((commit, timestamp, files, skipped, counts))
+        return res
+
+    def tree_totals(self, tree, results, new_counts, add, memo):
+        if tree in memo:
+            return memo[tree]
+        subtrees, blobs = self.trees[tree]
+        files = 0
+        skipped = 0
+        counts = new_counts()
+        for blob in blobs:
+            if results[blob] == None:
+                skipped += 1
+            else:
+                files += 1
+                add(counts, results[blob])
+        for t in subtrees:
+            f, s, c = self.tree_totals(t, results, new_counts, add, memo)
+            files += f
+            skipped += s
+            add(counts, c)
+        memo[tree] = (files, skipped, counts)
+        return memo[tree]
+
+    def close(self):
+        self.reader.close()
@@ -0,0 +1,614 @@
+import ast
+
+#Lightweight local type inference, used instead of a Pysonar2 result with
+#--no-typeres. It works within one module and only infers what the scanner's
+#checks look at: functions and lambdas, the element types of list and tuple
+#literals, instances of the module's classes and the argument types seen at
+#call sites. A name has one type per scope no matter where in the scope it is
+#assigned, and cycles between inferred types are cut with "?". The result is
+#a type index like the one typeIndex builds, with the titles written in
+#Pysonar2's notation, so the checks work on both.
+
+UNKNOWN = "?"
+
+#signatures kept per function, Pysonar2 also stops listing them at some point
+MAX_SIGNATURES = 8
+
+CONSTANT_TYPES = {
+    int: "int",
+    float: "float",
+    complex: "complex",
+    str: "str",
+    bytes: "bytes",
+    bool: "bool",
+    type(None): "None",
+}
+
+#builtin classes and the type of their instances
+BUILTIN_TYPES = {
+    "int": "int",
+    "float": "float",
+    "complex": "complex",
+    "str": "str",
+    "bytes": "bytes",
+    "bool": "bool",
+    "list": "[?]",
+    "dict": "{? : ?}",
+}
+
+#builtin functions and their return type
+BUILTIN_FUNCS = {
+    "len": "int",
+    "repr": "str",
+    "ascii": "str",
+    "chr": "str",
+    "ord": "int",
+    "hex": "str",
+    "oct": "str",
+    "bin": "str",
+    "hash": "int",
+    "id": "int",
+    "input": "str",
+    "format": "str",
+    "print": "None",
+    "isinstance": "bool",
+    "issubclass": "bool",
+    "hasattr": "bool",
+    "callable": "bool",
+    "range": "[int]",
+}
+
+
+def union(titles):
+    known = []
+    for t in titles:
+        if t != UNKNOWN and t not in known:
+            known.append(t)
+    if len(known) == 0:
+        return UNKNOWN
+    if len(known) == 1:
+        return known[0]
+    return "{" + " | ".join(sorted(known)) + "}"
+
+
+def element_of(title):
+    if title.startswith("[") and title.endswith("]"):
+        return title[1:len(title) - 1]
+    if title == "str":
+        return "str"
+    return UNKNOWN
+
+
+class scope:
+    __slots__ = ("parent", "names", "funcs", "classes", "selfname", "klass")
+
+    def __init__(self, parent):
+        self.parent = parent
+        #name -> list of (kind, payload) bindings
+        self.names = {}
+        self.funcs = {}
+        self.classes = {}
+        #the first parameter of a method and its class
+        self.selfname = None
+        self.klass = None
+
+    def binds(self, name):
+        return name in self.names or name in self.funcs or self.classes.get(name) != None
+
+
+class function:
+    __slots__ = ("node", "scope", "outer", "params", "defaults", "calls", "returns")
+
+    def __init__(self, node, outer):
+        self.node = node
+        self.scope = scope(outer)
+        self.outer = outer
+        self.params = []
+        self.defaults = {}
+        self.calls = []
+        self.returns = []
+
+
+class klass:
+    __slots__ = ("name", "scope", "bases", "attrs")
+
+    def __init__(self, name, outer):
+        self.name = name
+        self.scope = scope(outer)
+        #class bodies are skipped when resolving names in methods
+        self.scope.klass = self
+        self.bases = []
+        #attributes assigned through self in methods
+        self.attrs = {}
+
+
+class collector(ast.NodeVisitor):
+    def __init__(self):
+        self.module = scope(None)
+        self.current = self.module
+        self.functions = [None]
+        self.classes = {}
+        self.lambdas = {}
+        self.calls = []
+        self.occurrences = []
+
+    def bind(self, name, kind, payload):
+        if name not in self.current.names:
+            self.current.names[name] = []
+        self.current.names[name].append((kind, payload))
+
+    def bind_target(self, target, kind, value):
+        if type(target) == ast.Name:
+            self.bind(target.id, kind, value)
+        elif type(target) in (ast.Tuple, ast.List):
+            if kind == "value" and type(value) in (ast.Tuple, ast.List) and len(value.elts) == len(target.elts):
+                for i in range(0, len(target.elts)):
+                    self.bind_target(target.elts[i], kind, value.elts[i])
+            else:
+                for i in target.elts:
+                    self.bind_target(i, "unknown", None)
+        elif type(target) == ast.Starred:
+            self.bind_target(target.value, "unknown", None)
+        elif type(target) == ast.Attribute and type(target.value) == ast.Name and target.value.id == self.current.selfname:
+            attrs = self.current.klass.attrs
+            if target.attr not in attrs:
+                attrs[target.attr] = []
+            if kind == "value":
+                attrs[target.attr].append((self.current, value))
+
+    def visit_FunctionDef(self, node):
+        outer = self.current
+        f = function(node, outer)
+        outer.funcs[node.name] = f
+        self.occurrences.append((outer, node, f))
+        for i in node.decorator_list:
+            self.visit(i)
+        self.visit(node.args)
+        if node.returns != None:
+            self.visit(node.returns)
+
+        args = node.args
+        positional = args.posonlyargs + args.args
+        for i in range(0, len(args.defaults)):
+            f.defaults[positional[len(positional) - len(args.defaults) + i].arg] = args.defaults[i]
+        for i in range(0, len(args.kwonlyargs)):
+            if args.kw_defaults[i] != None:
+                f.defaults[args.kwonlyargs[i].arg] = args.kw_defaults[i]
+        params = positional + args.kwonlyargs
+        static = False
+        for i in node.decorator_list:
+            if type(i) == ast.Name and i.id == "staticmethod":
+                static = True
+        if outer.klass != None and outer.selfname == None and not static and len(positional) > 0:
+            #methods get their instance through the first parameter
+            f.scope.selfname = positional[0].arg
+            f.scope.klass = outer.klass
+            f.scope.names[positional[0].arg] = [("self", outer.klass)]
+            params = params[1:]
+        for i in range(0, len(params)):
+            f.params.append(params[i].arg)
+            f.scope.names[params[i].arg] = [("param", (f, i))]
+        for i in (args.vararg, args.kwarg):
+            if i != None:
+                f.scope.names[i.arg] = [("unknown", None)]
+        for i in positional + args.kwonlyargs + [args.vararg, args.kwarg]:
+            if i != None:
+                self.occurrences.append((f.scope, i, None))
+
+        self.current = f.scope
+        self.functions.append(f)
+        for i in node.body:
+            self.visit(i)
+        self.functions.pop()
+        self.current = outer
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        self.visit(node.args)
+        outer = self.current
+        inner = scope(outer)
+        for i in node.args.posonlyargs + node.args.args + node.args.kwonlyargs + [node.args.vararg, node.args.kwarg]:
+            if i != None:
+                inner.names[i.arg] = [("unknown", None)]
+        self.lambdas[node] = inner
+        self.current = inner
+        self.visit(node.body)
+        self.current = outer
+
+    def visit_ClassDef(self, node):
+        outer = self.current
+        k = klass(node.name, outer)
+        outer.classes[node.name] = k
+        self.classes[node.name] = k
+        for i in node.bases:
+            if type(i) == ast.Name:
+                k.bases.append(i.id)
+        for i in node.decorator_list + node.bases + node.keywords:
+            self.visit(i)
+        self.current = k.scope
+        self.functions.append(None)
+        for i in node.body:
+            self.visit(i)
+        self.functions.pop()
+        self.current = outer
+
+    def visit_Assign(self, node):
+        for i in node.targets:
+            self.bind_target(i, "value", node.value)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node):
+        if node.value != None:
+            self.bind_target(node.target, "value", node.value)
+        self.generic_visit(node)
+
+    def visit_NamedExpr(self, node):
+        self.bind_target(node.target, "value", node.value)
+        self.generic_visit(node)
+
+    def visit_For(self, node):
+        self.bind_target(node.target, "element", node.iter)
+        self.generic_visit(node)
+
+    visit_AsyncFor = visit_For
+
+    def visit_comprehension(self, node):
+        self.bind_target(node.target, "element", node.iter)
+        self.generic_visit(node)
+
+    def visit_withitem(self, node):
+        if node.optional_vars != None:
+            self.bind_target(node.optional_vars, "unknown", None)
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node):
+        if node.name != None:
+            self.bind(node.name, "unknown", None)
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        for i in node.names:
+            if i.asname != None:
+                self.bind(i.asname, "unknown", None)
+            elif i.name != "*":
+                self.bind(i.name.split(".")[0], "unknown", None)
+
+    visit_ImportFrom = visit_Import
+
+    def visit_Return(self, node):
+        f = self.functions[len(self.functions) - 1]
+        if f != None:
+            f.returns.append(node.value)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        self.calls.append((self.current, node))
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        self.occurrences.append((self.current, node, None))
+
+    def visit_Attribute(self, node):
+        self.occurrences.append((self.current, node, None))
+        self.generic_visit(node)
+
+
+class inferer:
+    def __init__(self, info):
+        self.info = info
+        self.cache = {}
+        self.active = set()
+        #functions whose return type is being inferred
+        self.returning = set()
+
+    def memo(self, key, compute, default):
+        #a type depending on itself is cut with the default
+        if key in self.cache:
+            return self.cache[key]
+        if key in self.active:
+            return default
+        self.active.add(key)
+        value = compute()
+        self.active.discard(key)
+        self.cache[key] = value
+        return value
+
+    def resolve(self, sc, name):
+        #the scope binding a name, class bodies are skipped for inner scopes
+        if sc.binds(name):
+            return sc
+        p = sc.parent
+        while p != None:
+            if (p.klass == None or p.selfname != None) and p.binds(name):
+                return p
+            p = p.parent
+        return None
+
+    def static_class(self, sc, name):
+        #the class of a name as far as it is clear without inference
+        s = self.resolve(sc, name)
+        if s == None:
+            return None
+        if s.classes.get(name) != None:
+            return s.classes[name]
+        if s.selfname == name:
+            return s.klass
+        for kind, payload in s.names.get(name, []):
+            if kind == "value" and type(payload) == ast.Call and type(payload.func) == ast.Name:
+                c = self.resolve(s, payload.func.id)
+                if c != None and c.classes.get(payload.func.id) != None:
+                    return c.classes[payload.func.id]
+        return None
+
+    def find_attr(self, k, attr, seen = None):
+        if seen == None:
+            seen = set()
+        if k.name in seen:
+            return None
+        seen.add(k.name)
+        if attr in k.scope.funcs or attr in k.scope.names or attr in k.attrs:
+            return k
+        for b in k.bases:
+            if b in self.info.classes:
+                found = self.find_attr(self.info.classes[b], attr, seen)
+                if found != None:
+                    return found
+        return None
+
+    def callee(self, sc, func):
+        if type(func) == ast.Name:
+            s = self.resolve(sc, func.id)
+            if s == None:
+                return None
+            if func.id in s.funcs:
+                return s.funcs[func.id]
+            if s.classes.get(func.id) != None:
+                k = self.find_attr(s.classes[func.id], "__init__")
+                if k != None:
+                    return k.scope.funcs.get("__init__")
+        elif type(func) == ast.Attribute and type(func.value) == ast.Name:
+            k = self.static_class(sc, func.value.id)
+            if k != None:
+                k = self.find_attr(k, func.attr)
+            if k != None:
+                return k.scope.funcs.get(func.attr)
+        return None
+
+    def link_calls(self):
+        for sc, node in self.info.calls:
+            f = self.callee(sc, node.func)
+            if f != None:
+                f.calls.append((sc, node))
+
+    def bind_args(self, f, call, sc, binding):
+        titles = [UNKNOWN] * len(f.params)
+        for i in range(0, len(call.args)):
+            if type(call.args[i]) == ast.Starred or i >= len(titles):
+                break
+            titles[i] = self.infer(call.args[i], sc, binding)
+        given = set(range(0, min(len(call.args), len(titles))))
+        for i in call.keywords:
+            if i.arg != None and i.arg in f.params:
+                index = f.params.index(i.arg)
+                titles[index] = self.infer(i.value, sc, binding)
+                given.add(index)
+        for i in range(0, len(titles)):
+            if i not in given and f.params[i] in f.defaults:
+                titles[i] = self.infer(f.defaults[f.params[i]], f.outer, None)
+        return tuple(titles)
+
+    def signatures(self, f):
+        def compute():
+            sigs = []
+            for sc, call in f.calls:
+                args = self.bind_args(f, call, sc, None)
+                if args not in sigs:
+                    sigs.append(args)
+                if len(sigs) >= MAX_SIGNATURES:
+                    break
+            #calls made while the signatures are inferred, like recursive
+            #ones, only see unknown arguments
+            known = [s for s in sigs if len(s) == 0 or s.count(UNKNOWN) < len(s)]
+            if len(known) > 0:
+                return known
+            return sigs
+        return self.memo(("sigs", f), compute, [])
+
+    def param_type(self, f, index):
+        titles = [s[index] for s in self.signatures(f)]
+        if f.params[index] in f.defaults:
+            titles.append(self.infer(f.defaults[f.params[index]], f.outer, None))
+        return union(titles)
+
+    def return_type(self, f, args):
+        def compute():
+            binding = {}
+            for i in range(0, len(f.params)):
+                binding[f.params[i]] = args[i]
+            if len(f.returns) == 0:
+                return "None"
+            titles = []
+            for i in f.returns:
+                if i == None:
+                    titles.append("None")
+                else:
+                    titles.append(self.infer(i, f.scope, binding))
+            return union(titles)
+        #a function is inferred for one argument tuple at a time, a call made
+        #meanwhile with other arguments, which may grow on every recursive
+        #call, is cut
+        key = ("return", f, args)
+        if key in self.cache:
+            return self.cache[key]
+        if f in self.returning:
+            return UNKNOWN
+        self.returning.add(f)
+        try:
+            return self.memo(key, compute, UNKNOWN)
+        finally:
+            self.returning.discard(f)
+
+    def func_title(self, f):
+        def compute():
+            sigs = self.signatures(f)
+            if len(sigs) == 0:
+                sigs = [tuple([UNKNOWN] * len(f.params))]
+            parts = []
+            for args in sigs:
+                part = "(" + ", ".join(args) + ") -> " + self.return_type(f, args)
+                if part not in parts:
+                    parts.append(part)
+            return " / ".join(parts)
+        return self.memo(("func", f), compute, "(" + ", ".join([UNKNOWN] * len(f.params)) + ") -> " + UNKNOWN)
+
+    def name_type(self, sc, name, binding = None):
+        if binding != None and name in binding:
+            return binding[name]
+        s = self.resolve(sc, name)
+        if s == None:
+            if name in BUILTIN_FUNCS:
+                return "(" + UNKNOWN + ") -> " + BUILTIN_FUNCS[name]
+            return UNKNOWN
+        if name in s.funcs:
+            return self.func_title(s.funcs[name])
+        if s.classes.get(name) != None:
+            return name
+
+        def compute():
+            titles = []
+            for kind, payload in s.names.get(name, []):
+                if kind == "value":
+                    titles.append(self.infer(payload, s, None))
+                elif kind == "element":
+                    titles.append(element_of(self.infer(payload, s, None)))
+                elif kind == "param":
+                    titles.append(self.param_type(payload[0], payload[1]))
+                elif kind == "self":
+                    titles.append(payload.name)
+            return union(titles)
+        return self.memo(("name", s, name), compute, UNKNOWN)
+
+    def attr_type(self, node, sc, binding = None):
+        owner = self.infer(node.value, sc, binding)
+        if owner not in self.info.classes:
+            return UNKNOWN
+        k = self.find_attr(self.info.classes[owner], node.attr)
+        if k == None:
+            return UNKNOWN
+        if node.attr in k.scope.funcs:
+            return self.func_title(k.scope.funcs[node.attr])
+
+        def compute():
+            titles = []
+            for kind, payload in k.scope.names.get(node.attr, []):
+                if kind == "value":
+                    titles.append(self.infer(payload, k.scope, None))
+            for s, value in k.attrs.get(node.attr, []):
+                titles.append(self.infer(value, s, None))
+            return union(titles)
+        return self.memo(("attr", k, node.attr), compute, UNKNOWN)
+
+    def call_type(self, node, sc, binding):
+        func = node.func
+        if type(func) == ast.Name:
+            if binding != None and func.id in binding:
+                return UNKNOWN
+            s = self.resolve(sc, func.id)
+            if s == None:
+                if func.id in BUILTIN_TYPES:
+                    return BUILTIN_TYPES[func.id]
+                return BUILTIN_FUNCS.get(func.id, UNKNOWN)
+            if func.id in s.funcs:
+                f = s.funcs[func.id]
+                return self.return_type(f, self.bind_args(f, node, sc, binding))
+            if s.classes.get(func.id) != None:
+                return func.id
+        elif type(func) == ast.Attribute:
+            owner = self.infer(func.value, sc, binding)
+            if owner in self.info.classes:
+                k = self.find_attr(self.info.classes[owner], func.attr)
+                if k != None and func.attr in k.scope.funcs:
+                    f = k.scope.funcs[func.attr]
+                    return self.return_type(f, self.bind_args(f, node, sc, binding))
+        return UNKNOWN
+
+    def infer(self, node, sc, binding = None):
+        t = type(node)
+        if t == ast.Constant:
+            return CONSTANT_TYPES.get(type(node.value), UNKNOWN)
+        if t == ast.Name:
+            return self.name_type(sc, node.id, binding)
+        if t == ast.JoinedStr:
+            return "str"
+        if t == ast.List:
+            return "[" + union([self.infer(i, sc, binding) for i in node.elts]) + "]"
+        if t == ast.ListComp:
+            return "[" + self.infer(node.elt, sc, binding) + "]"
+        if t == ast.Tuple:
+            return "(" + ", ".join([self.infer(i, sc, binding) for i in node.elts]) + ")"
+        if t == ast.Dict:
+            keys = [self.infer(i, sc, binding) for i in node.keys if i != None]
+            return "{" + union(keys) + " : " + union([self.infer(i, sc, binding) for i in node.values]) + "}"
+        if t == ast.Lambda:
+            args = node.args.posonlyargs + node.args.args
+            return "(" + ", ".join([UNKNOWN] * len(args)) + ") -> " + self.infer(node.body, self.info.lambdas[node], None)
+        if t == ast.Call:
+            return self.call_type(node, sc, binding)
+        if t == ast.Attribute:
+            return self.attr_type(node, sc, binding)
+        if t == ast.BinOp:
+            left = self.infer(node.left, sc, binding)
+            right = self.infer(node.right, sc, binding)
+            if left == right:
+                return left
+            if type(node.op) == ast.Mod and left == "str":
+                return "str"
+            if left in ("int", "float") and right in ("int", "float"):
+                return "float"
+            return UNKNOWN
+        if t == ast.BoolOp:
+            return union([self.infer(i, sc, binding) for i in node.values])
+        if t == ast.Compare:
+            return "bool"
+        if t == ast.UnaryOp:
+            if type(node.op) == ast.Not:
+                return "bool"
+            return self.infer(node.operand, sc, binding)
+        if t == ast.IfExp:
+            return union([self.infer(node.body, sc, binding), self.infer(node.orelse, sc, binding)])
+        if t == ast.Subscript:
+            if type(node.slice) == ast.Slice:
+                return self.infer(node.value, sc, binding)
+            return element_of(self.infer(node.value, sc, binding))
+        return UNKNOWN
+
+
+def infer(root):
+    info = collector()
+    info.visit(root)
+    types = inferer(info)
+    types.link_calls()
+
+    #one entry per identifier occurrence, keyed like the Pysonar2 anchors
+    index = {}
+    for sc, node, f in info.occurrences:
+        t = type(node)
+        if t == ast.Name:
+            key = (node.lineno, node.id)
+            title = types.name_type(sc, node.id)
+        elif t == ast.Attribute:
+            key = (node.end_lineno, node.attr)
+            title = types.attr_type(node, sc)
+        elif t == ast.arg:
+            key = (node.lineno, node.arg)
+            title = types.name_type(sc, node.arg)
+        else:
+            key = (node.lineno, node.name)
+            title = types.func_title(f)
+        if title == UNKNOWN:
+            continue
+        if key not in index:
+            index[key] = []
+        index[key].append(title)
+    return index
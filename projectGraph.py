@@ -0,0 +1,167 @@
+import callGraph
+
+#Project-wide call and inheritance graph. Every scanned file hands in the
+#summary of its analyzer, whose names are resolved through the module's
+#imports into qualified names like pkg.mod.Class.method. Names are interned
+#to integer ids, so the graphs only hold ints, and are analysed once at the
+#end, which finds recursion and class hierarchies spanning modules.
+
+
+def module_name(relpath):
+    #pkg/mod.py is pkg.mod and pkg/__init__.py is pkg
+    parts = relpath[:len(relpath) - 3].replace("\\", "/").split("/")
+    if parts[len(parts) - 1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+class project_graph:
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        #function or method id -> tuple of callee ids
+        self.calls = {}
+        #class ids in definition order, and class id -> list of parent ids,
+        #redefined classes show up as often as they are defined
+        self.classes = []
+        self.parents = {}
+        #names imported into a module -> what they refer to
+        self.aliases = {}
+
+    def intern(self, name):
+        i = self.ids.get(name)
+        if i == None:
+            i = len(self.names)
+            self.ids[name] = i
+            self.names.append(name)
+        return i
+
+    def add(self, module, summary, package = False):
+        #package tells if the module is a package's __init__
+        imports = summary["imports"]
+        funcs = summary["funcs"]
+        classes = set()
+        for name, bases in summary["classes"]:
+            classes.add(name)
+        fromimports = {}
+        base = module if package else module.rpartition(".")[0]
+        for name in summary["fromimports"]:
+            level, source, orig = summary["fromimports"][name]
+            if level > 0:
+                pkg = base
+                for i in range(1, level):
+                    pkg = pkg.rpartition(".")[0]
+                if pkg != "" and source != "":
+                    source = pkg + "." + source
+                elif source == "":
+                    source = pkg
+            fromimports[name] = source + "." + orig
+            if name not in classes and name not in funcs:
+                self.aliases[self.intern(module + "." + name)] = self.intern(source + "." + orig)
+
+        def resolve(name):
+            #a dotted name as seen from this module
+            head, dot, rest = name.partition(".")
+            if head in classes or head in funcs:
+                head = module + "." + head
+            elif head in imports:
+                head = imports[head]
+            elif head in fromimports:
+                head = fromimports[head]
+            return head + dot + rest
+
+        def callee(c):
+            if len(c) == 1:
+                if "." in c[0]:
+                    return self.intern(c[0])
+                if c[0] in funcs or c[0] in fromimports:
+                    return self.intern(resolve(c[0]))
+            elif c[0] != None and (c[0] in classes or c[0].partition(".")[0] in fromimports):
+                return self.intern(resolve(c[0]) + "." + c[1])
+            return None
+
+        for name, bases in summary["classes"]:
+            c = self.intern(module + "." + name)
+            self.classes.append(c)
+            if c not in self.parents:
+                self.parents[c] = []
+            for b in bases:
+                if b != "object":
+                    self.parents[c].append(self.intern(resolve(b)))
+        for name in funcs:
+            self.add_calls(module + "." + name, funcs[name], callee)
+        for cls in summary["methods"]:
+            for name in summary["methods"][cls]:
+                self.add_calls(module + "." + cls + "." + name, summary["methods"][cls][name], callee)
+
+    def add_calls(self, name, callees, callee):
+        f = self.intern(name)
+        ids = set(self.calls.get(f, ()))
+        for c in callees:
+            i = callee(c)
+            if i != None:
+                ids.add(i)
+        #tuples take less than half the memory of small sets
+        self.calls[f] = tuple(ids)
+
+    def resolve_aliases(self):
+        #follow imports of imports to the name they were defined with
+        target = {}
+        for i in self.aliases:
+            seen = set()
+            j = i
+            while j in self.aliases and j not in seen:
+                seen.add(j)
+                j = self.aliases[j]
+            target[i] = j
+        return target
+
+    def call_graph(self):
+        target = self.resolve_aliases()
+        graph = {}
+        for f in self.calls:
+            callees = set()
+            for c in self.calls[f]:
+                callees.add(target.get(c, c))
+            graph[f] = tuple(callees)
+        return graph
+
+    def class_graph(self):
+        target = self.resolve_aliases()
+        parents = {}
+        children = {}
+        for c in self.parents:
+            if len(self.parents[c]) == 0:
+                continue
+            parents[c] = []
+            for p in self.parents[c]:
+                p = target.get(p, p)
+                parents[c].append(p)
+                if p not in children:
+                    children[p] = []
+                children[p].append(c)
+        return parents, children
+
+    def check_recursion(self, limit = None):
+        return len(callGraph.recursive_nodes(self.call_graph(), limit))
+
+    def check_inheritance(self):
+        #counted like analyzer.check_inheritance does for one file
+        parents, children = self.class_graph()
+        res = {"hierarchical": 0, "multilevel": 0, "diamond": 0}
+        for p in children:
+            if len(children[p]) > 1:
+                res["hierarchical"] += 1
+        for c in self.classes:
+            if c not in children:
+                for p in set(parents.get(c, [])):
+                    res["multilevel"] += len(set(parents.get(p, [])))
+        #the ancestors of each parent are compared with those of all parents,
+        #itself included, so a class counts once any of its parents has one
+        for c in parents:
+            if len(parents[c]) > 1:
+                for p in parents[c]:
+                    if p in parents:
+                        res["diamond"] += 1
+                        break
+        return res
@@ -0,0 +1,82 @@
+import os
+import queue
+import subprocess
+import threading
+import time
+
+#Runs Pysonar2 for project mode. Instead of one JVM per file, Pysonar2 is run
+#once on the whole project, or once per top-level directory of it. Batches
+#run one after another in a background thread and are handed to the scanner
+#as soon as they are done, so their files are scanned while the next batch is
+#still inferred. Batches whose results are newer than all their sources are
+#not run again.
+
+
+def make_batches(project, sources, typeres, mode):
+    #(path Pysonar2 is run on, its output directory, sources) in source order,
+    #Pysonar2 mirrors the layout under the path into the output directory
+    if mode == "project":
+        return [(project, typeres, sources)]
+    batches = []
+    index = {}
+    for sourcefile in sources:
+        rel = os.path.relpath(sourcefile, project)
+        top = rel.split(os.sep)[0]
+        if top == rel:
+            #files at the top of the project are inferred one by one
+            batches.append((sourcefile, typeres, [sourcefile]))
+            continue
+        if top not in index:
+            index[top] = len(batches)
+            batches.append((os.path.join(project, top), os.path.join(typeres, top), []))
+        batches[index[top]][2].append(sourcefile)
+    return batches
+
+
+def up_to_date(project, typeres, sources):
+    for sourcefile in sources:
+        htmlfile = os.path.join(typeres, os.path.relpath(sourcefile, project) + ".html")
+        if not os.path.exists(htmlfile) or os.path.getmtime(htmlfile) < os.path.getmtime(sourcefile):
+            return False
+    return True
+
+
+class runner:
+    def __init__(self, jar, project, sources, typeres, mode = "project", java = "java"):
+        self.jar = jar
+        self.java = java
+        self.project = project
+        self.typeres = typeres
+        self.batches = make_batches(project, sources, typeres, mode)
+        self.ready = queue.Queue()
+        self.inferred = 0
+        self.elapsed = 0.0
+        self.thread = threading.Thread(target = self.run, daemon = True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        for path, outdir, sources in self.batches:
+            if not up_to_date(self.project, self.typeres, sources):
+                start = time.perf_counter()
+                if not os.path.isdir(outdir):
+                    os.makedirs(outdir)
+                try:
+                    res = subprocess.run([self.java, "-jar", self.jar, path, outdir], stdout = subprocess.DEVNULL,
+                                         stderr = subprocess.PIPE, universal_newlines = True)
+                    if res.returncode != 0:
+                        lines = res.stderr.strip().splitlines()
+                        print("Pysonar2 failed on " + path + ": " + (lines[len(lines) - 1] if len(lines) > 0 else "exit code " + str(res.returncode)))
+                except OSError as e:
+                    print("Pysonar2 failed on " + path + ": " + str(e))
+                self.elapsed += time.perf_counter() - start
+                self.inferred += 1
+            self.ready.put(sources)
+        self.ready.put(None)
+
+    def __iter__(self):
+        sources = self.ready.get()
+        while sources != None:
+            yield sources
+            sources = self.ready.get()
@@ -0,0 +1,223 @@
+import collections
+import functools
+
+#Parser for the type titles of Pysonar2 results, and of the local type
+#inference which writes the same notation:
+#  int, ?, None, Foo           atoms
+#  (int, str)                  tuple
+#  [int]                       list
+#  {int | str}                 union
+#  {str : int}                 dict
+#  (int, str) -> None          function, its signatures are joined by " / "
+#A title is parsed into small immutable types, made once per structure, and
+#the parsed titles are kept in an LRU cache, as the same titles come up again
+#and again. The checks of the scanners are predicates on these types. Every
+#type carries flags for what it contains anywhere inside, like an unknown "?"
+#or a function, so the predicates do not walk the types.
+
+CACHE_SIZE = 4096
+#the types made are shared until there are this many, then made anew
+MAX_INTERNED = 65536
+
+ptype = collections.namedtuple("ptype", ["kind", "args", "unknown", "ref", "none", "function", "union"])
+
+DELIMITERS = "()[]{}|,:/"
+
+interned = {}
+
+
+class ParseError(Exception):
+    pass
+
+
+def make(kind, args):
+    #args are the name of an atom, or the types a type is made of
+    if kind == "atom":
+        name = args[0]
+        t = ptype(kind, args, "?" in name, "#" in name, "None" in name, False, False)
+    else:
+        t = ptype(kind, args, any(a.unknown for a in args), any(a.ref for a in args), any(a.none for a in args),
+                  kind == "func" or any(a.function for a in args), kind == "union" or any(a.union for a in args))
+    if t in interned:
+        return interned[t]
+    if len(interned) >= MAX_INTERNED:
+        interned.clear()
+    interned[t] = t
+    return t
+
+
+def tokenize(title):
+    tokens = []
+    atom = []
+    i = 0
+    while i < len(title):
+        c = title[i]
+        if c in DELIMITERS or (c == "-" and title.startswith("->", i)):
+            name = "".join(atom).strip()
+            if name != "":
+                tokens.append(name)
+            atom = []
+            if c == "-":
+                tokens.append("->")
+                i += 2
+                continue
+            tokens.append(c)
+        else:
+            atom.append(c)
+        i += 1
+    name = "".join(atom).strip()
+    if name != "":
+        tokens.append(name)
+    return tokens
+
+
+class parser:
+    def __init__(self, title):
+        self.tokens = tokenize(title)
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+
+    def take(self, token = None):
+        t = self.peek()
+        if t == None or (token != None and t != token):
+            raise ParseError("expected " + str(token) + " at " + str(t))
+        self.pos += 1
+        return t
+
+    def parse(self):
+        t = self.union()
+        if self.peek() != None:
+            raise ParseError("unexpected " + self.peek())
+        return t
+
+    def union(self):
+        members = [self.signatures()]
+        while self.peek() == "|":
+            self.take()
+            members.append(self.signatures())
+        if len(members) == 1:
+            return members[0]
+        return make("union", tuple(members))
+
+    def signatures(self):
+        #a function lists its signatures joined by " / "
+        first = self.arrow()
+        if first.kind != "sig":
+            return first
+        sigs = [first]
+        while self.peek() == "/":
+            self.take()
+            sig = self.arrow()
+            if sig.kind != "sig":
+                raise ParseError("expected a signature")
+            sigs.append(sig)
+        return make("func", tuple(sigs))
+
+    def arrow(self):
+        t = self.primary()
+        if self.peek() != "->":
+            return t
+        self.take()
+        if t.kind != "tuple":
+            t = make("tuple", (t,))
+        return make("sig", (t, self.arrow()))
+
+    def primary(self):
+        token = self.take()
+        if token == "(":
+            items = []
+            if self.peek() != ")":
+                items.append(self.union())
+                while self.peek() == ",":
+                    self.take()
+                    items.append(self.union())
+            self.take(")")
+            return make("tuple", tuple(items))
+        if token == "[":
+            if self.peek() == "]":
+                self.take()
+                return make("list", ())
+            elem = self.union()
+            self.take("]")
+            return make("list", (elem,))
+        if token == "{":
+            first = self.union()
+            if self.peek() == ":":
+                self.take()
+                value = self.union()
+                self.take("}")
+                return make("dict", (first, value))
+            self.take("}")
+            return first
+        if token in DELIMITERS or token == "->":
+            raise ParseError("unexpected " + token)
+        return make("atom", (token,))
+
+
+@functools.lru_cache(maxsize = CACHE_SIZE)
+def parse(title):
+    #a title which can not be parsed is kept as one atom, with the flags its
+    #text suggests
+    try:
+        return parser(title).parse()
+    except ParseError:
+        return ptype("atom", (title,), "?" in title, "#" in title, "None" in title, "->" in title and "(" in title and ")" in title,
+                     "|" in title and "{" in title and "}" in title)
+
+
+def signatures(t):
+    if t.kind == "func":
+        return t.args
+    return ()
+
+
+def polymorphic(t, skip_none = False):
+    #a function taking a union, or returning the same type for different
+    #arguments, leaving out signatures with unknown types. With skip_none the
+    #signatures taking None are left out as well. The types are shared, so
+    #comparing them mostly stops at the identity, hashing them would not.
+    returnvalues = []
+    for sig in signatures(t):
+        if sig.unknown:
+            continue
+        params, ret = sig.args
+        if skip_none and params.none:
+            continue
+        if params.union:
+            return True
+        for r, p in returnvalues:
+            if r == ret:
+                if p != params:
+                    return True
+                break
+        else:
+            returnvalues.append((ret, params))
+    return False
+
+
+def known(t):
+    return not t.unknown and not t.ref
+
+
+def heterogeneous(t):
+    #"list" for a list of more than one known type, "tuple" for a tuple of
+    #different known types, None for neither, and False for a list which is
+    #not heterogeneous
+    if t.kind == "list" and len(t.args) == 1 and t.args[0].kind == "union":
+        count = 0
+        for member in t.args[0].args:
+            if known(member):
+                count += 1
+        if count > 1:
+            return "list"
+        return False
+    if t.kind == "tuple":
+        for i in t.args:
+            for j in t.args:
+                if i != j and known(i) and known(j):
+                    return "tuple"
+    return None
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+#Persistent cache of finished results, the feature counts and project graph
+#summary of a file. Entries are keyed by a hash of
+#everything a result depends on: the source and type inference result bytes,
+#the config values, the standard lib info and the scanner code itself, so a
+#changed input simply misses and stale entries age out.
+
+#written results are committed every so many rows or seconds, so an
+#interrupted scan keeps most of them
+COMMIT_ROWS = 100
+COMMIT_SECONDS = 5
+
+
+def hash_parts(parts):
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(str(len(part)).encode("ascii"))
+        h.update(b":")
+        h.update(part)
+    return h.hexdigest()
+
+
+def hash_files(paths):
+    parts = []
+    for path in paths:
+        parts.append(path)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                parts.append(f.read())
+    return hash_parts(parts)
+
+
+def scanner_version(lib):
+    #the scanner sources and the standard lib info both change the results
+    base = os.path.dirname(os.path.abspath(__file__))
+    paths = []
+    for f in sorted(os.listdir(base)):
+        if f.endswith(".py"):
+            paths.append(os.path.join(base, f))
+    if lib != None and os.path.isdir(lib):
+        for f in sorted(os.listdir(lib)):
+            paths.append(os.path.join(lib, f))
+    return hash_files(paths)
+
+
+def cache_key(source, html, setup, version):
+    parts = [version, source, html]
+    for key in sorted(setup):
+        parts.append(key + "=" + str(setup[key]))
+    return hash_parts(parts)
+
+
+class result_cache:
+    def __init__(self, cachedir, max_size = None, max_age = None):
+        #max_size in bytes, max_age in seconds, None for no limit
+        if not os.path.isdir(cachedir):
+            os.makedirs(cachedir)
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.pending = 0
+        self.committed = time.monotonic()
+        self.db = sqlite3.connect(os.path.join(cachedir, "results.sqlite"), timeout = 60)
+        self.db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, featuremap TEXT, size INTEGER, created REAL, accessed REAL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self.db.commit()
+
+    def get(self, key):
+        row = self.db.execute("SELECT featuremap FROM results WHERE key = ?", (key,)).fetchone()
+        if row == None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.db.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        self.written()
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        content = json.dumps(result, separators = (",", ":"))
+        now = time.time()
+        self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", (key, content, len(content), now, now))
+        self.written()
+
+    def written(self):
+        self.pending += 1
+        if self.pending >= COMMIT_ROWS or time.monotonic() - self.committed >= COMMIT_SECONDS:
+            self.commit()
+
+    def commit(self):
+        self.db.commit()
+        self.pending = 0
+        self.committed = time.monotonic()
+
+    def evict(self):
+        if self.max_age != None:
+            self.db.execute("DELETE FROM results WHERE created < ?", (time.time() - self.max_age,))
+        if self.max_size != None:
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_size:
+                #drop the least recently used entries until the cache fits
+                removed = []
+                for key, size in self.db.execute("SELECT key, size FROM results ORDER BY accessed"):
+                    if total <= self.max_size:
+                        break
+                    removed.append((key,))
+                    total -= size
+                self.db.executemany("DELETE FROM results WHERE key = ?", removed)
+
+    def close(self):
+        self.evict()
+        self.db.commit()
+        self.db.close()
@@ -0,0 +1,187 @@
+import csv
+import json
+import os
+import queue
+import threading
+
+import featureSchema
+
+#Writers for the scanning results. A sink opens its output once and appends
+#the rows of every scanned file, flushing them in batches. In project mode
+#only the parent process writes, the workers hand their results back to it.
+#The JSON Lines sink also takes the occurrences of the features, one record
+#each, so they can be loaded incrementally. In project mode the sinks are fed
+#by a writer thread, so formatting and writing overlap with the scanning.
+#Scanning a git history writes the totals of every commit instead.
+
+
+def skipped_path(csvfile):
+    #the CSV file of the files skipped, next to the one of the counts
+    root, ext = os.path.splitext(csvfile)
+    return root + ".skipped" + (ext if ext != "" else ".csv")
+
+
+class csv_sink:
+    def __init__(self, csvfile, batch = 1000):
+        #the header is only written when starting a new file
+        self.csvfile = csvfile
+        self.header = os.path.exists(csvfile) and os.path.getsize(csvfile) > 0
+        self.file = open(csvfile, "a", newline = "")
+        #LF like the pandas output it replaced, not the csv module's CRLF
+        self.writer = csv.writer(self.file, lineterminator = "\n")
+        self.batch = batch
+        self.rows = []
+        #opened with the first file skipped
+        self.skips = None
+
+    def write(self, sourcefile, counts):
+        if not self.header:
+            self.writer.writerow(featureSchema.csv_keys())
+            self.header = True
+        self.rows.append([sourcefile] + list(counts))
+        if len(self.rows) >= self.batch:
+            self.flush()
+
+    def commit(self, commit, timestamp, files, skipped, counts):
+        if not self.header:
+            self.writer.writerow(["commit", "timestamp", "files", "skipped"] + featureSchema.csv_keys()[1:])
+            self.header = True
+        self.rows.append([commit, timestamp, files, skipped] + list(counts))
+        if len(self.rows) >= self.batch:
+            self.flush()
+
+    def occurrence(self, sourcefile, occurrence):
+        #a CSV row holds the counts of a file only
+        pass
+
+    def skipped(self, sourcefile, reason):
+        #a row of the counts has no room for a reason, skipped files go into
+        #a CSV file of their own, so the totals tell which files are missing
+        if self.skips == None:
+            path = skipped_path(self.csvfile)
+            header = os.path.exists(path) and os.path.getsize(path) > 0
+            self.skips = open(path, "a", newline = "")
+            self.skips_writer = csv.writer(self.skips, lineterminator = "\n")
+            if not header:
+                self.skips_writer.writerow(["filepath", "reason"])
+        self.skips_writer.writerow([sourcefile, reason])
+
+    def flush(self):
+        if len(self.rows) > 0:
+            self.writer.writerows(self.rows)
+            self.rows = []
+        self.file.flush()
+        if self.skips != None:
+            self.skips.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+            if self.skips != None:
+                self.skips.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class jsonl_sink:
+    def __init__(self, jsonlfile, batch = 1000):
+        self.file = open(jsonlfile, "a")
+        self.batch = batch
+        self.lines = []
+
+    def write(self, sourcefile, counts):
+        self.add({"type": "file", "file": sourcefile, "features": dict(zip(featureSchema.FEATURES, counts))})
+
+    def commit(self, commit, timestamp, files, skipped, counts):
+        self.add({"type": "commit", "commit": commit, "timestamp": timestamp, "files": files, "skipped": skipped,
+                  "features": dict(zip(featureSchema.FEATURES, counts))})
+
+    def occurrence(self, sourcefile, occurrence):
+        feature, lineno, col, function, cls = occurrence
+        self.add({"type": "occurrence", "file": sourcefile, "feature": feature, "lineno": lineno, "col": col,
+                  "function": function, "class": cls})
+
+    def skipped(self, sourcefile, reason):
+        self.add({"type": "skipped", "file": sourcefile, "reason": reason})
+
+    def add(self, record):
+        self.lines.append(json.dumps(record))
+        if len(self.lines) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if len(self.lines) > 0:
+            self.file.write("\n".join(self.lines) + "\n")
+            self.lines = []
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class writer:
+    #feeds the sinks from a thread of its own, through a bounded queue so
+    #results waiting to be written stay few
+    def __init__(self, sinks, depth = 1024):
+        self.sinks = sinks
+        self.queue = queue.Queue(depth)
+        self.error = None
+        self.thread = threading.Thread(target = self.run, daemon = True)
+        self.thread.start()
+
+    def write(self, sourcefile, counts, occurrences = ()):
+        if len(self.sinks) > 0:
+            self.queue.put((sourcefile, counts, occurrences, None))
+
+    def skipped(self, sourcefile, reason):
+        if len(self.sinks) > 0:
+            self.queue.put((sourcefile, None, (), reason))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item == None:
+                break
+            #after an error the queue is still drained, so the scan goes on
+            if self.error != None:
+                continue
+            sourcefile, counts, occurrences, reason = item
+            try:
+                for sink in self.sinks:
+                    if reason != None:
+                        sink.skipped(sourcefile, reason)
+                        continue
+                    for occurrence in occurrences:
+                        sink.occurrence(sourcefile, occurrence)
+                    sink.write(sourcefile, counts)
+            except Exception as e:
+                self.error = e
+
+    def close(self):
+        #the error of the writer thread, like a full disk, is raised here
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        for sink in self.sinks:
+            sink.close()
+        if self.error != None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,120 @@
+import heapq
+import json
+import time
+
+#Where scanning time goes. A profile counts calls and seconds per visit_*
+#handler, per type lookup helper and per phase of scanning a file, handler
+#times include the helpers they call. Workers profile every file they scan
+#and hand the counts back, the parent merges them and keeps the slowest files.
+
+HELPERS = ["check_func", "check_type", "check_heterogeneous", "check_polymorphism",
+           "check_outside_func", "check_outside_polymorphism", "check_inheritance", "check_recursion"]
+PHASES = ["load_types", "finalize"]
+SLOWEST = 20
+
+
+def kind(name):
+    if name.startswith("visit_"):
+        return "handler"
+    if name in HELPERS:
+        return "helper"
+    return "phase"
+
+
+class profile:
+    def __init__(self):
+        #name -> [calls, seconds]
+        self.stats = {}
+        #(seconds, sourcefile) of the slowest files
+        self.slowest = []
+        self.files = 0
+
+    def add(self, name, seconds, calls = 1):
+        if name not in self.stats:
+            self.stats[name] = [0, 0.0]
+        self.stats[name][0] += calls
+        self.stats[name][1] += seconds
+
+    def timed(self, name, func):
+        stat = self.stats.setdefault(name, [0, 0.0])
+        clock = time.perf_counter
+        def wrapper(*args):
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                stat[0] += 1
+                stat[1] += clock() - start
+        return wrapper
+
+    def timed_walk(self, func):
+        #the visit, with or without the occurrences, walks the tree. Only the
+        #time spent walking counts, not the time taken by whoever gets the
+        #occurrences
+        stat = self.stats.setdefault("visit", [0, 0.0])
+        clock = time.perf_counter
+        def wrapper(*args):
+            stat[0] += 1
+            walker = func(*args)
+            while True:
+                start = clock()
+                try:
+                    occurrence = next(walker)
+                except StopIteration:
+                    stat[1] += clock() - start
+                    return
+                stat[1] += clock() - start
+                yield occurrence
+        return wrapper
+
+    def instrument(self, visitor):
+        #only this analyzer is slowed down, not the class
+        for cls in visitor.handlers:
+            visitor.handlers[cls] = self.timed("visit_" + cls.__name__, visitor.handlers[cls])
+        for name in HELPERS + PHASES:
+            setattr(visitor, name, self.timed(name, getattr(visitor, name)))
+        visitor.walk = self.timed_walk(visitor.walk)
+
+    def file(self, sourcefile, seconds):
+        self.files += 1
+        if len(self.slowest) < SLOWEST:
+            heapq.heappush(self.slowest, (seconds, sourcefile))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, sourcefile))
+
+    def merge(self, stats):
+        for name in stats:
+            self.add(name, stats[name][1], stats[name][0])
+
+    def rows(self):
+        rows = []
+        for name in self.stats:
+            calls, seconds = self.stats[name]
+            if calls > 0:
+                rows.append((kind(name), name, calls, seconds))
+        rows.sort(key = lambda row: (["phase", "handler", "helper"].index(row[0]), -row[3]))
+        return rows
+
+    def print_table(self):
+        from prettytable import PrettyTable
+        table = PrettyTable(["Kind", "Name", "Calls", "Seconds", "us per Call"])
+        table.align["Name"] = 'l'
+        for kind, name, calls, seconds in self.rows():
+            table.add_row([kind, name, calls, "%.4f" % seconds, "%.1f" % (seconds * 1000000 / calls)])
+        print(table)
+        print("Slowest files:")
+        for seconds, sourcefile in sorted(self.slowest, reverse = True):
+            print("  %.4fs %s" % (seconds, sourcefile))
+
+    def to_json(self):
+        timings = {}
+        for kind, name, calls, seconds in self.rows():
+            timings[name] = {"kind": kind, "calls": calls, "seconds": seconds}
+        slowest = []
+        for seconds, sourcefile in sorted(self.slowest, reverse = True):
+            slowest.append({"file": sourcefile, "seconds": seconds})
+        return {"files": self.files, "timings": timings, "slowest": slowest}
+
+    def write(self, jsonfile):
+        with open(jsonfile, "w") as f:
+            json.dump(self.to_json(), f, indent = 2)
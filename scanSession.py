@@ -0,0 +1,60 @@
+import ast
+
+import featureSchema
+import featureScanner
+
+#A scanner kept in memory to scan many sources in one process, like a service
+#answering requests. The config and the standard libs are loaded once, and
+#one analyzer is reset between sources instead of being built again.
+
+
+class feature_counts:
+    #the counts of one source, in the slots of featureSchema
+    def __init__(self, values):
+        self.values = values
+
+    def __getitem__(self, feature):
+        #feature names are dotted, like FCAP.loop.while
+        return self.values[featureSchema.SLOTS[feature]]
+
+    def dotted(self):
+        return dict(zip(featureSchema.FEATURES, self.values))
+
+    def featuremap(self):
+        #the nested dicts the analyzer shows its counts as
+        return featureSchema.to_featuremap(self.values)
+
+
+class scan_session:
+    def __init__(self, cfg_file, lib = None, backend = "stream", features = None):
+        #lib is the standard libs info directory, without it calls into the
+        #standard libs are not recognized. features are the names or prefixes
+        #of the features to count, like ["TS.gradual_typing", "FCAP.loop"],
+        #when none of them needs types typeres is not read.
+        self.setup = featureScanner.read_config(cfg_file)
+        if features != None:
+            self.setup["features"] = ",".join(features)
+        self.backend = backend
+        self.visitor = featureScanner.analyzer(self.setup, lib)
+
+    def scan_source(self, text, typeres = None):
+        #typeres is the Pysonar2 HTML result of the source, as text or an open
+        #file, without it the local type inference is used
+        root = ast.parse(text)
+        visitor = self.visitor
+        visitor.reset()
+        visitor.run(root, typeres, self.backend)
+        #reset gives the analyzer new counts, so these stay as they are
+        return feature_counts(visitor.counts)
+
+    def scan_many(self, sources):
+        #sources are (name, text) or (name, text, typeres), yields (name, counts,
+        #error) where error tells why a source could not be scanned
+        for source in sources:
+            typeres = None
+            if len(source) > 2:
+                typeres = source[2]
+            try:
+                yield source[0], self.scan_source(source[1], typeres), None
+            except (SyntaxError, ValueError, RecursionError) as e:
+                yield source[0], None, type(e).__name__ + ": " + str(e)
@@ -0,0 +1,84 @@
+import csv
+import os
+import pickle
+
+#Membership index of the standard lib info. Every table is a set of
+#(module path, class, func) where the module path is relative to the standard
+#lib root, e.g. ("os/path", "None", "join"), so a lookup is a hash probe.
+
+TABLES = {
+    "funcs": "standard_funcs.csv",
+    "polys": "standard_polymorphism.csv",
+}
+
+#the knowledge base holds the same tables pickled in one file, built by
+#functionScanner.py --build-kb, and is preferred over the CSV files
+KB_FILE = "standard_kb.pickle"
+KB_VERSION = 1
+
+
+class stdlib_index:
+    def __init__(self):
+        self.tables = {}
+        for table in TABLES:
+            self.tables[table] = set()
+
+    def add(self, table, module, classname, func):
+        self.tables[table].add((module, classname, func))
+
+    def contains(self, table, attrs):
+        #attrs is a resolved attribute chain like ["os", "path", "join"], which
+        #is either a module function or a method of a class in the module
+        entries = self.tables[table]
+        if ("/".join(attrs[0:len(attrs) - 1]), "None", attrs[len(attrs) - 1]) in entries:
+            return True
+        if len(attrs) > 2 and ("/".join(attrs[0:len(attrs) - 2]), attrs[len(attrs) - 2], attrs[len(attrs) - 1]) in entries:
+            return True
+        return False
+
+
+def module_path(filepath):
+    #standard_libs/funcs/os/path.csv -> os/path
+    parts = filepath.split("/")
+    if len(parts) > 2 and parts[0] == "standard_libs":
+        parts = parts[2:]
+    path = "/".join(parts)
+    if path.endswith(".csv"):
+        path = path[0:len(path) - 4]
+    return path
+
+
+def load_csv(lib):
+    index = stdlib_index()
+    modules = {}
+    for table in TABLES:
+        with open(os.path.join(lib, TABLES[table]), "r", newline = "") as f:
+            for row in csv.reader(f):
+                if len(row) == 3:
+                    if row[0] not in modules:
+                        modules[row[0]] = module_path(row[0])
+                    index.add(table, modules[row[0]], row[1], row[2])
+    return index
+
+
+def save_kb(index, path):
+    with open(path, "wb") as f:
+        pickle.dump({"version": KB_VERSION, "tables": index.tables}, f, protocol = 4)
+
+
+def load_kb(path):
+    with open(path, "rb") as f:
+        kb = pickle.load(f)
+    if not isinstance(kb, dict) or kb.get("version") != KB_VERSION:
+        raise ValueError("Unsupported standard lib knowledge base: " + path)
+    index = stdlib_index()
+    for table in TABLES:
+        index.tables[table] = kb["tables"][table]
+    return index
+
+
+def load(lib):
+    kb = os.path.join(lib, KB_FILE)
+    if os.path.exists(kb):
+        return load_kb(kb)
+    return load_csv(lib)
@@ -0,0 +1,26 @@
+import ast
+import os
+import sys
+import unittest
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import localTypes
+
+#the argument types grow on every recursive call
+GROWING = """def wrap(x, n):
+    if n:
+        return wrap((x, n), n - 1)
+    return x
+"""
+
+
+class test_recursion(unittest.TestCase):
+    def test_growing_arguments(self):
+        index = localTypes.infer(ast.parse(GROWING))
+        self.assertIn((1, "wrap"), index)
+
+
+if __name__ == "__main__":
+    unittest.main()
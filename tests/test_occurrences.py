@@ -0,0 +1,47 @@
+import ast
+import os
+import sys
+import unittest
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+
+SOURCE = """class Base(metaclass=type):
+    pass
+
+def main(a):
+    return dict(a, key=1, **a)
+"""
+
+
+def occurrences(root):
+    setup = featureScanner.read_config(os.path.join(BASE, "config.ini"))
+    visitor = featureScanner.analyzer(setup, None)
+    return [o for o in visitor.stream(root, None) if o[0] in ("MP.metaclass", "FCAP.kwarg", "FCAP.packing_and_unpacking.unpacking")]
+
+
+class test_keyword_occurrences(unittest.TestCase):
+    def test_keywords(self):
+        found = occurrences(ast.parse(SOURCE))
+        self.assertIn(("MP.metaclass", 1, 11, None, "Base"), found)
+        self.assertIn(("FCAP.kwarg", 5, 19, "main", None), found)
+        self.assertIn(("FCAP.packing_and_unpacking.unpacking", 5, 26, "main", None), found)
+
+    def test_keywords_without_location(self):
+        #as Python 3.8 parses them, the location of the value is recorded
+        root = ast.parse(SOURCE)
+        for node in ast.walk(root):
+            if isinstance(node, ast.keyword):
+                for attr in ("lineno", "col_offset", "end_lineno", "end_col_offset"):
+                    if hasattr(node, attr):
+                        delattr(node, attr)
+        found = occurrences(root)
+        self.assertIn(("MP.metaclass", 1, 21, None, "Base"), found)
+        self.assertIn(("FCAP.kwarg", 5, 23, "main", None), found)
+        self.assertIn(("FCAP.packing_and_unpacking.unpacking", 5, 28, "main", None), found)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import resultCache
+
+
+def stored(cachedir):
+    #what another process sees, the committed rows only
+    db = sqlite3.connect(os.path.join(cachedir, "results.sqlite"))
+    try:
+        return db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    finally:
+        db.close()
+
+
+class test_commits(unittest.TestCase):
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        self.cache = resultCache.result_cache(self.cachedir)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.cachedir)
+
+    def test_committed_every_rows(self):
+        for i in range(0, resultCache.COMMIT_ROWS + 10):
+            self.cache.put(str(i), {"counts": [i]})
+        self.assertEqual(stored(self.cachedir), resultCache.COMMIT_ROWS)
+
+    def test_committed_every_seconds(self):
+        self.cache.committed -= resultCache.COMMIT_SECONDS
+        self.cache.put("a", {"counts": [1]})
+        self.assertEqual(stored(self.cachedir), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import featureScanner
+import resultSink
+
+scan_file = featureScanner.scan_file
+
+
+def slow_scan_file(job):
+    #the workers run this in place of scan_file
+    if job[0].endswith("slow.py"):
+        time.sleep(5)
+    return scan_file(job)
+
+
+class test_skipped_files(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.project = os.path.join(self.tmpdir, "project")
+        os.mkdir(self.project)
+        for name, source in (("good.py", "x = [i for i in range(3)]\n"), ("bad.py", "def (\n"), ("slow.py", "y = 1\n")):
+            with open(os.path.join(self.project, name), "w") as f:
+                f.write(source)
+        featureScanner.scan_file = slow_scan_file
+
+    def tearDown(self):
+        featureScanner.scan_file = scan_file
+        shutil.rmtree(self.tmpdir)
+
+    def test_skipped_records(self):
+        setup = featureScanner.read_config(os.path.join(BASE, "config.ini"))
+        csvfile = os.path.join(self.tmpdir, "result.csv")
+        jsonlfile = os.path.join(self.tmpdir, "result.jsonl")
+        featureScanner.scan_project(self.project, None, setup, None, "stream", 1, csvfile, False, jsonlfile = jsonlfile, timeout = 1)
+
+        rows = list(csv.reader(open(csvfile, "r")))[1:]
+        self.assertEqual([os.path.basename(row[0]) for row in rows], ["good.py"])
+        skipped = {}
+        for row in list(csv.reader(open(resultSink.skipped_path(csvfile), "r")))[1:]:
+            skipped[os.path.basename(row[0])] = row[1]
+        self.assertEqual(sorted(skipped), ["bad.py", "slow.py"])
+        self.assertTrue(skipped["bad.py"].startswith("SyntaxError"))
+        self.assertIn("timed out", skipped["slow.py"])
+
+        records = [json.loads(line) for line in open(jsonlfile, "r")]
+        skipped = sorted(os.path.basename(r["file"]) for r in records if r["type"] == "skipped")
+        self.assertEqual(skipped, ["bad.py", "slow.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
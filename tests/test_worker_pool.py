@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import unittest
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BASE)
+
+import workerPool
+
+
+def init():
+    pass
+
+
+def slow(job):
+    time.sleep(0.5)
+    return job
+
+
+def failed(job, reason):
+    return None
+
+
+class counter:
+    #items 0 and up, the first one scanned and the others done
+    def __init__(self, count):
+        self.count = count
+        self.taken = 0
+
+    def __iter__(self):
+        for i in range(0, self.count):
+            self.taken += 1
+            if i == 0:
+                yield i
+            else:
+                yield workerPool.done(i)
+
+
+class test_map(unittest.TestCase):
+    def test_done_items_are_not_all_buffered(self):
+        items = counter(1000)
+        with workerPool.pool(1, slow, init, ()) as executor:
+            results = executor.map(items, failed, 8)
+            self.assertEqual(next(results), 0)
+            #one item for the worker and at most 8 ahead
+            self.assertLessEqual(items.taken, 1 + 8)
+            self.assertEqual(list(results), list(range(1, 1000)))
+
+    def test_done_items_are_yielded_at_once(self):
+        taken = []
+        def items():
+            for i in range(0, 1000):
+                taken.append(i)
+                yield workerPool.done(i)
+        with workerPool.pool(1, slow, init, ()) as executor:
+            results = executor.map(items(), failed, 8)
+            self.assertEqual(next(results), 0)
+            self.assertEqual(len(taken), 1)
+            self.assertEqual(list(results), list(range(1, 1000)))
+
+
+if __name__ == "__main__":
+    unittest.main()
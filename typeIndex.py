@@ -0,0 +1,162 @@
+from html.parser import HTMLParser
+import os
+
+#Index of a Pysonar2 type inference result: (lineno, identifier) -> list of
+#type titles, in the order the anchors appear on the line.
+#Pysonar2 writes one <span class="lineno"> per source line, followed by the
+#anchors of that line until the next span.
+
+VOID_TAGS = ["area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"]
+
+
+class stream_parser(HTMLParser):
+    def __init__(self):
+        super(stream_parser, self).__init__(convert_charrefs = True)
+        self.index = {}
+        self.depth = 0
+        self.line = 0
+        #depth of the parent of the current lineno tag, None outside a line
+        self.line_depth = None
+        self.in_lineno = False
+        #the anchor being read, as [depth, title, content tree]
+        self.anchor = None
+        self.contents = []
+        self.opened = []
+
+    def handle_starttag(self, tag, attrs):
+        depth = self.depth
+        void = tag in VOID_TAGS
+        if not void:
+            self.opened.append(tag)
+            self.depth += 1
+        if self.anchor != None:
+            child = []
+            self.contents[len(self.contents) - 1].append(child)
+            if not void:
+                self.contents.append(child)
+            return
+        classes = None
+        title = None
+        for key, value in attrs:
+            if key == "class" and value != None:
+                classes = value.split()
+            elif key == "title":
+                title = value
+        if classes != None and "lineno" in classes:
+            self.line += 1
+            self.line_depth = depth
+            self.in_lineno = not void
+        elif self.line_depth != None and depth == self.line_depth and not self.in_lineno:
+            if tag == "span":
+                self.line_depth = None
+            elif title != None and not void:
+                self.anchor = [depth, title, []]
+                self.contents = [self.anchor[2]]
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in self.opened:
+            return
+        while len(self.opened) > 0:
+            self.depth -= 1
+            if self.anchor != None and len(self.contents) > 1:
+                self.contents.pop()
+            if self.opened.pop() == tag:
+                break
+        if self.anchor != None and self.depth <= self.anchor[0]:
+            string = tree_string(self.anchor[2])
+            if string != None:
+                key = (self.line, string)
+                if key not in self.index:
+                    self.index[key] = []
+                self.index[key].append(self.anchor[1])
+            self.anchor = None
+            self.contents = []
+        if self.in_lineno and self.depth <= self.line_depth:
+            self.in_lineno = False
+        elif self.line_depth != None and self.depth < self.line_depth:
+            self.line_depth = None
+
+    def handle_data(self, data):
+        if self.anchor != None:
+            children = self.contents[len(self.contents) - 1]
+            if len(children) > 0 and isinstance(children[len(children) - 1], str):
+                children[len(children) - 1] += data
+            else:
+                children.append(data)
+
+
+#same rule as BeautifulSoup's Tag.string: the text of a tag is only defined
+#when it has a single child
+def tree_string(children):
+    while len(children) == 1:
+        if isinstance(children[0], str):
+            return children[0]
+        children = children[0]
+    return None
+
+
+def build_from_stream(html, chunksize = 65536):
+    parser = stream_parser()
+    if isinstance(html, str):
+        parser.feed(html)
+    else:
+        chunk = html.read(chunksize)
+        while len(chunk) > 0:
+            parser.feed(chunk)
+            chunk = html.read(chunksize)
+    parser.close()
+    return parser.index
+
+
+def build_from_soup(soup):
+    index = {}
+    spans = soup.find_all(class_ ="lineno")
+    for i in range(0, len(spans)):
+        lineno = i + 1
+        p = spans[i].next_sibling
+        while(p != None and p.name != "span"):
+            if p.name != None and p.has_attr("title") and p.string != None:
+                key = (lineno, str(p.string))
+                if key not in index:
+                    index[key] = []
+                index[key].append(p["title"])
+            p = p.next_sibling
+    return index
+
+
+def build_with_bs4(html):
+    from bs4 import BeautifulSoup
+    return build_from_soup(BeautifulSoup(html, features="html.parser"))
+
+
+BACKENDS = {
+    "stream": build_from_stream,
+    "bs4": build_with_bs4,
+}
+
+
+def load(html, backend = "stream"):
+    if backend not in BACKENDS:
+        raise ValueError("Unknown HTML parser backend: " + str(backend))
+    return BACKENDS[backend](html)
+
+
+def lookup(index, name, lineno):
+    return index.get((lineno, name), [])
+
+
+def find_result(typeres, root, sourcefile):
+    #Pysonar2 mirrors the project layout when run on a directory, and writes
+    #<file>.py.html directly into the output directory when run on one file
+    htmlfile = os.path.join(typeres, os.path.relpath(sourcefile, root) + ".html")
+    if os.path.exists(htmlfile):
+        return htmlfile
+    htmlfile = os.path.join(typeres, os.path.basename(sourcefile) + ".html")
+    if os.path.exists(htmlfile):
+        return htmlfile
+    return None
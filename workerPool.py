@@ -0,0 +1,232 @@
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+
+#Worker processes for project mode, each given one file at a time, so a file
+#can be held to a budget. A worker which runs longer than the time budget or
+#grows beyond the memory budget on a file is killed and replaced, and the
+#file is tried again once the others are done. A worker which is over the
+#memory budget after finishing a file is replaced as well, before it takes
+#the next one. Memory is read from /proc, where it is not available only the
+#time budget is kept. Files are taken only when a worker is free, so the
+#files read ahead for the workers stay few.
+
+POLL = 0.05
+
+#workers are started by a fork server, or spawned where there is none, not
+#forked from the scanning process, whose reader, writer and Pysonar2 threads
+#may hold locks a fork would copy held
+if "forkserver" in multiprocessing.get_all_start_methods():
+    CONTEXT = multiprocessing.get_context("forkserver")
+else:
+    CONTEXT = multiprocessing.get_context("spawn")
+
+
+def worker_loop(conn, initializer, initargs, func):
+    initializer(*initargs)
+    while True:
+        job = conn.recv()
+        if job == None:
+            break
+        try:
+            conn.send((True, func(job)))
+        except Exception as e:
+            conn.send((False, type(e).__name__ + ": " + str(e)))
+
+
+def rss(pid):
+    #resident set size in bytes, None where /proc is missing
+    try:
+        with open("/proc/" + str(pid) + "/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class done:
+    #an item whose result is known already, like a cached one
+    def __init__(self, result):
+        self.result = result
+
+
+def read_ahead(func, items, depth):
+    #func of items in their order, run by threads on up to depth items ahead
+    #of the one taken, for reading files while others are scanned
+    import collections
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor(max_workers = min(depth, 16)) as threads:
+        ahead = collections.deque()
+        for item in items:
+            ahead.append(threads.submit(func, item))
+            if len(ahead) >= depth:
+                yield ahead.popleft().result()
+        while len(ahead) > 0:
+            yield ahead.popleft().result()
+
+
+class worker:
+    def __init__(self, initializer, initargs, func):
+        self.conn, child = CONTEXT.Pipe()
+        self.process = CONTEXT.Process(target = worker_loop, args = (child, initializer, initargs, func), daemon = True)
+        self.process.start()
+        child.close()
+        #index of the job it works on and when it got it
+        self.job = None
+        self.started = 0
+
+    def stop(self, kill = False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join()
+        self.conn.close()
+
+
+class pool:
+    def __init__(self, jobs, func, initializer, initargs, timeout = None, max_rss = None, retries = 1):
+        #timeout in seconds and max_rss in bytes per file, None for no limit
+        self.func = func
+        self.initializer = initializer
+        self.initargs = initargs
+        self.timeout = timeout
+        self.max_rss = max_rss
+        self.retries = retries
+        self.workers = []
+        for i in range(0, jobs):
+            self.start_worker()
+        #files tried again, files given up on and workers replaced
+        self.retried = 0
+        self.skipped = 0
+        self.recycled = 0
+
+    def start_worker(self):
+        w = worker(self.initializer, self.initargs, self.func)
+        self.workers.append(w)
+        return w
+
+    def replace(self, w, kill):
+        self.workers.remove(w)
+        w.stop(kill)
+        self.recycled += 1
+        return self.start_worker()
+
+    def over_budget(self, w, now):
+        if self.timeout != None and now - w.started > self.timeout:
+            return "timed out after " + str(self.timeout) + "s"
+        if self.max_rss != None:
+            size = rss(w.process.pid)
+            if size != None and size > self.max_rss:
+                return "used more than " + str(self.max_rss // (1024 * 1024)) + " MB"
+        return None
+
+    def map(self, items, failed, ahead = 32):
+        #results of func on items in their order, failed(item, reason) stands
+        #in for the items it raised on or which never finished in the budget.
+        #Items are taken from the iterable only when a worker is free, done
+        #items are passed through. At most ahead items more than the workers
+        #are taken before the first one not yielded yet, so a run of done
+        #items, like cached files, is not all buffered while a file is
+        #scanned.
+        limit = len(self.workers) + ahead
+        items = iter(items)
+        exhausted = False
+        count = 0
+        jobs = {}
+        tries = {}
+        retries = []
+        results = {}
+        idle = list(self.workers)
+        busy = {}
+        wait = None
+        if self.timeout != None or self.max_rss != None:
+            wait = POLL
+        following = 0
+        while not exhausted or following < count:
+            while len(idle) > 0:
+                if not exhausted and count - following < limit:
+                    item = next(items, None)
+                    if item == None:
+                        exhausted = True
+                        continue
+                    job = count
+                    count += 1
+                    if type(item) == done:
+                        results[job] = item.result
+                        #handed on as soon as the items before it are
+                        while following in results:
+                            yield results.pop(following)
+                            following += 1
+                        continue
+                    jobs[job] = item
+                    tries[job] = 0
+                elif len(retries) > 0:
+                    #after the other items, or once a retried item holds
+                    #back the items after it
+                    job = retries.pop(0)
+                else:
+                    break
+                w = idle.pop()
+                w.job = job
+                w.started = time.perf_counter()
+                tries[job] += 1
+                w.conn.send(jobs[job])
+                busy[w.conn] = w
+            ready = []
+            if len(busy) > 0:
+                ready = multiprocessing.connection.wait(list(busy), wait)
+            for conn in ready:
+                w = busy.pop(conn)
+                job = w.job
+                w.job = None
+                try:
+                    ok, value = conn.recv()
+                except (EOFError, OSError):
+                    self.retry(job, tries, retries, results, jobs, failed, "worker died")
+                    idle.append(self.replace(w, True))
+                    continue
+                if ok:
+                    results[job] = value
+                else:
+                    results[job] = failed(jobs[job], value)
+                del jobs[job]
+                if self.max_rss != None:
+                    size = rss(w.process.pid)
+                    if size != None and size > self.max_rss:
+                        w = self.replace(w, False)
+                idle.append(w)
+            now = time.perf_counter()
+            for conn in list(busy):
+                w = busy[conn]
+                reason = self.over_budget(w, now)
+                if reason != None:
+                    del busy[conn]
+                    self.retry(w.job, tries, retries, results, jobs, failed, reason)
+                    idle.append(self.replace(w, True))
+            while following in results:
+                yield results.pop(following)
+                following += 1
+
+    def retry(self, job, tries, retries, results, jobs, failed, reason):
+        #the other files go first, a file which keeps failing is given up on
+        if tries[job] <= self.retries:
+            retries.append(job)
+            self.retried += 1
+        else:
+            results[job] = failed(jobs.pop(job), reason)
+            self.skipped += 1
+
+    def close(self, kill = False):
+        for w in self.workers:
+            w.stop(kill)
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(exc_type != None)